@@ -0,0 +1,68 @@
+"""
+Diff.py
+
+PURPOSE:
+Benchmarks finding the nodes that changed on a grid. Compares comparing every
+node with those of a copy of the grid taken earlier against diffing the change
+journal since a snapshot, for several numbers of nodes changed.
+
+Run from the root of the project:
+    python -m Benchmarks.Diff
+"""
+from random import Random
+from timeit import timeit
+from typing import Dict, Optional, Tuple
+from Objects.Mechanics.Grid import Grid
+
+CHANGED = [1, 10, 100, 1000]
+REPEAT = 50
+SEED = 1
+
+
+def _compare(grid: Grid, copy: Grid) -> Dict[int, Tuple[int, Optional[str]]]:
+    """
+    Returns the state and glyph of every node of the grid that differs from
+    the copy, by cell id, by comparing every node.
+
+    Parameter(s):
+     - grid: The grid that changed
+     - copy: A copy of the grid taken before the changes
+    """
+    return {node.cell: (node.state, node.glyph)
+            for node, old in zip(grid.nodes, copy.nodes)
+            if (node.state, node.glyph) != (old.state, old.glyph)}
+
+
+def _bench(changed: int, rng: Random) -> str:
+    """
+    Returns one row of the results table for the specified number of nodes
+    changed.
+
+    Parameter(s):
+     - changed: The number of nodes changed
+     - rng: The random number generator used
+    """
+    grid = Grid()
+    copy = grid.__copy__()
+    snapshot = grid.snapshot()
+    for cell in rng.sample(range(len(grid.nodes)), changed):
+        grid.nodes[cell].miss()
+
+    delta = grid.diff(snapshot)
+    assert {cell: (state, glyph) for cell, state, glyph in delta} == \
+        _compare(grid, copy)
+    copy.apply(delta)
+    assert not _compare(grid, copy)
+
+    compare = timeit(lambda: _compare(grid, copy), number=REPEAT) / REPEAT
+    diff = timeit(lambda: grid.diff(snapshot), number=REPEAT) / REPEAT
+    grid.release(snapshot)
+    return f'{changed:>7}  {compare * 1e6:>12.1f}  {diff * 1e6:>12.1f}'
+
+
+if __name__ == '__main__':
+    random = Random(SEED)
+    print('Cost of finding the nodes changed on a 36x36 grid in microseconds')
+    print(f'{"Changed":>7}  {"Compare":>12}  {"Diff":>12}')
+    for count in CHANGED:
+        print(_bench(count, random))
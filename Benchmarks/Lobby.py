@@ -0,0 +1,156 @@
+"""
+Lobby.py
+
+PURPOSE:
+Load tests the lobby server (see Modes/Lobby.py) with bot clients on this
+computer. The lobby runs in its own process and every bot plays through its
+own connection, exactly like a player joining from the LAN Traditional mode:
+bots fire at random nodes, waiting a little before every order as a person
+would, and forfeit after a few turns. Reports how long the lobby took to
+answer the orders ending every turn for several numbers of games played at
+once; everything else a player does is handled by their own client.
+
+Run from the root of the project:
+    python -m Benchmarks.Lobby
+"""
+import asyncio
+import random
+import resource
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import List, Tuple
+from Settings import NATIONS
+from Modes.Lobby import Lobby
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Coordinate import COORDINATES
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import play
+
+GAMES = [10, 100, 300]
+TURNS = 5
+THINK = 0.2
+STAGGER = 0.002
+SEED = 1
+
+
+class Bot:
+    """
+    Fires at random nodes, as many as it can every turn, and forfeits after
+    TURNS turns. Times how long every turn it ends takes to be answered.
+
+    Attribute(s):
+     - rng: The random number generator used
+     - targets: The nodes not fired at yet, in the order they are fired at
+     - turns: The number of turns ended
+     - sent: When the last turn was ended, if not answered yet
+     - answers: How long every turn ended took to be answered, in seconds
+    """
+    rng: random.Random
+    targets: List[Tuple[str, str]]
+    turns: int
+    sent: float
+    answers: List[float]
+
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.targets = list(COORDINATES)
+        self.rng.shuffle(self.targets)
+        self.turns = 0
+        self.sent = 0.0
+        self.answers = []
+
+    def _answered(self) -> None:
+        if self.sent:
+            self.answers.append(perf_counter() - self.sent)
+            self.sent = 0.0
+
+    async def join(self, number: int, taken: List[str]) -> Tuple[str, str]:
+        nation = [nation for nation in NATIONS if nation not in taken][0]
+        return f'Bot {number}', nation
+
+    async def deploy(self, player: Player) -> None:
+        Engine.deploy_randomly(player, self.rng)
+
+    async def turn(self, game: BattleshipGame) -> bool:
+        if self.turns == TURNS:
+            return False
+        for _ in range(game.current_player.battle_total):
+            await asyncio.sleep(self.rng.uniform(0, THINK))
+            target = self.targets.pop()
+            while Engine.check_order(game, target) != Engine.OK:
+                target = self.targets.pop()
+            Engine.add_order(game, target)
+        await asyncio.sleep(self.rng.uniform(0, THINK))
+        self.turns += 1
+        self.sent = perf_counter()
+        return True
+
+    async def wait(self, game: BattleshipGame) -> None:
+        self._answered()
+
+    async def over(self, winner: int, number: int) -> None:
+        self._answered()
+
+
+def _host(connection: Connection) -> None:
+    """
+    Runs a lobby on any free port of this computer and sends the port back.
+
+    Parameter(s):
+     - connection: Where the port is sent
+    """
+    async def _run() -> None:
+        lobby = Lobby('127.0.0.1', 0, 0)
+        await lobby.start()
+        connection.send(lobby.port)
+        await lobby.serve()
+
+    asyncio.run(_run())
+
+
+async def _games(port: int, games: int) -> Tuple[List[Bot], float]:
+    """
+    Plays a number of games at once through the lobby and returns every bot
+    and the time taken.
+
+    Parameter(s):
+     - port: The port of the lobby
+     - games: The number of games
+    """
+    async def _bot(bot: Bot, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await play('127.0.0.1', port, bot)
+
+    bots = [Bot(SEED * 100_000 + i) for i in range(games * 2)]
+    start = perf_counter()
+    await asyncio.gather(*(_bot(bot, i * STAGGER)
+                           for i, bot in enumerate(bots)))
+    return bots, perf_counter() - start
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+
+if __name__ == '__main__':
+    # Two connections per bot: one in the lobby, one here
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    receiver, sender = Pipe(False)
+    lobby = Process(target=_host, args=(sender,), daemon=True)
+    lobby.start()
+    lobby_port = receiver.recv()
+
+    print(f'{"Games":>6}{"Turns":>8}{"Per second":>12}'
+          f'{"End turn p50":>14}{"p99":>8}')
+    for count in GAMES:
+        played, elapsed = asyncio.run(_games(lobby_port, count))
+        answers = [answer for bot in played for answer in bot.answers]
+        print(f'{count:>6}{len(answers):>8,}{len(answers) / elapsed:>12,.1f}'
+              f'{_percentile(answers, 50) * 1000:>12.1f}ms'
+              f'{_percentile(answers, 99) * 1000:>6.1f}ms')
+    lobby.terminate()
@@ -0,0 +1,56 @@
+"""
+Memory.py
+
+PURPOSE:
+Benchmarks the memory used by one Player, including both of its grids and a
+full fleet placed on the personal grid, using tracemalloc.
+
+Run from the root of the project:
+    python -m Benchmarks.Memory
+"""
+import tracemalloc
+from Objects.Mechanics.Grid import Grid
+from Objects.Mechanics.Player import Player
+from Objects.Vessels.Battleship import TraditionalBattleship
+from Objects.Vessels.Cruiser import TraditionalCruiser
+from Objects.Vessels.Destroyer import TraditionalDestroyer
+from Objects.Vessels.Frigate import TraditionalFrigate
+from Objects.Vessels.Submarine import TraditionalSubmarine
+from Objects.Vessels.Carrier import TraditionalCarrier
+
+
+def _measure(create) -> int:
+    """
+    Returns the number of bytes still allocated by the object created.
+
+    Parameter(s):
+     - create: A function that creates the object being measured
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = create()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return after - before
+
+
+def _player() -> Player:
+    """Returns a Player with a full fleet placed on the personal grid."""
+    player = Player('Benchmark', 'UK', 1)
+    vessels = [TraditionalBattleship, TraditionalCruiser, TraditionalDestroyer,
+               TraditionalFrigate, TraditionalSubmarine, TraditionalCarrier]
+    for i, vessel_type in enumerate(vessels):
+        player.add_vessel(vessel_type)
+        vessel = player.fleet[i][0]
+        player.place_vessel(vessel.abbrev, vessel.pennant,
+                            ('0', 'ZYXWVU'[i]), 'W')
+    return player
+
+
+if __name__ == '__main__':
+    grid_bytes = _measure(Grid)
+    player_bytes = _measure(_player)
+    print(f'Grid:   {grid_bytes:>9,} bytes  '
+          f'({grid_bytes / (36 * 36):.1f} bytes per node)')
+    print(f'Player: {player_bytes:>9,} bytes')
@@ -0,0 +1,59 @@
+"""
+MonteCarlo.py
+
+PURPOSE:
+Benchmarks the Monte Carlo targeting strategy on a game in progress: the
+number of layouts sampled per turn and the time each turn takes, for several
+budgets and numbers of worker processes.
+
+Run from the root of the project:
+    python -m Benchmarks.MonteCarlo
+"""
+import os
+import random
+from time import perf_counter
+from Objects.AI.Density import DensityTargeting
+from Objects.AI.MonteCarlo import MonteCarloTargeting
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+
+BUDGETS = [50, 100, 250]
+TURNS = 5
+WARM_UP = 20
+SEED = 1
+
+
+def _game_in_progress() -> BattleshipGame:
+    """Returns a game where both players have fired WARM_UP salvoes."""
+    rng = random.Random(SEED)
+    game = Engine.new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2),
+                           rng=rng)
+    Engine.deploy_randomly(game.player1, rng)
+    Engine.deploy_randomly(game.player2, rng)
+    targeting = DensityTargeting(rng)
+    while game.current_turn_number <= WARM_UP:
+        Engine.submit_orders(game, targeting.choose(game))
+        Engine.step(game)
+    return game
+
+
+if __name__ == '__main__':
+    game = _game_in_progress()
+    workers = sorted({1, os.cpu_count() or 1})
+    print(f'{"Budget":>8}{"Workers":>9}{"Layouts per turn":>18}'
+          f'{"Slowest turn":>14}')
+    for budget in BUDGETS:
+        for count in workers:
+            targeting = MonteCarloTargeting(random.Random(SEED), budget, count)
+            targeting.choose(game)  # Start the worker processes
+            samples = 0
+            slowest = 0.0
+            for _ in range(TURNS):
+                start = perf_counter()
+                targeting.choose(game)
+                slowest = max(slowest, perf_counter() - start)
+                samples += targeting.samples
+            targeting.close()
+            print(f'{budget:>6}ms{count:>9}{samples // TURNS:>18,}'
+                  f'{slowest * 1000:>12.0f}ms')
@@ -0,0 +1,156 @@
+"""
+Protocol.py
+
+PURPOSE:
+Benchmarks the LAN protocol (see Objects/Network/Protocol.py) against a naive
+JSON encoding of the same messages: one JSON object per message, with named
+fields. Plays games with random orders and records every message the host and
+players would exchange, checks that every message decodes back to exactly
+what was encoded, then reports the bytes sent to set up a game and per turn,
+and how many messages are encoded and decoded per second. Messages sent to
+spectators are only checked, not counted.
+
+Run from the root of the project:
+    python -m Benchmarks.Protocol
+"""
+import json
+from random import Random
+from time import perf_counter
+from typing import Callable, List, Tuple
+from Settings import LAN_FLEET
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import deployment, orders
+from Objects.Network.Protocol import HELLO, JOIN, DEPLOY, START, ORDERS, \
+    FORFEIT, RESULTS, OVER, ERROR, WATCH, FLEET, encode, decode
+
+GAMES = 20
+REPEAT = 5
+SEED = 1
+
+# The name of every kind of message and its fields, for the JSON encoding
+FIELDS = {HELLO: ('hello', 'number', 'taken', 'fleet'),
+          JOIN: ('join', 'nation', 'name'),
+          DEPLOY: ('deploy', 'fleet'),
+          START: ('start', 'nation', 'fleet', 'name'),
+          ORDERS: ('orders', 'cells'),
+          FORFEIT: ('forfeit',),
+          RESULTS: ('results', 'player', 'turn', 'shots'),
+          OVER: ('over', 'winner'),
+          ERROR: ('error', 'text'),
+          WATCH: ('watch', 'view', 'game'),
+          FLEET: ('fleet', 'number', 'nation', 'fleet', 'name')}
+
+
+def _play(rng: Random) -> Tuple[List[tuple], List[tuple], List[tuple], int]:
+    """
+    Plays a game with random orders and returns the messages sent to set it
+    up, the messages sent during the game and the messages only sent to
+    spectators, as (kind, fields), and the number of turns played.
+
+    Parameter(s):
+     - rng: The random number generator used
+    """
+    game = Engine.new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2))
+    Engine.deploy_randomly(game.player1, rng)
+    Engine.deploy_randomly(game.player2, rng)
+    setup = []
+    for player, other in ((game.player1, game.player2),
+                          (game.player2, game.player1)):
+        setup.append((HELLO, (player.number, [], list(LAN_FLEET))))
+        setup.append((JOIN, (player.nation[0], 'Player')))
+        setup.append((DEPLOY, (deployment(player),)))
+        setup.append((START, (other.nation[0],
+                              [vessel[:2] for vessel in deployment(other)],
+                              'Player')))
+    spectators = [(WATCH, (3, 1))]
+    for player in (game.player1, game.player2):
+        placed = deployment(player)
+        spectators.append((FLEET, (player.number, player.nation[0], placed,
+                                   'Player')))
+        spectators.append((FLEET, (player.number, player.nation[0],
+                                   [vessel[:2] for vessel in placed],
+                                   'Player')))
+
+    # Both players are sent the results of every turn
+    messages = []
+    turns = 0
+    while not game.check_winner()[0]:
+        player = game.current_player
+        targets = Engine.legal_targets(game)
+        for coordinate in rng.sample(targets, min(player.battle_total,
+                                                  len(targets))):
+            Engine.add_order(game, coordinate)
+        messages.append((ORDERS, (orders(game),)))
+        turn = game.current_turn_number
+        results = (RESULTS, (player.number, turn, Engine.end_turn(game)))
+        messages.extend([results, results])
+        turns += 1
+    winner = (OVER, (game.check_winner()[1].number,))
+    messages.extend([winner, winner])
+    return setup, messages, spectators, turns
+
+
+def _binary(kind: int, fields: tuple) -> bytes:
+    """Returns a message encoded by the protocol."""
+    return encode(kind, *fields)
+
+
+def _from_binary(kind: int, data: bytes) -> tuple:
+    """Returns the fields of a message encoded by the protocol."""
+    return decode(kind, data[3:])
+
+
+def _json(kind: int, fields: tuple) -> bytes:
+    """Returns a message encoded as a line of JSON."""
+    names = FIELDS[kind]
+    message = dict(zip(names[1:], fields))
+    message['kind'] = names[0]
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def _from_json(kind: int, data: bytes) -> dict:
+    """Returns the fields of a message encoded as a line of JSON."""
+    return json.loads(data)
+
+
+def _rate(function: Callable, arguments: List[tuple]) -> float:
+    """
+    Returns how many times per second a function runs, called with every set
+    of arguments REPEAT times.
+    """
+    start = perf_counter()
+    for _ in range(REPEAT):
+        for argument in arguments:
+            function(*argument)
+    return len(arguments) * REPEAT / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    rng = Random(SEED)
+    setups, played, watched, total_turns = [], [], [], 0
+    for _ in range(GAMES):
+        game_setup, game_messages, game_watched, game_turns = _play(rng)
+        setups.extend(game_setup)
+        played.extend(game_messages)
+        watched.extend(game_watched)
+        total_turns += game_turns
+    everything = setups + played
+
+    for message_kind, message_fields in everything + watched:
+        assert _from_binary(message_kind, _binary(
+            message_kind, message_fields)) == message_fields, message_fields
+
+    print(f'{GAMES} games, {total_turns:,} turns, {len(everything):,} '
+          f'messages; every message decodes back to what was encoded')
+    print(f'{"Encoding":<10}{"Setup bytes":>14}{"Bytes per turn":>16}'
+          f'{"Encoded / s":>14}{"Decoded / s":>14}')
+    for label, encoder, decoder in (('Binary', _binary, _from_binary),
+                                    ('JSON', _json, _from_json)):
+        encoded = [(kind, encoder(kind, fields)) for kind, fields in everything]
+        setup_bytes = sum(len(data) for _, data in encoded[:len(setups)])
+        turn_bytes = sum(len(data) for _, data in encoded[len(setups):])
+        print(f'{label:<10}{setup_bytes / GAMES:>14,.0f}'
+              f'{turn_bytes / total_turns:>16,.1f}'
+              f'{_rate(encoder, everything):>14,.0f}'
+              f'{_rate(decoder, encoded):>14,.0f}')
@@ -0,0 +1,66 @@
+"""
+Renderer.py
+
+PURPOSE:
+Benchmarks the number of bytes written to the terminal per turn by the full and
+diff renderers. Plays a game with random orders; the screen is drawn after every
+order is added and once more when the turn ends, like in the game itself.
+
+Run from the root of the project:
+    python -m Benchmarks.Renderer
+"""
+import io
+from random import Random
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Modes.Renderer import FullRenderer, DiffRenderer
+from Modes.TPT import _build_screen
+
+TURNS = 40
+SEED = 1
+
+
+def _draw(game: BattleshipGame, renderers: list, totals: list) -> None:
+    """
+    Draws the current screen with every renderer and adds up the bytes written.
+
+    Parameter(s):
+     - game: The game being drawn
+     - renderers: The renderers being compared
+     - totals: The number of bytes written by each renderer so far
+    """
+    frame = _build_screen(game.current_player, game.other_player(),
+                          game.current_orders, game.log)
+    for i, renderer in enumerate(renderers):
+        totals[i] += renderer.render(frame)
+
+
+if __name__ == '__main__':
+    rng = Random(SEED)
+    game = Engine.new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2))
+    Engine.deploy_randomly(game.player1, rng)
+    Engine.deploy_randomly(game.player2, rng)
+
+    # One renderer per player, as each player looks at their own screen
+    renderers = {1: [FullRenderer(io.StringIO()), DiffRenderer(io.StringIO())],
+                 2: [FullRenderer(io.StringIO()), DiffRenderer(io.StringIO())]}
+    totals = [0, 0]
+    frames = 0
+
+    for _ in range(TURNS):
+        player = game.current_player
+        targets = Engine.legal_targets(game)
+        for coord in rng.sample(targets, player.battle_total):
+            Engine.add_order(game, coord)
+            _draw(game, renderers[player.number], totals)
+            frames += 1
+        Engine.end_turn(game)
+        _draw(game, renderers[game.other_player().number], totals)
+        frames += 1
+        if game.check_winner()[0]:
+            break
+
+    print(f'{TURNS} turns, {frames} frames drawn')
+    print(f'Full renderer: {totals[0] / TURNS:>10,.0f} bytes per turn')
+    print(f'Diff renderer: {totals[1] / TURNS:>10,.0f} bytes per turn')
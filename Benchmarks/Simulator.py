@@ -0,0 +1,55 @@
+"""
+Simulator.py
+
+PURPOSE:
+Benchmarks the number of complete games played per second by the headless
+engine, one game at a time, and by the batched simulator for several batch
+sizes. Both play random orders against randomly placed fleets. Requires NumPy.
+
+Run from the root of the project:
+    python -m Benchmarks.Simulator
+"""
+from random import Random
+from time import perf_counter
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Simulator import BatchSimulator
+
+ENGINE_GAMES = 10
+BATCHES = [100, 1000, 10000]
+SEED = 1
+
+
+def _engine_game(rng: Random) -> None:
+    """
+    Plays one game with the engine.
+
+    Parameter(s):
+     - rng: The random number generator used
+    """
+    game = Engine.new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2),
+                           rng=rng)
+    Engine.deploy_randomly(game.player1, rng)
+    Engine.deploy_randomly(game.player2, rng)
+    while Engine.winner(game) is None:
+        targets = Engine.legal_targets(game)
+        count = min(len(targets), game.current_player.battle_total)
+        Engine.submit_orders(game, rng.sample(targets, count))
+        Engine.step(game)
+
+
+if __name__ == '__main__':
+    rng = Random(SEED)
+    start = perf_counter()
+    for _ in range(ENGINE_GAMES):
+        _engine_game(rng)
+    rate = ENGINE_GAMES / (perf_counter() - start)
+    print(f'{"Engine":<18}{rate:>10,.0f} games per second')
+
+    for games in BATCHES:
+        start = perf_counter()
+        sim = BatchSimulator(games, seed=SEED)
+        sim.deploy_randomly()
+        sim.run()
+        rate = games / (perf_counter() - start)
+        print(f'{f"Batch of {games:,}":<18}{rate:>10,.0f} games per second')
@@ -0,0 +1,77 @@
+"""
+Snapshot.py
+
+PURPOSE:
+Benchmarks taking and restoring player backups. Compares the old approach of
+copying a whole Grid against journal based snapshots for several board sizes.
+
+Run from the root of the project:
+    python -m Benchmarks.Snapshot
+"""
+from timeit import timeit
+from Objects.Mechanics.Grid import Grid
+
+SIZES = [6, 12, 18, 24, 30, 36]
+CHANGED = 28  # Number of nodes a full fleet takes up
+REPEAT = 20
+
+
+def _change(grid: Grid, count: int) -> None:
+    """
+    Changes the specified number of nodes on the grid.
+
+    Parameter(s):
+     - grid: The grid being changed
+     - count: The number of nodes to change
+    """
+    for i in range(count):
+        row, col = divmod(i, grid.size)
+        grid.grid[row % grid.size][col].miss()
+
+
+def _bench(size: int) -> str:
+    """
+    Returns one row of the results table for the specified board size.
+
+    Parameter(s):
+     - size: The side length of the grid
+    """
+    grid = Grid(size)
+    changed = min(CHANGED, size * size)
+
+    copy_backup = timeit(grid.__copy__, number=REPEAT) / REPEAT
+    snap_backup = timeit(grid.snapshot, number=REPEAT) / REPEAT
+    for _ in range(REPEAT):
+        grid.release(grid.position)
+
+    def _copy_restore() -> None:
+        backup = grid.__copy__()
+        _change(grid, changed)
+        backup.__copy__()
+
+    def _snap_restore() -> None:
+        snapshot = grid.snapshot()
+        _change(grid, changed)
+        grid.restore(snapshot)
+        grid.release(snapshot)
+
+    # Both restore loops also take the backup and change the nodes; the time
+    # spent changing nodes is measured separately and subtracted
+    change = timeit(lambda: _change(grid, changed), number=REPEAT) / REPEAT
+    grid.trim()
+    copy_restore = timeit(_copy_restore, number=REPEAT) / REPEAT - change
+    grid.trim()
+    snap_restore = timeit(_snap_restore, number=REPEAT) / REPEAT - change
+
+    return f'{size:>4}  {copy_backup * 1e6:>12.1f}  ' \
+           f'{snap_backup * 1e6:>12.2f}  {copy_restore * 1e6:>12.1f}  ' \
+           f'{snap_restore * 1e6:>12.1f}'
+
+
+if __name__ == '__main__':
+    print(f'Backup / restore cost in microseconds, '
+          f'{CHANGED} nodes changed between backup and restore')
+    print(f'{"Size":>4}  {"Copy backup":>12}  {"Snap backup":>12}  '
+          f'{"Copy restore":>12}  {"Snap restore":>12}')
+    for board_size in SIZES:
+        print(_bench(board_size))
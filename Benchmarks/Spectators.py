@@ -0,0 +1,137 @@
+"""
+Spectators.py
+
+PURPOSE:
+Load tests spectators of a LAN game (see Modes/Server.py). Two bots play a
+game on this computer, firing at random nodes without thinking, while a
+number of spectators watch it and one more spectator connects but never reads
+anything. Reports how long the bots wait for every turn they end to be
+answered, and checks that every spectator reading was sent exactly the same
+bytes.
+
+Run from the root of the project:
+    python -m Benchmarks.Spectators
+"""
+import asyncio
+import random
+import resource
+from time import perf_counter
+from typing import List, Tuple
+from Settings import NATIONS
+from Modes.Server import GameServer
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import play
+from Objects.Network.Protocol import WATCH, encode
+
+SPECTATORS = [0, 10, 100, 1000]
+SEED = 1
+
+
+class Bot:
+    """
+    Fires at random nodes, as many as it can every turn. Times how long every
+    turn it ends takes to be answered.
+
+    Attribute(s):
+     - rng: The random number generator used
+     - sent: When the last turn was ended, if not answered yet
+     - answers: How long every turn ended took to be answered, in seconds
+    """
+    rng: random.Random
+    sent: float
+    answers: List[float]
+
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.sent = 0.0
+        self.answers = []
+
+    def _answered(self) -> None:
+        if self.sent:
+            self.answers.append(perf_counter() - self.sent)
+            self.sent = 0.0
+
+    async def join(self, number: int, taken: List[str]) -> Tuple[str, str]:
+        nation = [nation for nation in NATIONS if nation not in taken][0]
+        return f'Bot {number}', nation
+
+    async def deploy(self, player: Player) -> None:
+        Engine.deploy_randomly(player, self.rng)
+
+    async def turn(self, game: BattleshipGame) -> bool:
+        self._answered()
+        targets = Engine.legal_targets(game)
+        for target in self.rng.sample(targets, min(
+                game.current_player.battle_total, len(targets))):
+            Engine.add_order(game, target)
+        self.sent = perf_counter()
+        return True
+
+    async def wait(self, game: BattleshipGame) -> None:
+        self._answered()
+
+    async def over(self, winner: int, number: int) -> None:
+        self._answered()
+
+
+async def _spectate(port: int) -> bytes:
+    """
+    Watches the game with every fleet shown and returns every byte received.
+
+    Parameter(s):
+     - port: The port the host is listening on for spectators
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(encode(WATCH, 3, 0))
+    received = await reader.read()
+    writer.close()
+    return received
+
+
+async def _game(spectators: int) -> Tuple[List[float], int, bool]:
+    """
+    Plays a game with a number of spectators and returns how long every turn
+    took to be answered, the bytes sent to every spectator, and whether they
+    were all sent the same bytes.
+
+    Parameter(s):
+     - spectators: The number of spectators reading
+    """
+    server = GameServer('127.0.0.1', 0, 0, reveal=True)
+    server.start()
+    stalled = await asyncio.open_connection('127.0.0.1', server.watch_port)
+    stalled[1].write(encode(WATCH, 3, 0))
+    watching = [asyncio.ensure_future(_spectate(server.watch_port))
+                for _ in range(spectators)]
+    await asyncio.sleep(0.1 + spectators / 1000)  # Everyone has connected
+
+    bots = [Bot(SEED * 10 + 1), Bot(SEED * 10 + 2)]
+    await asyncio.gather(*(play('127.0.0.1', server.port, bot)
+                           for bot in bots))
+    streams = await asyncio.gather(*watching)
+    stalled[1].close()
+    return bots[0].answers + bots[1].answers, \
+        len(streams[0]) if streams else 0, len(set(streams)) <= 1
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+
+if __name__ == '__main__':
+    # One connection per spectator on each side
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE,
+                       (max(soft, min(hard, max(SPECTATORS) * 2 + 100)),
+                        hard))
+
+    print(f'{"Spectators":>10}{"Turns":>8}{"Bytes each":>12}'
+          f'{"End turn p50":>14}{"p99":>8}  Same bytes')
+    for count in SPECTATORS:
+        answers, sent, same = asyncio.run(_game(count))
+        print(f'{count:>10,}{len(answers):>8,}{sent:>12,}'
+              f'{_percentile(answers, 50) * 1000:>12.1f}ms'
+              f'{_percentile(answers, 99) * 1000:>6.1f}ms  {same}')
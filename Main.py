@@ -5,8 +5,13 @@ PURPOSE:
 To start the entire program and will not exit without confirmation. The program
 will terminate only when the user decides to exit the program.
 """
+import sys
 from Settings import TITLE, NAME, VERSION, MDW, DEFAULT, GREEN, RED, PURPLE
+from Modes.LAN import main as lan_main
+from Modes.Lobby import main as lobby_main
+from Modes.SPT import main as spt_main
 from Modes.TPT import main as tpt_main
+from Modes.Tournament import main as tournament_main
 
 
 def header(mdw: int) -> None:
@@ -60,10 +65,13 @@ def menu() -> bool:
                          f'Please try again: ')
 
     if response == '1':  # Starts the Single Player Arcade game mode
+        spt_main()
         return False
     elif response == '2':  # Starts the Single Player Realistic game mode
+        spt_main()
         return False
     elif response == '3':  # Starts the Single Player Competitive game mode
+        spt_main()
         return False
     elif response == '4':  # Starts the Two Player Traditional game mode
         tpt_main()
@@ -75,14 +83,26 @@ def menu() -> bool:
     elif response == '7':  # Starts the Two Player Competitive game mode
         return False
     elif response == '8':  # Starts the LAN Traditional game mode
+        lan_main()
         return False
     elif response == '9':  # Starts the LAN Competitive game mode
+        lan_main()
         return False
     else:  # Terminates the program
         return True
 
 
 if __name__ == '__main__':
+    # Computer players only; python Main.py tournament --help
+    if sys.argv[1:2] == ['tournament']:
+        tournament_main(sys.argv[2:])
+        sys.exit()
+
+    # Hosts many LAN games at once; python Main.py lobby --help
+    if sys.argv[1:2] == ['lobby']:
+        lobby_main(sys.argv[2:])
+        sys.exit()
+
     exit_permission = False  # Program will not exit unless True
     header(MDW)
 
@@ -8,71 +8,30 @@ To recycle code. This file contains methods that are used in all modes
 from typing import Tuple, List, Optional
 from Settings import DEFAULT, PURPLE, RED, GREEN, BLUE, \
     AFFIRMATIVE, NEGATIVE, NATIONS, \
-    ROW_ICON, ROW_SEP, COL_ICON, COL_SEP, COL_SPACER, CORNER, \
+    COL_ICON, COL_SEP, COL_SPACER, CORNER, \
     EMPTY_FRAME, MDW
 from Objects.Mechanics.Game import BattleshipGame
 from Objects.Mechanics.Player import Player
 from Objects.Mechanics.Grid import Grid
+from Objects.Mechanics.Fleet import DEPLOYED
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Coordinate import display_cell
+from Objects.AI.Deduction import deduce, bits
 
 
 # Setup ------------------------------------------------------------------------
 def _setup_player() -> Tuple[Player, Player]:
     """Creates Player 1 and Player 2 basic information."""
-    # Helper function(s):
-    def _basic_info(number: int) -> Tuple[str, str]:
-        """
-        Sets up the basic information for a player.
-
-        Parameter(s):
-         - number: The player number
-        """
-        basic_check = False
-        while not basic_check:
-            name = input(
-                f'{PURPLE} >>> Player {number}{DEFAULT} name: ').strip()
-            nation = input(f'{PURPLE} >>> Player {number}{DEFAULT} '
-                           f'nationality: ').strip().upper()
-
-            # Check if nation is valid
-            while (nation in nations_joined) or \
-                    (nation not in list(NATIONS.keys())):
-                # Get list of valid nations
-                valid = list(NATIONS.keys())
-                for nation in nations_joined:
-                    valid.remove(nation)
-
-                nation = input(f'{PURPLE} >>> {RED}Invalid Nation{DEFAULT} - '
-                               f'Select from {valid}: ').strip().upper()
-
-            # Confirm with user that this is what they want
-            print(f'\nPLAYER {number} INFORMATION: ')
-            print(f'\tName: {name}')
-            print(f'\tNationality: {nation}')
-            confirm = input(
-                f'{PURPLE} >>> Player {number}{DEFAULT}, confirm '
-                f'the above is correct (Y/N): ').strip()
-
-            # Check user response is valid
-            while confirm not in AFFIRMATIVE and \
-                    confirm not in NEGATIVE:
-                confirm = input(f'{PURPLE} >>> {RED}'
-                                f'Invalid Option{DEFAULT} (Y/N): ')
-            if confirm in AFFIRMATIVE:
-                return name, nation
-            print('')
-
-    # --------------------------------------------------------------------------
-    # --------------------------------------------------------------------------
     nations_joined = []
 
     # Create basic Player 1 profile
-    p1_name, p1_nation = _basic_info(1)
+    p1_name, p1_nation = _basic_info(1, nations_joined)
     p1 = Player(p1_name, p1_nation, 1)
     nations_joined.append(p1_nation)
     print(f'{GREEN}Welcome,{DEFAULT} {p1.name}!\n')
 
     # Create basic Player 2 profile
-    p2_name, p2_nation = _basic_info(2)
+    p2_name, p2_nation = _basic_info(2, nations_joined)
     p2 = Player(p2_name, p2_nation, 2)
     nations_joined.append(p2_nation)
     print(f'{GREEN}Welcome,{DEFAULT} {p2.name}!\n')
@@ -80,6 +39,50 @@ def _setup_player() -> Tuple[Player, Player]:
     return p1, p2
 
 
+def _basic_info(number: int, nations_joined: List[str]) -> Tuple[str, str]:
+    """
+    Sets up the basic information for a player.
+
+    Parameter(s):
+     - number: The player number
+     - nations_joined: The nations already taken by other players
+    """
+    basic_check = False
+    while not basic_check:
+        name = input(
+            f'{PURPLE} >>> Player {number}{DEFAULT} name: ').strip()
+        nation = input(f'{PURPLE} >>> Player {number}{DEFAULT} '
+                       f'nationality: ').strip().upper()
+
+        # Check if nation is valid
+        while (nation in nations_joined) or \
+                (nation not in list(NATIONS.keys())):
+            # Get list of valid nations
+            valid = list(NATIONS.keys())
+            for nation in nations_joined:
+                valid.remove(nation)
+
+            nation = input(f'{PURPLE} >>> {RED}Invalid Nation{DEFAULT} - '
+                           f'Select from {valid}: ').strip().upper()
+
+        # Confirm with user that this is what they want
+        print(f'\nPLAYER {number} INFORMATION: ')
+        print(f'\tName: {name}')
+        print(f'\tNationality: {nation}')
+        confirm = input(
+            f'{PURPLE} >>> Player {number}{DEFAULT}, confirm '
+            f'the above is correct (Y/N): ').strip()
+
+        # Check user response is valid
+        while confirm not in AFFIRMATIVE and \
+                confirm not in NEGATIVE:
+            confirm = input(f'{PURPLE} >>> {RED}'
+                            f'Invalid Option{DEFAULT} (Y/N): ')
+        if confirm in AFFIRMATIVE:
+            return name, nation
+        print('')
+
+
 def _setup_grid(player: Player) -> bool:
     """
     Sets up the grid for the specified player.
@@ -91,12 +94,10 @@ def _setup_grid(player: Player) -> bool:
     def _add_vessel_list() -> List[str]:
         """Creates a list of all vessel that can be added to the grid.."""
         ret = [f'{BLUE}Currently In Port{DEFAULT}']
-        for index in range(6):
-            for i in range(len(player.fleet[index])):
-                vessel = f'[{player.fleet[index][i].abbrev} ' \
-                         f'{player.fleet[index][i].pennant:02d}]    ' \
-                         f'{player.fleet[index][i].name}'
-                ret.append(vessel)
+        for vessel_class in player.fleet:
+            for vessel in vessel_class:
+                ret.append(f'[{vessel.abbrev} {vessel.pennant:02d}]    '
+                           f'{vessel.name}')
         return ret
 
     def _remove_vessel_list() -> List[str]:
@@ -129,11 +130,6 @@ def _setup_grid(player: Player) -> bool:
         Parameter(s):
          - phrase: The response being checked
         """
-        rem_dict = {'BB': player.bb_curr, 'CC': player.cc_curr,
-                    'DD': player.dd_curr, 'FF': player.ff_curr,
-                    'SM': player.sm_curr, 'CV': player.cv_curr}
-        add_dict = {'BB': 0, 'CC': 1, 'DD': 2, 'FF': 3, 'SM': 4, 'CV': 5}
-
         # Check if response is the command \complete
         if phrase.lower().strip() == '\\complete':
             return True, -1, None
@@ -152,21 +148,19 @@ def _setup_grid(player: Player) -> bool:
                 return False, 2, None  # Invalid command
             elif lst[1] not in ['BB', 'CC', 'DD', 'FF', 'SM', 'CV']:
                 return False, 3, None  # Invalid class
-            elif int(float(lst[2])) not in player.all_id[add_dict[lst[1]]]:
+
+            # Phrase is valid; check if vessel can be placed on grid
+            result = Engine.check_deployment(
+                player, lst[1], int(float(lst[2])), (lst[3], lst[4]), lst[5])
+            if result == Engine.INVALID_VESSEL:
                 return False, 4, None  # Invalid vessel
-            elif (lst[3] not in COL_ICON) or (lst[4] not in ROW_ICON):
+            elif result == Engine.INVALID_COORDINATE:
                 return False, 5, None  # Invalid coordinate
-            elif lst[5] not in ['N', 'S', 'E', 'W']:
+            elif result == Engine.INVALID_DIRECTION:
                 return False, 6, None  # Invalid direction
-
-            # Phrase is valid; check if vessel can be placed on grid
-            for i, vessel in enumerate(player.fleet[add_dict[lst[1]]]):
-                if vessel.pennant == int(lst[2]):
-                    if not _check_placement(vessel.hp, lst[5],
-                                            (lst[3], lst[4])):
-                        return False, 7, None  # Invalid node
-                    return True, -2, lst  # Player is adding vessel
-            return False, 4, None  # Invalid vessel
+            elif result == Engine.INVALID_NODES:
+                return False, 7, None  # Invalid node
+            return True, -2, lst  # Player is adding vessel
 
         # If player attempting to remove vessel from grid
         elif len(lst) == 3:
@@ -177,72 +171,16 @@ def _setup_grid(player: Player) -> bool:
                 return False, 2, None  # Invalid command
             elif lst[1] not in ['BB', 'CC', 'DD', 'FF', 'SM', 'CV']:
                 return False, 3, None  # Invalid class
-            elif int(lst[2]) not in player.all_id[add_dict[lst[1]]]:
+            elif player.vessels.get(lst[1], int(lst[2])) is None:
                 return False, 4, None  # Invalid vessel
 
-            # Phrase is valid; check for pennant number
-            for i, vessel in enumerate(rem_dict[lst[1]]):
-                if vessel.pennant == int(lst[2]):
-                    return True, -3, lst  # player is removing vessel
-            return False, 4, None  # Invalid vessel
+            # Phrase is valid; check that the vessel is on the grid
+            if player.vessels.status_of(lst[1], int(lst[2])) != DEPLOYED:
+                return False, 4, None  # Invalid vessel
+            return True, -3, lst  # player is removing vessel
         else:
             return False, 1, None  # Invalid format
 
-    def _check_placement(hp: int, direction: str,
-                         coordinate: Tuple[str, str]) -> bool:
-        """
-        Checks to see if the coordinate and direction given is valid.
-
-        Parameter(s):
-         - hp: The hp of the vessel, equal to number of nodes to check
-         - direction: The direction the vessel is facing
-         - coordinate: The row and column
-        """
-        col = COL_ICON.index(coordinate[0])
-        row = ROW_ICON.index(coordinate[1])
-        curr = player.personal.grid[row][col]
-
-        # Check to see if the bow node is already full or not
-        if curr.occupied:
-            return False
-
-        nodes = hp - 1
-
-        # Check all other nodes
-        if direction == 'N':
-            while nodes > 0:
-                if curr.south is None:
-                    return False
-                elif curr.south.occupied:
-                    return False
-                curr = curr.south
-                nodes -= 1
-        elif direction == 'S':
-            while nodes > 0:
-                if curr.north is None:
-                    return False
-                elif curr.north.occupied:
-                    return False
-                curr = curr.north
-                nodes -= 1
-        elif direction == 'E':
-            while nodes > 0:
-                if curr.west is None:
-                    return False
-                elif curr.west.occupied:
-                    return False
-                curr = curr.west
-                nodes -= 1
-        else:
-            while nodes > 0:
-                if curr.east is None:
-                    return False
-                elif curr.east.occupied:
-                    return False
-                curr = curr.east
-                nodes -= 1
-        return True
-
     # --------------------------------------------------------------------------
     # --------------------------------------------------------------------------
     # Print options and base (empty) grid
@@ -281,13 +219,13 @@ def _setup_grid(player: Player) -> bool:
 
     # Response is valid, add vessel to grid
     if check[1] == -2:
-        player.place_vessel(check[2][1], int(check[2][2]),
-                            (check[2][3], check[2][4]), check[2][5])
+        Engine.deploy(player, check[2][1], int(check[2][2]),
+                      (check[2][3], check[2][4]), check[2][5])
         return False
 
     # Response is valid, remove vessel from grid
     elif check[1] == -3:
-        player.remove_vessel(check[2][1], int(check[2][2]))
+        Engine.withdraw(player, check[2][1], int(check[2][2]))
         return False
 
     # Response is valid, player requesting to complete planning
@@ -336,18 +274,7 @@ def remove_order(game: BattleshipGame, order_num: str) -> None:
      - orders: The list of current orders
      - order_num: The id of the order that is to be removed
     """
-    order = game.current_orders.pop(int(float(order_num)) - 1)
-    index = int(float(order_num)) - 1
-    for i in range(index, len(game.current_orders)):
-        game.current_orders[i].order_id -= 1
-
-    # Adjust grid node
-    coord = order.coordinate
-    row = ROW_ICON.index(coord[1])
-    col = COL_ICON.index(coord[0])
-
-    node = game.current_player.traditional.grid[row][col]
-    node.not_target_and_drop()
+    Engine.remove_order(game, int(float(order_num)))
 
 
 # Display ----------------------------------------------------------------------
@@ -365,6 +292,17 @@ def print_log(game: BattleshipGame) -> None:
     """
     Prints the entire Activity Log for the current player in the game.
 
+    Parameter(s):
+     - game: The current game taking place
+    """
+    print(log_text(game))
+    press_to_continue()
+
+
+def log_text(game: BattleshipGame) -> str:
+    """
+    Returns the entire Activity Log for the current player in the game.
+
     Parameter(s):
      - game: The current game taking place
     """
@@ -372,14 +310,43 @@ def print_log(game: BattleshipGame) -> None:
     ret = ''
     for i in range(len(log)):
         ret += log[i] + '\n'
-    print(ret)
+    return ret
+
+
+def print_hint(game: BattleshipGame) -> None:
+    """
+    Prints the nodes the current player can deduce must hold an enemy vessel,
+    and the nodes they can deduce cannot.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    print(hint_text(game))
     press_to_continue()
 
 
+def hint_text(game: BattleshipGame) -> str:
+    """
+    Returns the nodes the current player can deduce must hold an enemy vessel,
+    and the nodes they can deduce cannot.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    deduction = deduce(game.current_player, game.other_player())
+    certain = [display_cell(cell) for cell in bits(deduction.certain)]
+    empty = [display_cell(cell) for cell in bits(deduction.empty)]
+    return f'{GREEN}Nodes that must hold an enemy vessel:{DEFAULT}\n' \
+           f'{", ".join(certain) if certain else "None"}\n' \
+           f'\n{RED}Nodes that cannot hold an enemy vessel:{DEFAULT}\n' \
+           f'{", ".join(empty) if empty else "None"}'
+
+
 def parallel_print(grids: List[Grid], headers: List[str]) -> str:
     """
     Rearranges multiple grids and other statements so it can be neatly
-    printed on the screen.
+    printed on the screen. Grid rows come from each grid's render cache, so
+    only rows that changed since the last print are rendered again.
 
     Parameter(s):
      - grids: A list of grids that are to be printed
@@ -390,40 +357,32 @@ def parallel_print(grids: List[Grid], headers: List[str]) -> str:
      - The list of list of statements has maximum number of text equal to
        length of the grid
     """
-    row = ROW_ICON[36 - grids[0].size::]
-    col = COL_ICON[:grids[0].size]
-    ret = ''
+    size = grids[0].size
+    col = COL_ICON[:size]
+    rows = [grid.rows() for grid in grids]
+    lines = []
 
-    for i in range(len(row)):
-        for grid in grids:
-            temp = f'{row[i]} {ROW_SEP} '
-            for j in range(len(col)):
-                temp += f'{grid.grid[i][j].__repr__()} '
-            ret += f'{temp.rstrip()}    '
-        ret = ret[:-4:]
+    for i in range(size):
+        line = '    '.join([grid_rows[i] for grid_rows in rows])
         try:
-            ret += f'  {headers[i]}\n'
+            lines.append(f'{line}  {headers[i]}')
         except IndexError:
-            ret += f'\n'
+            lines.append(line)
 
-    col_lines = ''
-    col_lines += f'  {CORNER}' + f'{COL_SPACER}{COL_SEP}' * grids[0].size
-    ret += ((col_lines + f'    ') * len(grids)).rstrip()
+    col_lines = f'  {CORNER}' + f'{COL_SPACER}{COL_SEP}' * size
+    line = '    '.join([col_lines] * len(grids))
     try:
-        ret += f'  {headers[36]}\n'
+        lines.append(f'{line}  {headers[36]}')
     except IndexError:
-        ret += f'\n'
+        lines.append(line)
 
-    header = '    '
-    for k in range(grids[0].size):
-        header += col[k] + ' '
-    ret += ((header.rstrip() + '    ') * len(grids)).rstrip()
-    ret.rstrip()
+    header = '    ' + ' '.join(col)
+    line = '    '.join([header] * len(grids))
     try:
-        ret += f'  {headers[37]}\n'
+        lines.append(f'{line}  {headers[37]}\n')
     except IndexError:
-        pass
-    return ret + '\n'
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
 
 
 def congratulate_p1() -> None:
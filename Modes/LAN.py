@@ -0,0 +1,234 @@
+"""
+LAN.py
+
+PURPOSE:
+Runs the entire LAN Traditional game mode, where two players on different
+computers play Traditional Battleship against each other. One player hosts the
+game and the other joins it. The host's computer runs the server (see
+Server.py) on a background thread, and both players, the host included, play
+through a client connected to it (see Client.py). Commands are checked and
+carried out on the player's copy of the game, so the game is played exactly
+like the Two Player Traditional mode. Anyone else on the network can watch the
+game as it is played.
+"""
+import asyncio
+import socket
+from typing import List, Tuple
+from Modes.General import _basic_info, press_to_continue, print_log, \
+    print_hint, congratulate_p1, congratulate_p2
+from Modes.Renderer import new_renderer
+from Modes.Server import GameServer
+from Modes.TPT import _place_fleet, _check_command, _carry_out, \
+    _error_message, _build_screen
+from Settings import DEFAULT, GREEN, PURPLE, RED, LAN_HOST, LAN_PORT, \
+    LAN_WATCH_PORT
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import play, watch
+
+# Draws the game screen every time it changes
+_SCREEN = new_renderer()
+
+
+def main() -> None:
+    print(f'{GREEN}Select An Option:{DEFAULT}')
+    print('\t(1) Host a game')
+    print('\t(2) Join a game')
+    print('\t(3) Watch a game')
+    response = input(f'{PURPLE} >>> {DEFAULT}').strip()
+    while response not in ('1', '2', '3'):
+        response = input(f'{PURPLE} >>> {RED}Invalid Option{DEFAULT} - '
+                         f'Please try again: ').strip()
+    if response == '1':
+        _host()
+    elif response == '2':
+        _join()
+    else:
+        _watch()
+
+
+def _host() -> None:
+    """Hosts a game and plays it as Player 1."""
+    server = GameServer(LAN_HOST, LAN_PORT, LAN_WATCH_PORT)
+    try:
+        server.start()
+    except OSError as error:
+        print(f'{RED}Unable to host a game:{DEFAULT} {error}')
+        press_to_continue()
+        return
+
+    print(f'{GREEN}Hosting a game{DEFAULT} - the other player can join at '
+          f'{PURPLE}{_address()}:{server.port}{DEFAULT}, and spectators '
+          f'at {PURPLE}{_address()}:{server.watch_port}{DEFAULT}\n')
+    try:
+        _play('127.0.0.1', server.port)
+    finally:
+        server.stop()
+
+
+def _join() -> None:
+    """Asks for the address of a game and joins it."""
+    _play(*_ask_address(LAN_PORT))
+
+
+def _watch() -> None:
+    """Asks which game to watch and which fleets to show, and watches it."""
+    host, port = _ask_address(LAN_WATCH_PORT)
+    number = input(f'{PURPLE} >>> Game number{DEFAULT} (hosted by a lobby '
+                   f'only; Enter for 1): ').strip()
+    while number and not number.isdigit():
+        number = input(f'{PURPLE} >>> {RED}Invalid Number{DEFAULT} - '
+                       f'Please try again: ').strip()
+    print(f'{GREEN}Fleets To Show{DEFAULT} (if the host shows them):')
+    print('\t(0) Neither')
+    print('\t(1) Player 1\'s')
+    print('\t(2) Player 2\'s')
+    print('\t(3) Both')
+    view = input(f'{PURPLE} >>> {DEFAULT}').strip()
+    while view not in ('0', '1', '2', '3'):
+        view = input(f'{PURPLE} >>> {RED}Invalid Option{DEFAULT} - '
+                     f'Please try again: ').strip()
+
+    _SCREEN.invalidate()  # Last drawn for another game, if any
+    try:
+        asyncio.run(watch(host, port, int(view), TerminalSpectator(int(view)),
+                          int(number or 1)))
+    except OSError as error:
+        print(f'\n{RED}Disconnected:{DEFAULT} {error}')
+        press_to_continue()
+
+
+def _ask_address(default: int) -> Tuple[str, int]:
+    """
+    Asks for the address of a host and returns it as (host, port).
+
+    Parameter(s):
+     - default: The port used if none is given
+    """
+    address = input(f'{PURPLE} >>> Host address{DEFAULT} '
+                    f'(address or address:port): ').strip()
+    host, _, port = address.rpartition(':')
+    if not port.isdigit():
+        host, port = address, str(default)
+    return host or '127.0.0.1', int(port)
+
+
+def _play(host: str, port: int) -> None:
+    """
+    Plays the game hosted at the address until it is over.
+
+    Parameter(s):
+     - host: The address of the host
+     - port: The port the host is listening on
+    """
+    _SCREEN.invalidate()  # Last drawn for another game, if any
+    try:
+        asyncio.run(play(host, port, TerminalInterface()))
+    except OSError as error:
+        print(f'\n{RED}Disconnected:{DEFAULT} {error}')
+        press_to_continue()
+
+
+def _address() -> str:
+    """Returns the address of this computer on the local network, if any."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        try:
+            probe.connect(('10.255.255.255', 1))  # Nothing is sent
+            return probe.getsockname()[0]
+        except OSError:
+            return '127.0.0.1'
+
+
+class TerminalInterface:
+    """
+    Plays a LAN game on the terminal (see Client.py). Only this client uses
+    the terminal, so input is read directly; the host, if any, runs on its own
+    thread.
+    """
+
+    async def join(self, number: int, taken: List[str]) -> Tuple[str, str]:
+        name, nation = _basic_info(number, taken)
+        print(f'{GREEN}Welcome,{DEFAULT} {Player(name, nation, number).name}!'
+              f'\n')
+        return name, nation
+
+    async def deploy(self, player: Player) -> None:
+        _place_fleet(player)
+        _SCREEN.invalidate()  # Setting up the grid drew over the screen
+        print(f'{GREEN}Waiting for the other player...{DEFAULT}')
+
+    async def turn(self, game: BattleshipGame) -> bool:
+        error = ''
+        while True:
+            _SCREEN.render(_build_screen(game.current_player,
+                                         game.other_player(),
+                                         game.current_orders, game.log))
+            if error:
+                response = input(f'{PURPLE} >>> {RED}{error}{DEFAULT}; '
+                                 f'{PURPLE}Command{DEFAULT}: ')
+            else:
+                response = input(f'{PURPLE} >>> Command{DEFAULT}: ')
+            check = _check_command(response, game)
+            error = '' if check[0] else _error_message(check[1])
+
+            if not check[0]:
+                continue
+            elif check[1] == 1:
+                return True
+            elif check[1] == 5:
+                return False
+            elif check[1] == 2:
+                print_log(game)
+                _SCREEN.invalidate()
+            elif check[1] == 6:
+                print_hint(game)
+                _SCREEN.invalidate()
+            else:
+                _carry_out(game, check)
+
+    async def wait(self, game: BattleshipGame) -> None:
+        _SCREEN.render(_build_screen(game.other_player(), game.current_player,
+                                     [], game.log))
+        print(f'{GREEN}Waiting for the other player...{DEFAULT}')
+
+    async def over(self, winner: int, number: int) -> None:
+        if winner == 1:
+            congratulate_p1()
+        else:
+            congratulate_p2()
+
+
+class TerminalSpectator:
+    """
+    Watches a LAN game on the terminal (see Client.py), from the point of view
+    of the player whose fleet is shown, or Player 1 if both or neither are.
+
+    Attribute(s):
+     - number: The player number of the player the game is watched as
+    """
+    number: int
+
+    def __init__(self, view: int) -> None:
+        """
+        Initializes a new TerminalSpectator.
+
+        Parameter(s):
+         - view: The player numbers whose fleet is shown, added together
+        """
+        self.number = 2 if view == 2 else 1
+
+    async def start(self, game: BattleshipGame) -> None:
+        await self.update(game)
+
+    async def update(self, game: BattleshipGame) -> None:
+        player = game.player1 if self.number == 1 else game.player2
+        other = game.player2 if self.number == 1 else game.player1
+        _SCREEN.render(_build_screen(player, other, [], game.log))
+        print(f'{GREEN}Watching{DEFAULT} - turn {game.current_turn_number}, '
+              f'{game.current_player.name} to play...')
+
+    async def over(self, winner: int) -> None:
+        if winner == 1:
+            congratulate_p1()
+        else:
+            congratulate_p2()
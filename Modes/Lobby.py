@@ -0,0 +1,236 @@
+"""
+Lobby.py
+
+PURPOSE:
+Runs a lobby server that hosts many LAN games at once, such as for a
+tournament night. Players join it with the LAN Traditional mode exactly as
+they would join a single game (see LAN.py), and are matched with the player
+who has been waiting the longest. Games no one has sent a message to for a
+while are closed: the player whose turn it is forfeits, or the game is
+abandoned if it has not started.
+
+Every game is a GameSession with its own lock (see Server.py), so messages are
+handled one at a time within a game while games never wait on each other.
+Spectators connect to a port of their own and ask for a game by its number;
+games are numbered from 1 in the order they are opened. They are only shown
+where vessels lie once a game is over, unless the lobby is run with --reveal.
+
+Run from the root of the project:
+    python Main.py lobby [--host ADDRESS] [--port N] [--watch-port N]
+                         [--idle SECONDS] [--reveal]
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Deque, Dict, List, Optional, Set
+from Modes.Server import GameSession, serve_seat, serve_spectator
+from Settings import DEFAULT, GREEN, PURPLE, LAN_HOST, LAN_PORT, \
+    LAN_WATCH_PORT, LAN_REVEAL
+
+# Default time a game can go without a message before it is closed, in seconds
+IDLE = 600
+
+# Time between checks for idle games, in seconds
+SWEEP = 5
+
+# Connections the operating system holds until the lobby accepts them; beyond
+# this, players connecting at the same moment may never be accepted
+BACKLOG = 1024
+
+
+class Lobby:
+    """
+    Hosts any number of games, matching players in the order they connect.
+
+    Attribute(s):
+     - host: The address listened on
+     - port: The port listened on
+     - watch_port: The port listened on for spectators
+     - idle: The time a game can go without a message before it is closed, in
+       seconds
+     - reveal: Whether spectators are shown where vessels lie before a game
+       is over
+     - sessions: Every game still open, by game number
+     - waiting: The game numbers of the games waiting for a second player,
+       oldest first
+     - games: The number of games opened so far
+     - connections: The task serving every connection still open
+     - server: The listening server, once started
+     - watcher: The server listening for spectators, once started
+    """
+    host: str
+    port: int
+    watch_port: int
+    idle: float
+    reveal: bool
+    sessions: Dict[int, GameSession]
+    waiting: Deque[int]
+    games: int
+    connections: Set[asyncio.Task]
+    server: Optional[asyncio.AbstractServer]
+    watcher: Optional[asyncio.AbstractServer]
+
+    def __init__(self, host: str, port: int, watch_port: int,
+                 idle: float = IDLE, reveal: bool = LAN_REVEAL) -> None:
+        """
+        Initializes a new Lobby.
+
+        Parameter(s):
+         - host: The address to listen on
+         - port: The port to listen on; any free port if 0
+         - watch_port: The port to listen on for spectators; any free port
+           if 0
+         - idle: The time a game can go without a message before it is
+           closed, in seconds
+         - reveal: Whether spectators are shown where vessels lie before a
+           game is over
+        """
+        self.host = host
+        self.port = port
+        self.watch_port = watch_port
+        self.idle = idle
+        self.reveal = reveal
+        self.sessions = {}
+        self.waiting = deque()
+        self.games = 0
+        self.connections = set()
+        self.server = None
+        self.watcher = None
+
+    async def start(self) -> None:
+        """Starts listening. Raises OSError if the lobby cannot listen."""
+        self.server = await asyncio.start_server(
+            self._connected, self.host, self.port, backlog=BACKLOG)
+        self.port = self.server.sockets[0].getsockname()[1]
+        try:
+            self.watcher = await asyncio.start_server(
+                self._watching, self.host, self.watch_port, backlog=BACKLOG)
+        except OSError:
+            self.server.close()
+            raise
+        self.watch_port = self.watcher.sockets[0].getsockname()[1]
+
+    async def serve(self) -> None:
+        """
+        Hosts games, closing idle ones, until cancelled.
+
+        Precondition(s):
+         - start() was called
+        """
+        async with self.server, self.watcher:
+            while True:
+                await asyncio.sleep(SWEEP)
+                await self._sweep()
+
+    async def _connected(self, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        """
+        Matches a new connection with a game and serves it. Games abandoned or
+        closed before the player could sit down are skipped.
+
+        Parameter(s):
+         - reader: Where messages from the player are read
+         - writer: Where messages to the player are written
+        """
+        task = asyncio.current_task()
+        self.connections.add(task)
+        seat = None
+        try:
+            while seat is None:
+                number = self._match()
+                session = self.sessions[number]
+                async with session.lock:
+                    seat = session.sit(writer)
+                    await session.flush()
+            await serve_seat(session, seat, reader)
+        finally:
+            self.connections.discard(task)
+            if session.over and not session.seats:
+                self.sessions.pop(number, None)
+
+    async def _watching(self, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> None:
+        """
+        Serves a new spectator connection.
+
+        Parameter(s):
+         - reader: Where messages from the spectator are read
+         - writer: Where messages to the spectator are written
+        """
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            await serve_spectator(self.sessions.get, reader, writer)
+        finally:
+            self.connections.discard(task)
+
+    def _match(self) -> int:
+        """
+        Returns the number of the game a new player joins: the oldest game
+        waiting for a second player, or a new game if there is none.
+        """
+        while self.waiting:
+            number = self.waiting.popleft()
+            session = self.sessions.get(number)
+            if session is not None and not session.over:
+                return number
+
+        self.games += 1
+        self.sessions[self.games] = GameSession(self.reveal)
+        self.waiting.append(self.games)
+        return self.games
+
+    async def _sweep(self) -> None:
+        """Closes every game no one has sent a message to for too long."""
+        now = monotonic()
+        for number, session in list(self.sessions.items()):
+            if now - session.active > self.idle and not session.over:
+                async with session.lock:
+                    session.evict()
+                    await session.flush()
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """
+    Runs a lobby until interrupted.
+
+    Parameter(s):
+     - args: The command line arguments after 'lobby'
+    """
+    options = _parse(args)
+    lobby = Lobby(options.host, options.port, options.watch_port,
+                  options.idle, options.reveal)
+
+    async def _run() -> None:
+        await lobby.start()
+        print(f'{PURPLE}LOBBY{DEFAULT}: listening on '
+              f'{GREEN}{options.host}:{lobby.port}{DEFAULT}, spectators on '
+              f'{GREEN}{options.host}:{lobby.watch_port}{DEFAULT}',
+              flush=True)
+        await lobby.serve()
+
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        print(f'\n{PURPLE}LOBBY{DEFAULT}: {lobby.games} games hosted')
+
+
+def _parse(args: Optional[List[str]]) -> argparse.Namespace:
+    """
+    Returns the lobby options given on the command line.
+
+    Parameter(s):
+     - args: The command line arguments after 'lobby'
+    """
+    parser = argparse.ArgumentParser(prog='Main.py lobby')
+    parser.add_argument('--host', default=LAN_HOST)
+    parser.add_argument('--port', type=int, default=LAN_PORT)
+    parser.add_argument('--watch-port', type=int, default=LAN_WATCH_PORT,
+                        help='port spectators connect to')
+    parser.add_argument('--idle', type=float, default=IDLE,
+                        help='seconds a game can go without a message')
+    parser.add_argument('--reveal', action='store_true', default=LAN_REVEAL,
+                        help='show spectators where vessels lie during games')
+    return parser.parse_args(args)
@@ -0,0 +1,225 @@
+"""
+Renderer.py
+
+PURPOSE:
+Draws full screens (frames) on the terminal. Two renderers are available and
+can be selected with Settings.RENDERER:
+ - 'full': Reprints the whole frame below the previous one, exactly like the
+   game always has
+ - 'diff': Remembers the last frame drawn and only rewrites the characters that
+   changed, using ANSI cursor positioning, in a single buffered write
+
+The diff renderer assumes the terminal is at least as tall as the frame, so
+that drawing the frame never scrolls the screen.
+"""
+import re
+import sys
+import unicodedata
+from typing import List, Tuple, Optional, TextIO
+from Settings import DEFAULT, RENDERER
+
+# Matches a single ANSI color (SGR) sequence, such as Settings.GREEN
+SGR = re.compile(r'\033\[[0-9;]*m')
+
+# ANSI cursor / screen control sequences
+HOME = '\033[H'
+CLEAR_SCREEN = '\033[2J'
+CLEAR_LINE = '\033[K'
+CLEAR_BELOW = '\033[J'
+
+
+def _move(row: int, col: int) -> str:
+    """
+    Returns the sequence that moves the cursor to the specified position.
+
+    Parameter(s):
+     - row: The line of the screen, starting at 0
+     - col: The column of the screen, starting at 0
+    """
+    return f'\033[{row + 1};{col + 1}H'
+
+
+def _cells(line: str) -> List[Tuple[str, str, int]]:
+    """
+    Splits a line into the characters that are displayed. Each character is
+    returned as (active color, character, display width).
+
+    Parameter(s):
+     - line: The line being split
+    """
+    ret = []
+    color = DEFAULT
+    pos = 0
+    for match in SGR.finditer(line):
+        for char in line[pos:match.start()]:
+            ret.append((color, char, _width(char)))
+        color = match.group()
+        pos = match.end()
+    for char in line[pos:]:
+        ret.append((color, char, _width(char)))
+    return ret
+
+
+def _width(char: str) -> int:
+    """
+    Returns the number of terminal columns a character takes up.
+
+    Parameter(s):
+     - char: The character being displayed
+    """
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+
+class FullRenderer:
+    """
+    Reprints every frame in full.
+
+    Attribute(s):
+     - stream: Where frames are written to
+    """
+    stream: Optional[TextIO]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Initializes a new FullRenderer.
+
+        Parameter(s):
+         - stream: Where frames are written to; standard output by default
+        """
+        self.stream = stream
+
+    def render(self, frame: str) -> int:
+        """
+        Draws the frame and returns the number of bytes written.
+
+        Parameter(s):
+         - frame: The full screen being drawn
+        """
+        out = f'{frame}\n'
+        stream = self.stream or sys.stdout
+        stream.write(out)
+        stream.flush()
+        return len(out.encode())
+
+    def invalidate(self) -> None:
+        """Called when something else was printed on the screen."""
+
+
+class DiffRenderer:
+    """
+    Remembers the last frame drawn and only rewrites the characters that have
+    changed since.
+
+    Attribute(s):
+     - stream: Where frames are written to
+     - last: The characters of every line of the last frame drawn, or None if
+       the next frame has to be drawn in full
+    """
+    stream: Optional[TextIO]
+    last: Optional[List[List[Tuple[str, str, int]]]]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """
+        Initializes a new DiffRenderer.
+
+        Parameter(s):
+         - stream: Where frames are written to; standard output by default
+        """
+        self.stream = stream
+        self.last = None
+
+    def render(self, frame: str) -> int:
+        """
+        Draws the frame and returns the number of bytes written. The cursor is
+        left on the line below the frame.
+
+        Parameter(s):
+         - frame: The full screen being drawn
+        """
+        lines = [_cells(line) for line in frame.split('\n')]
+
+        if self.last is None:
+            out = [CLEAR_SCREEN, HOME, frame]
+        else:
+            out = []
+            for row, cells in enumerate(lines):
+                try:
+                    old = self.last[row]
+                except IndexError:
+                    old = []
+                out.extend(self._diff_line(row, old, cells))
+            for row in range(len(lines), len(self.last)):
+                out.append(_move(row, 0) + CLEAR_LINE)
+
+        # Leave the cursor below the frame for any input prompt
+        out.append(f'{DEFAULT}{_move(len(lines), 0)}{CLEAR_BELOW}')
+        self.last = lines
+
+        out = ''.join(out)
+        stream = self.stream or sys.stdout
+        stream.write(out)
+        stream.flush()
+        return len(out.encode())
+
+    def invalidate(self) -> None:
+        """
+        Called when something else was printed on the screen; the next frame is
+        drawn in full.
+        """
+        self.last = None
+
+    @staticmethod
+    def _diff_line(row: int, old: List[Tuple[str, str, int]],
+                   new: List[Tuple[str, str, int]]) -> List[str]:
+        """
+        Returns the output needed to turn the old line into the new line.
+
+        Parameter(s):
+         - row: The line of the screen being changed
+         - old: The characters of the line currently on screen
+         - new: The characters of the line being drawn
+        """
+        out = []
+        col = 0  # Display column of the character in the new line
+        old_col = 0  # Display column of the character in the old line
+        color = None  # Color currently active in the output
+        i = 0
+        while i < len(new):
+            if i < len(old) and old[i] == new[i] and old_col == col:
+                col += new[i][2]
+                old_col += old[i][2]
+                i += 1
+                continue
+
+            # Rewrite the run of changed characters
+            out.append(_move(row, col))
+            while i < len(new) and (i >= len(old) or old[i] != new[i] or
+                                    old_col != col):
+                if new[i][0] != color:
+                    color = new[i][0]
+                    out.append(color)
+                out.append(new[i][1])
+                col += new[i][2]
+                if i < len(old):
+                    old_col += old[i][2]
+                i += 1
+
+        # Line got shorter; erase what is left of the old line
+        if sum(cell[2] for cell in old) > col:
+            out.append(_move(row, col) + CLEAR_LINE)
+        return out
+
+
+def new_renderer(mode: str = RENDERER, stream: Optional[TextIO] = None):
+    """
+    Returns the renderer selected by mode.
+
+    Parameter(s):
+     - mode: 'full' or 'diff'
+     - stream: Where frames are written to; standard output by default
+    """
+    if mode == 'diff':
+        return DiffRenderer(stream)
+    return FullRenderer(stream)
@@ -0,0 +1,95 @@
+"""
+SPT.py
+
+PURPOSE:
+Runs the entire Single Player Traditional game mode, where Player 1 plays
+Traditional Battleship against a computer player. The computer places its
+fleet so no two vessels touch and fires at the nodes most likely to hold a
+vessel, either by counting placements (see Density.py) or, on the hard
+difficulty, by sampling layouts (see MonteCarlo.py) and solving the endgame
+exactly (see Endgame.py). On the hard difficulty, the computer keeps sampling
+while Player 1 plans their turn.
+"""
+from random import Random
+from typing import Union
+from Modes.General import _basic_info, congratulate_p1, congratulate_p2
+from Modes.TPT import _SCREEN, _setup_fleet_grid, _take_command
+from Settings import DEFAULT, GREEN, PURPLE, RED, NATIONS
+from Objects.AI.Density import DensityTargeting
+from Objects.AI.Endgame import EndgameTargeting
+from Objects.AI.MonteCarlo import MonteCarloTargeting
+from Objects.AI.Strategies import apart_placement
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Player import Player
+
+# Name of the computer player
+CPU_NAME = 'Computer'
+
+
+def main() -> None:
+    # First time setup
+    p1_name, p1_nation = _basic_info(1, [])
+    p1 = Player(p1_name, p1_nation, 1)
+    print(f'{GREEN}Welcome,{DEFAULT} {p1.name}!\n')
+
+    # Computer takes any other nation
+    rng = Random()
+    p2 = Player(CPU_NAME, rng.choice([nation for nation in NATIONS
+                                      if nation != p1_nation]), 2)
+    cpu = _choose_difficulty(rng)
+    sampler = cpu.heuristic if isinstance(cpu, EndgameTargeting) else None
+
+    # Create player fleets
+    full_game = Engine.new_game(p1, p2)
+
+    # Setup both grids
+    _setup_fleet_grid(full_game, full_game.player1)
+    apart_placement(full_game.player2, rng)
+    full_game.update_p2_backup()
+
+    # Starting game, with Player 1 going first; the computer thinks about its
+    # next turn while Player 1 plans theirs. The screen was last drawn for
+    # another game, if any, so the first frame is drawn in full
+    _SCREEN.invalidate()
+    try:
+        if sampler is not None:
+            sampler.ponder(full_game.player2, full_game.player1)
+        winner = full_game.check_winner()
+        while not winner[0]:
+            if full_game.current_player == full_game.player1:
+                winner = _take_command(full_game)
+            else:
+                Engine.submit_orders(full_game, cpu.choose(full_game))
+                Engine.end_turn(full_game)
+                winner = full_game.check_winner()
+                if sampler is not None and not winner[0]:
+                    sampler.ponder(full_game.player2, full_game.player1)
+    finally:
+        if sampler is not None:
+            sampler.close()
+
+    if winner[1] == full_game.player1:
+        congratulate_p1()
+    else:
+        congratulate_p2()
+
+
+def _choose_difficulty(rng: Random) \
+        -> Union[DensityTargeting, EndgameTargeting]:
+    """
+    Asks Player 1 how strong the computer player should be and returns its
+    targeting strategy.
+
+    Parameter(s):
+     - rng: The random number generator used by the computer player
+    """
+    print(f'{GREEN}Select A Difficulty:{DEFAULT}')
+    print('\t(1) Normal')
+    print('\t(2) Hard')
+    response = input(f'{PURPLE} >>> {DEFAULT}').strip()
+    while response not in ('1', '2'):
+        response = input(f'{PURPLE} >>> {RED}Invalid Option{DEFAULT} - '
+                         f'Please try again: ').strip()
+    if response == '1':
+        return DensityTargeting(rng)
+    return EndgameTargeting(rng, MonteCarloTargeting(rng))
@@ -0,0 +1,642 @@
+"""
+Server.py
+
+PURPOSE:
+Hosts LAN games of Traditional Battleship. The host is authoritative: it keeps
+the only complete BattleshipGame, while every player keeps a copy in which the
+enemy fleet is hidden (see Client.py). Players only send their fleet and their
+orders once their turn is over, which are checked and carried out by the
+engine, and both players are sent the result of every order (see Protocol.py
+for the messages).
+
+Any number of spectators can watch a game from a port of their own. They are
+sent the players' fleets, and then exactly what the players are sent. The host
+decides whether spectators are shown where the vessels lie before the game is
+over, whatever fleets they ask to see, so a spectator cannot tell a player
+where the enemy fleet is. Every message is encoded once and the same bytes are
+written to every spectator, and spectators are never waited on: one that falls
+too far behind is disconnected, so that it never holds up the players.
+
+Every connection is served by a single asyncio event loop without blocking, so
+the host can run in a background thread of a process that is also running a
+terminal game (see LAN.py). Messages are handled on worker threads while
+holding the lock of their game, so the messages of a game are handled one at a
+time, while a slow message never holds up the connections of other games
+served by the same event loop (see Lobby.py).
+"""
+from __future__ import annotations
+import asyncio
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from Settings import NATIONS, LAN_FLEET, LAN_REVEAL, LAN_NAME_LIMIT
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Coordinate import from_cell
+from Objects.Mechanics.Fleet import CLASSES
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import deployment
+from Objects.Network.Protocol import HELLO, JOIN, DEPLOY, START, ORDERS, \
+    FORFEIT, RESULTS, OVER, ERROR, WATCH, FLEET, encode, receive
+
+# Most bytes that can wait to be written to a spectator before they are
+# disconnected for falling behind
+SPECTATOR_LIMIT = 1 << 18
+
+
+class Seat:
+    """
+    The connection to one of the two players of a game.
+
+    Attribute(s):
+     - number: The player number
+     - writer: Where messages to the player are written
+     - greeted: Whether the player was sent HELLO
+     - name: The name the player joined with, without their rank
+     - player: The player, once they joined
+     - deployed: Whether the player has placed their fleet
+     - outbox: The messages waiting to be written to the player
+    """
+    number: int
+    writer: asyncio.StreamWriter
+    greeted: bool
+    name: str
+    player: Optional[Player]
+    deployed: bool
+    outbox: List[bytes]
+
+    def __init__(self, number: int, writer: asyncio.StreamWriter) -> None:
+        """
+        Initializes a new Seat.
+
+        Parameter(s):
+         - number: The player number
+         - writer: Where messages to the player are written
+        """
+        self.number = number
+        self.writer = writer
+        self.greeted = False
+        self.name = ''
+        self.player = None
+        self.deployed = False
+        self.outbox = []
+
+    def send(self, kind: int, *fields) -> None:
+        """
+        Sends a message to the player. The message is only added to the outbox,
+        so messages can be sent from any thread; see flush().
+
+        Parameter(s):
+         - kind: The kind of message
+         - fields: The fields of the message
+        """
+        self.outbox.append(encode(kind, *fields))
+
+    def post(self, message: bytes) -> None:
+        """
+        Sends a message that is already encoded, like send().
+
+        Parameter(s):
+         - message: The encoded message
+        """
+        self.outbox.append(message)
+
+    async def flush(self) -> None:
+        """
+        Writes every message in the outbox, unless the player has disconnected,
+        and waits until the network can take more.
+
+        Precondition(s):
+         - Called from the event loop of the connection
+        """
+        outbox, self.outbox = self.outbox, []
+        if self.writer.is_closing():
+            return
+        self.writer.writelines(outbox)
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+class Spectator:
+    """
+    The connection to someone watching a game.
+
+    Attribute(s):
+     - view: The player numbers whose fleet they asked to see, added together
+       (0 for neither, 3 for both)
+     - writer: Where messages to the spectator are written
+     - sent: The number of messages of the game's history written to them, or
+       None before they were sent the fleets
+    """
+    view: int
+    writer: asyncio.StreamWriter
+    sent: Optional[int]
+
+    def __init__(self, view: int, writer: asyncio.StreamWriter) -> None:
+        """
+        Initializes a new Spectator.
+
+        Parameter(s):
+         - view: The player numbers whose fleet they asked to see, added
+           together
+         - writer: Where messages to the spectator are written
+        """
+        self.view = view
+        self.writer = writer
+        self.sent = None
+
+
+class GameSession:
+    """
+    A game between two connected players. Every method changing the session
+    must be called while holding its lock, so no message ever sees a game that
+    is half-changed.
+
+    Attribute(s):
+     - seats: The seat of every connected player, by player number
+     - spectators: Every spectator connected
+     - game: The game, once both players have placed their fleets
+     - fleets: The FLEET message of every player, by player number, with
+       their vessels hidden and placed, once the game has started
+     - reveal: Whether spectators are shown where vessels lie before the game
+       is over
+     - history: Every message sent to both players since the game started
+     - over: Whether the game is over or abandoned
+     - done: Set once the game is over or abandoned and every player was told
+     - lock: Held while the session is being changed
+     - active: When a player last joined or sent a message (see monotonic())
+    """
+    seats: Dict[int, Seat]
+    spectators: List[Spectator]
+    game: Optional[BattleshipGame]
+    fleets: Dict[int, Tuple[bytes, bytes]]
+    reveal: bool
+    history: List[bytes]
+    over: bool
+    done: asyncio.Event
+    lock: asyncio.Lock
+    active: float
+
+    def __init__(self, reveal: bool = LAN_REVEAL) -> None:
+        """
+        Initializes a new GameSession with no players.
+
+        Parameter(s):
+         - reveal: Whether spectators are shown where vessels lie before the
+           game is over
+        """
+        self.seats = {}
+        self.spectators = []
+        self.game = None
+        self.fleets = {}
+        self.reveal = reveal
+        self.history = []
+        self.over = False
+        self.done = asyncio.Event()
+        self.lock = asyncio.Lock()
+        self.active = monotonic()
+
+    def sit(self, writer: asyncio.StreamWriter) -> Optional[Seat]:
+        """
+        Returns the seat of a new connection, or None if the game is full.
+
+        Parameter(s):
+         - writer: Where messages to the player are written
+        """
+        if self.over or len(self.seats) == 2:
+            return None
+        seat = Seat(2 if 1 in self.seats else 1, writer)
+        self.seats[seat.number] = seat
+        self.active = monotonic()
+        self._greet()
+        return seat
+
+    def leave(self, seat: Seat) -> None:
+        """
+        Removes a player who disconnected. If the game has not started it is
+        abandoned, otherwise the player forfeits.
+
+        Parameter(s):
+         - seat: The seat of the player
+        """
+        del self.seats[seat.number]
+        if self.over:
+            return
+        if self.game is None:
+            for other in self.seats.values():
+                other.send(ERROR, 'The other player left')
+            self.over = True
+        else:
+            seat.player.forfeit = True
+            self._finish()
+
+    def evict(self) -> None:
+        """
+        Ends a game no one has sent a message to for a while. If the game has
+        not started it is abandoned, otherwise the current player forfeits.
+        """
+        if self.game is None:
+            for seat in self.seats.values():
+                seat.send(ERROR, 'Closed for inactivity')
+            self.over = True
+        else:
+            self.game.current_player.forfeit = True
+            self._finish()
+
+    def close(self) -> None:
+        """Closes the connection to every player and spectator."""
+        for seat in self.seats.values():
+            seat.writer.close()
+        for spectator in self.spectators:
+            spectator.writer.close()
+
+    async def flush(self) -> None:
+        """
+        Writes every message sent to every player and spectator. Once the game
+        is over, also closes every connection and sets done.
+
+        Precondition(s):
+         - Called from the event loop of the connections
+        """
+        for seat in list(self.seats.values()):
+            await seat.flush()
+        for spectator in list(self.spectators):
+            self._feed(spectator)
+        if self.over:
+            self.close()
+            self.done.set()
+
+    # Messages -----------------------------------------------------------------
+    def handle(self, seat: Seat, kind: int, fields: tuple) -> None:
+        """
+        Handles a message from a player. Raises ValueError if the message is
+        not allowed.
+
+        Parameter(s):
+         - seat: The seat of the player
+         - kind: The kind of message
+         - fields: The fields of the message
+        """
+        self.active = monotonic()
+        game = self.game
+        current = game is not None and seat.player is game.current_player
+        if kind == JOIN and seat.greeted and seat.player is None:
+            self._join(seat, *fields)
+        elif kind == DEPLOY and seat.player is not None and not seat.deployed:
+            self._deploy(seat, *fields)
+        elif kind == ORDERS and current:
+            self._orders(*fields)
+        elif kind == FORFEIT and current:
+            Engine.forfeit(game)
+            self._finish()
+        else:
+            raise ValueError(f'Unexpected message: {kind}')
+
+    def _join(self, seat: Seat, nation: str, name: str) -> None:
+        """
+        Lets a player join the game. Names are shown to the other player and
+        spectators, so empty or long names and names with characters that are
+        not printable, such as terminal escape codes, are not allowed.
+
+        Parameter(s):
+         - seat: The seat of the player
+         - nation: The nation of the player
+         - name: The name of the player
+        """
+        if nation not in NATIONS or nation in self._taken():
+            raise ValueError(f'Nation not available: {nation}')
+        if not 0 < len(name) <= LAN_NAME_LIMIT or not name.isprintable():
+            raise ValueError(f'Invalid name; names are 1 to {LAN_NAME_LIMIT} '
+                             f'printable characters')
+        seat.name = name
+        seat.player = Player(name, nation, seat.number)
+        self._greet()
+
+    def _deploy(self, seat: Seat,
+                fleet: List[Tuple[str, int, Tuple[str, str], str]]) -> None:
+        """
+        Places a player's fleet, and starts the game once both fleets are
+        placed.
+
+        Parameter(s):
+         - seat: The seat of the player
+         - fleet: Every vessel of the fleet, as (class, pennant, coordinate,
+           direction)
+        """
+        if sorted(vessel[0] for vessel in fleet) != \
+                sorted(abbrev for abbrev, count in zip(CLASSES, LAN_FLEET)
+                       for _ in range(count)):
+            raise ValueError('Not a fleet')
+        for abbrev, pennant, coordinate, direction in fleet:
+            if Engine.enlist(seat.player, abbrev, pennant) != Engine.OK or \
+                    Engine.deploy(seat.player, abbrev, pennant, coordinate,
+                                  direction) != Engine.OK:
+                raise ValueError('Invalid deployment')
+        seat.deployed = True
+
+        if len(self.seats) == 2 and \
+                all(other.deployed for other in self.seats.values()):
+            self.game = Engine.new_game(self.seats[1].player,
+                                        self.seats[2].player, fleets=0)
+            for number, other in self.seats.items():
+                placed = deployment(other.player)
+                hidden = [vessel[:2] for vessel in placed]
+                self.fleets[number] = (
+                    encode(FLEET, number, other.player.nation[0], hidden,
+                           other.name),
+                    encode(FLEET, number, other.player.nation[0], placed,
+                           other.name))
+                self.seats[3 - number].send(START, other.player.nation[0],
+                                            hidden, other.name)
+
+    def _orders(self, cells: List[int]) -> None:
+        """
+        Carries out the orders of the current player and ends their turn.
+
+        Parameter(s):
+         - cells: The cell id targeted by every order
+        """
+        game = self.game
+        number = game.current_player.number
+        turn = game.current_turn_number
+        if Engine.submit_orders(game, [from_cell(cell) for cell in cells]) \
+                != Engine.OK:
+            raise ValueError('Invalid orders')
+
+        self._broadcast(encode(RESULTS, number, turn, Engine.end_turn(game)))
+        if game.check_winner()[0]:
+            self._finish()
+
+    # Helper functions ---------------------------------------------------------
+    def _taken(self) -> list:
+        """Returns the nations of the players who have joined."""
+        return [seat.player.nation[0] for seat in self.seats.values()
+                if seat.player is not None]
+
+    def _greet(self) -> None:
+        """
+        Sends HELLO to every player not greeted yet once every player before
+        them has joined, so nobody picks a nation that is already taken.
+        """
+        for number in sorted(self.seats):
+            seat = self.seats[number]
+            if not seat.greeted:
+                seat.send(HELLO, number, self._taken(), list(LAN_FLEET))
+                seat.greeted = True
+            if seat.player is None:
+                break
+
+    def _finish(self) -> None:
+        """Tells every player who won, and ends the game."""
+        self._broadcast(encode(OVER, self.game.check_winner()[1].number))
+        self.over = True
+
+    def _broadcast(self, message: bytes) -> None:
+        """
+        Sends a message to every player, and adds it to the history sent to
+        spectators.
+
+        Parameter(s):
+         - message: The encoded message
+        """
+        for seat in self.seats.values():
+            seat.post(message)
+        self.history.append(message)
+
+    def _feed(self, spectator: Spectator) -> None:
+        """
+        Writes every message a spectator has not been sent yet, without
+        waiting for the network. Spectators are first sent both fleets, as far
+        as they asked to see them, but with every vessel hidden if the host
+        does not reveal them and the game is not over yet. Disconnects the
+        spectator if too much is still waiting to be written to them.
+
+        Parameter(s):
+         - spectator: The spectator
+
+        Precondition(s):
+         - Called from the event loop of the connections
+        """
+        writer = spectator.writer
+        if writer.is_closing():
+            self.spectators.remove(spectator)
+            return
+        if spectator.sent is None:
+            if self.game is None:
+                if self.over:
+                    writer.write(encode(ERROR, 'The game was abandoned'))
+                return
+            view = spectator.view if self.reveal or self.over else 0
+            writer.writelines([self.fleets[number][bool(view & number)]
+                               for number in (1, 2)])
+            spectator.sent = 0
+
+        writer.writelines(self.history[spectator.sent:])
+        spectator.sent = len(self.history)
+        if writer.transport.get_write_buffer_size() > SPECTATOR_LIMIT:
+            writer.transport.abort()
+            self.spectators.remove(spectator)
+
+
+async def serve_seat(session: GameSession, seat: Seat,
+                     reader: asyncio.StreamReader) -> None:
+    """
+    Handles every message from a player, on a worker thread while holding the
+    lock of the session, until they disconnect or the game is over. Players
+    sending a message that is not allowed are disconnected.
+
+    Parameter(s):
+     - session: The game the player is in
+     - seat: The seat of the player
+     - reader: Where messages from the player are read
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while not session.over:
+            message = await receive(reader)
+            if message is None:
+                break
+            async with session.lock:
+                await loop.run_in_executor(None, session.handle, seat,
+                                           *message)
+                await session.flush()
+    except ValueError as error:
+        seat.send(ERROR, str(error))
+    finally:
+        async with session.lock:
+            await seat.flush()
+            session.leave(seat)
+            await session.flush()
+        seat.writer.close()
+
+
+async def serve_spectator(find: Callable[[int], Optional[GameSession]],
+                          reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> None:
+    """
+    Lets a new connection watch the game it asks for with WATCH until the game
+    is over or they disconnect. Spectators only listen; those sending anything
+    else are disconnected.
+
+    Parameter(s):
+     - find: Returns the game with a game number, if any
+     - reader: Where messages from the spectator are read
+     - writer: Where messages to the spectator are written
+    """
+    session = spectator = None
+    try:
+        message = await receive(reader)
+        if message is None:
+            return
+        kind, fields = message
+        if kind != WATCH:
+            raise ValueError(f'Unexpected message: {kind}')
+        view, number = fields
+        session = find(number)
+        if session is None:
+            raise ValueError(f'No game {number}')
+
+        spectator = Spectator(view, writer)
+        async with session.lock:
+            session.spectators.append(spectator)
+            await session.flush()
+        message = await receive(reader)
+        if message is not None:
+            raise ValueError(f'Unexpected message: {message[0]}')
+    except ValueError as error:
+        if not writer.is_closing():
+            writer.write(encode(ERROR, str(error)))
+    finally:
+        if session is not None and spectator in session.spectators:
+            session.spectators.remove(spectator)
+        writer.close()
+
+
+class GameServer:
+    """
+    Listens for the two players of a single LAN game and hosts the game until
+    it is over, along with any number of spectators.
+
+    Attribute(s):
+     - host: The address listened on
+     - port: The port listened on
+     - watch_port: The port listened on for spectators
+     - session: The game hosted
+     - ready: Set once the server is listening, or failed to
+     - error: Why the server failed to start listening, if it did
+     - loop: The event loop of the server, once running
+     - connections: The task serving every connection still open
+    """
+    host: str
+    port: int
+    watch_port: int
+    session: GameSession
+    ready: Event
+    error: Optional[OSError]
+    loop: Optional[asyncio.AbstractEventLoop]
+    connections: Set[asyncio.Task]
+
+    def __init__(self, host: str, port: int, watch_port: int,
+                 reveal: bool = LAN_REVEAL) -> None:
+        """
+        Initializes a new GameServer.
+
+        Parameter(s):
+         - host: The address to listen on
+         - port: The port to listen on; any free port if 0
+         - watch_port: The port to listen on for spectators; any free port
+           if 0
+         - reveal: Whether spectators are shown where vessels lie before the
+           game is over
+        """
+        self.host = host
+        self.port = port
+        self.watch_port = watch_port
+        self.session = GameSession(reveal)
+        self.ready = Event()
+        self.error = None
+        self.loop = None
+        self.connections = set()
+
+    async def serve(self) -> None:
+        """Hosts the game until it is over or stop() is called."""
+        self.loop = asyncio.get_running_loop()
+        server = None
+        try:
+            server = await asyncio.start_server(self._connected, self.host,
+                                                self.port)
+            watcher = await asyncio.start_server(self._watching, self.host,
+                                                 self.watch_port)
+        except OSError as error:
+            if server is not None:
+                server.close()
+            self.error = error
+            self.ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self.watch_port = watcher.sockets[0].getsockname()[1]
+        self.ready.set()
+
+        async with server, watcher:
+            await self.session.done.wait()
+            self.session.close()
+            await asyncio.gather(*self.connections)
+
+    async def _connected(self, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        """
+        Serves a new connection.
+
+        Parameter(s):
+         - reader: Where messages from the player are read
+         - writer: Where messages to the player are written
+        """
+        async with self.session.lock:
+            seat = self.session.sit(writer)
+            await self.session.flush()
+        if seat is None:
+            writer.write(encode(ERROR, 'The game is full'))
+            writer.close()
+            return
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            await serve_seat(self.session, seat, reader)
+        finally:
+            self.connections.discard(task)
+
+    async def _watching(self, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> None:
+        """
+        Serves a new spectator connection; the game number is not used.
+
+        Parameter(s):
+         - reader: Where messages from the spectator are read
+         - writer: Where messages to the spectator are written
+        """
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            await serve_spectator(lambda number: self.session, reader, writer)
+        finally:
+            self.connections.discard(task)
+
+    def start(self) -> None:
+        """
+        Hosts the game on a background thread. Returns once the server is
+        listening, or raises OSError if it cannot listen.
+        """
+        Thread(target=asyncio.run, args=(self.serve(),), daemon=True).start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self) -> None:
+        """Ends the game hosted on the background thread, if not over."""
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.session.done.set)
+            except RuntimeError:
+                pass  # The event loop is closed; the game is already over
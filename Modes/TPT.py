@@ -6,161 +6,162 @@ Runs the entire Two Player Traditional game mode.
 """
 from typing import List, Tuple, Optional
 from Modes.General import _setup_player, _setup_grid, _confirm_grid, \
-    parallel_print, print_log, remove_order, congratulate_p1, congratulate_p2
-from Settings import DEFAULT, PURPLE, RED, GREEN, BLACK, BLUE, \
-    COL_ICON, ROW_ICON
+    parallel_print, print_log, print_hint, remove_order, congratulate_p1, \
+    congratulate_p2
+from Modes.Renderer import new_renderer
+from Settings import DEFAULT, PURPLE, RED, GREEN, BLACK, BLUE
+from Objects.Mechanics import Engine
 from Objects.Mechanics.Game import BattleshipGame
 from Objects.Mechanics.Player import Player
 from Objects.Mechanics.Order import TraditionalOrder
 from Objects.Mechanics.ActivityLog import TraditionalLog
 from Objects.Vessels.Vessel import TraditionalVessel
-from Objects.Vessels.Battleship import TraditionalBattleship
-from Objects.Vessels.Cruiser import TraditionalCruiser
-from Objects.Vessels.Destroyer import TraditionalDestroyer
-from Objects.Vessels.Frigate import TraditionalFrigate
-from Objects.Vessels.Submarine import TraditionalSubmarine
-from Objects.Vessels.Carrier import TraditionalCarrier
+
+# Draws the game screen every time it changes
+_SCREEN = new_renderer()
+
+# Message shown for each error code returned by _check_command()
+_ERRORS = {-1: 'Invalid Format', -2: 'Invalid Command',
+           -3: 'Invalid Coordinate', -4: 'Max Orders Received Already',
+           -5: 'Invalid Order'}
 
 
 def main() -> None:
     # First time setup
     p1, p2 = _setup_player()
-    full_game = BattleshipGame(p1, p2, 1)
 
     # Create player fleets
-    _setup_fleet(full_game.player1)
-    full_game.update_p1_backup()
+    full_game = Engine.new_game(p1, p2)
 
-    _setup_fleet(full_game.player2)
-    full_game.update_p2_backup()
+    # Setup both grids
+    _setup_fleet_grid(full_game, full_game.player1)
+    _setup_fleet_grid(full_game, full_game.player2)
 
-    # Setup Player 1 grid
-    space = '\n'
-    input(f'{space * 67}{PURPLE}{full_game.player1.name}{DEFAULT}, '
-          f'you will now begin setting up your fleet grid. '
-          f'Press {GREEN}ENTER{DEFAULT} to continue: ')
+    # Starting game, with Player 1 going first; the screen was last drawn for
+    # another game, if any, so the first frame is drawn in full
+    _SCREEN.invalidate()
+    winner = full_game.check_winner()
+    while not winner[0]:
+        winner = _take_command(full_game)
 
-    confirmation = False
-    final = False
-    while (not confirmation) or (not final):
-        while not confirmation:
-            confirmation = _setup_grid(full_game.player1)
-        final = _confirm_grid(full_game.player1)
-        if not final:
-            full_game.reset_p1()
-            confirmation = False
-    full_game.update_p1_backup()
-    print('')
+    if winner[1] == full_game.player1:
+        congratulate_p1()
+    else:
+        congratulate_p2()
+
+
+# Turns ------------------------------------------------------------------------
+def _setup_fleet_grid(game: BattleshipGame, player: Player) -> None:
+    """
+    Asks the player to place their fleet until they confirm their grid, then
+    backs up the player.
+
+    Parameter(s):
+     - game: The current game taking place
+     - player: The player setting up their grid
+    """
+    _place_fleet(player)
+    if player == game.player1:
+        game.update_p1_backup()
+    else:
+        game.update_p2_backup()
 
-    # Setup Player 2 grid
+
+def _place_fleet(player: Player) -> None:
+    """
+    Asks the player to place their fleet until they confirm their grid. The
+    player is reset every time they do not confirm it.
+
+    Parameter(s):
+     - player: The player setting up their grid
+    """
     space = '\n'
-    input(f'{space * 67}{PURPLE}{full_game.player2.name}{DEFAULT}, '
+    input(f'{space * 67}{PURPLE}{player.name}{DEFAULT}, '
           f'you will now begin setting up your fleet grid. '
           f'Press {GREEN}ENTER{DEFAULT} to continue: ')
 
+    backup = player.snapshot()
     confirmation = False
     final = False
     while (not confirmation) or (not final):
         while not confirmation:
-            confirmation = _setup_grid(full_game.player2)
-        final = _confirm_grid(full_game.player2)
+            confirmation = _setup_grid(player)
+        final = _confirm_grid(player)
         if not final:
-            full_game.reset_p2()
-    full_game.update_p2_backup()
+            player.restore(backup)
+            confirmation = False
+    backup.release(player)
     print('')
 
-    # Starting game, with Player 1 going first
-    winner = full_game.check_winner()
-    while not winner[0]:
-        _print_screen(full_game.current_player, full_game.other_player(),
-                      full_game.current_orders, full_game.log)
-        response = input(f'{PURPLE} >>> Command{DEFAULT}: ')
-        check = _check_command(response, full_game.current_player,
-                               full_game.current_orders)
-        while not check[0]:
-            if check[1] == -1:
-                _print_screen(full_game.current_player,
-                              full_game.other_player(),
-                              full_game.current_orders, full_game.log)
-                response = input(f'{PURPLE} >>> '
-                                 f'{RED}Invalid Format{DEFAULT}; '
-                                 f'{PURPLE}Command{DEFAULT}: ')
-            elif check[1] == -2:
-                _print_screen(full_game.current_player,
-                              full_game.other_player(),
-                              full_game.current_orders, full_game.log)
-                response = input(f'{PURPLE} >>> '
-                                 f'{RED}Invalid Command{DEFAULT}; '
-                                 f'{PURPLE}Command{DEFAULT}: ')
-            elif check[1] == -3:
-                _print_screen(full_game.current_player,
-                              full_game.other_player(),
-                              full_game.current_orders, full_game.log)
-                response = input(f'{PURPLE} >>> '
-                                 f'{RED}Invalid Coordinate{DEFAULT}; '
-                                 f'{PURPLE}Command{DEFAULT}: ')
-            elif check[1] == -4:
-                _print_screen(full_game.current_player,
-                              full_game.other_player(),
-                              full_game.current_orders, full_game.log)
-                response = input(f'{PURPLE} >>> '
-                                 f'{RED}Max Orders Received Already{DEFAULT}; '
-                                 f'{PURPLE}Command{DEFAULT}: ')
-            else:  # check[1] == -5
-                _print_screen(full_game.current_player,
-                              full_game.other_player(),
-                              full_game.current_orders, full_game.log)
-                response = input(f'{PURPLE} >>> '
-                                 f'{RED}Invalid Order{DEFAULT}; '
-                                 f'{PURPLE}Command{DEFAULT}: ')
-            check = _check_command(response, full_game.current_player,
-                                   full_game.current_orders)
-
-        # Response is valid, ending turn
-        if check[1] == 1:
-            _end_turn(full_game)
-            winner = full_game.check_winner()
-
-        # Response is valid, printing full Activity Log
-        elif check[1] == 2:
-            print_log(full_game)
-
-        # Response is valid, adding order
-        elif check[1] == 3:
-            _add_order(full_game, (check[2][1], check[2][2]))
-
-        # Response if valid, removing order
-        elif check[1] == 4:
-            remove_order(full_game, check[2][1])
-
-        # Response is valid, player quitting the game
-        else:
-            full_game.current_player.forfeit = True
-            winner = full_game.check_winner()
 
-    if winner[1] == full_game.player1:
-        congratulate_p1()
+def _take_command(game: BattleshipGame) -> Tuple[bool, Optional[Player]]:
+    """
+    Asks the current player for commands until a valid one is given, carries
+    it out and returns whether the game is over, and the winner if it is.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    _print_screen(game.current_player, game.other_player(),
+                  game.current_orders, game.log)
+    response = input(f'{PURPLE} >>> Command{DEFAULT}: ')
+    check = _check_command(response, game)
+    while not check[0]:
+        _print_screen(game.current_player, game.other_player(),
+                      game.current_orders, game.log)
+        response = input(f'{PURPLE} >>> '
+                         f'{RED}{_error_message(check[1])}{DEFAULT}; '
+                         f'{PURPLE}Command{DEFAULT}: ')
+        check = _check_command(response, game)
+
+    # Response is valid, printing full Activity Log
+    if check[1] == 2:
+        print_log(game)
+        _SCREEN.invalidate()
+
+    # Response is valid, printing what can be deduced
+    elif check[1] == 6:
+        print_hint(game)
+        _SCREEN.invalidate()
+
+    # Response is valid, changing the game
     else:
-        congratulate_p2()
+        _carry_out(game, check)
+    return game.check_winner()
 
 
-# Setup ------------------------------------------------------------------------
-def _setup_fleet(player: Player) -> None:
+def _carry_out(game: BattleshipGame,
+               check: Tuple[bool, int, Optional[list]]) -> None:
     """
-    Sets up the fleet for the specified player.
+    Carries out a valid command that changes the game: ending the turn, adding
+    or removing an order, or forfeiting.
 
     Parameter(s):
-     - player: The player that the fleet is currently being setup for
+     - game: The current game taking place
+     - check: The result of _check_command() for the command
+
+    Precondition(s):
+     - check[0] and check[1] in (1, 3, 4, 5)
     """
-    vessels = [TraditionalBattleship, TraditionalCruiser, TraditionalDestroyer,
-               TraditionalFrigate, TraditionalSubmarine, TraditionalCarrier]
-    for i in range(6):
-        player.add_vessel(vessels[i])
+    # Response is valid, ending turn
+    if check[1] == 1:
+        Engine.end_turn(game)
+
+    # Response is valid, adding order
+    elif check[1] == 3:
+        Engine.add_order(game, (check[2][1], check[2][2]))
+
+    # Response if valid, removing order
+    elif check[1] == 4:
+        remove_order(game, check[2][1])
+
+    # Response is valid, player quitting the game
+    else:
+        Engine.forfeit(game)
 
 
 # Confirmation -----------------------------------------------------------------
-def _check_command(phrase: str, player: Player,
-                   orders: List[TraditionalOrder]) -> \
+def _check_command(phrase: str, game: BattleshipGame) -> \
         Tuple[bool, int, Optional[list]]:
     """
     Checks to see whether the order given is valid or not. If it is
@@ -173,8 +174,7 @@ def _check_command(phrase: str, player: Player,
 
     Parameter(s):
      - phrase: The user input being checked
-     - player: The player that is currently having their turn
-     - orders: The current list of orders that the player has created
+     - game: The current game taking place
     """
     # Check if phrase is one of the special commands
     if phrase.lower().strip() == '\\execute':
@@ -183,6 +183,8 @@ def _check_command(phrase: str, player: Player,
         return True, 2, None  # Player wants to see full activity log
     elif phrase.lower().strip() == '\\forfeit':
         return True, 5, None  # Player quitting game
+    elif phrase.lower().strip() == '\\hint':
+        return True, 6, None  # Player wants to see what can be deduced
     elif ',' not in phrase:
         return False, -1, None  # Invalid format
 
@@ -197,109 +199,37 @@ def _check_command(phrase: str, player: Player,
 
         if lst[0] != '\\add':
             return False, -2, None  # Invalid command
-        elif (lst[1] not in COL_ICON) or (lst[2] not in ROW_ICON):
-            return False, -3, None  # Invalid coordinate
 
-        # Check if this order will exceed max amount of orders
-        if len(orders) == player.battle_total:
-            return False, -4, None  # Max orders received
-
-        # Check if order is already in the list of orders
-        coord = (lst[1], lst[2])
-        for order in orders:
-            if order.coordinate == coord:
-                return False, -5, None  # Invalid order
-
-        # Check if node is valid and not hit
-        grid = player.traditional
-        row = ROW_ICON.index(lst[2])
-        col = COL_ICON.index(lst[1])
-        if grid.grid[row][col].hit:
+        result = Engine.check_order(game, (lst[1], lst[2]))
+        if result == Engine.INVALID_COORDINATE:
             return False, -3, None  # Invalid coordinate
+        elif result == Engine.MAX_ORDERS:
+            return False, -4, None  # Max orders received
+        elif result == Engine.INVALID_ORDER:
+            return False, -5, None  # Invalid order
         return True, 3, lst
 
     # If player attempting to remove an order
     elif len(lst) == 2:
         if lst[0] != '\\remove':
             return False, -2, None  # Invalid command
-        elif int(lst[1]) > len(orders):
+        elif not lst[1].strip().isdigit():
+            return False, -1, None  # Invalid format
+        elif int(lst[1]) > len(game.current_orders):
             return False, -5, None  # Invalid order
         return True, 4, lst
 
-    return False, 1, None  # Invalid format
+    return False, -1, None  # Invalid format
 
 
-# Game modification ------------------------------------------------------------
-def _add_order(game: BattleshipGame, coord: Tuple[str, str]) -> None:
+def _error_message(code: int) -> str:
     """
-    Adds a valid order to the list of current player's orders.
-    """
-    # Add order
-    order_id = len(game.current_orders) + 1
-    order = TraditionalOrder(order_id, coord)
-    game.current_orders.append(order)
-
-    # Change grid characteristics
-    grid = game.current_player.traditional
-    row = ROW_ICON.index(coord[1])
-    col = COL_ICON.index(coord[0])
-
-    grid.grid[row][col].target_and_drop()
-
-
-def _end_turn(game: BattleshipGame) -> None:
-    """
-    Ends the current player's turn and updates all game attributes.
+    Returns the message shown for an invalid command.
 
     Parameter(s):
-     - game: The current game taking place
+     - code: The error code returned by _check_command()
     """
-    traditional_grid = game.current_player.traditional
-    personal_grid = game.other_player().personal
-    for order in game.current_orders:
-
-        # Get affected node
-        row = ROW_ICON.index(order.coordinate[1])
-        col = COL_ICON.index(order.coordinate[0])
-        t_node = traditional_grid.grid[row][col]
-        p_node = personal_grid.grid[row][col]
-
-        # If vessel is located at the node
-        if p_node.occupied:
-            p_node.vessel.hp -= 1
-            p_node.vessel.hits_received += 1
-
-            # Vessel is 1 hp, will be destroyed by this order
-            if p_node.vessel.hp == 0:
-                game.enemy_sunk(p_node.vessel, game.other_player())
-
-            # Vessel still functional
-            else:
-
-                # Change grid icons and node attributes for both players
-                p_node.personal_damaged()
-                t_node.damaged()
-                p_node.vessel.hit = True
-                p_node.vessel.update_health_color()
-
-                # Create Activity log message
-                game.log.ally_hit(
-                    p_node.vessel, game.other_player().number, p_node,
-                    game.current_turn_number)
-                game.log.enemy_hit(
-                    p_node.vessel, game.current_player.number, p_node,
-                    game.current_turn_number)
-
-        else:  # Node is empty
-            p_node.miss()
-            t_node.miss()
-
-    game.current_orders = []
-
-    # Switch current player
-    game.current_player = game.other_player()
-    if game.current_player == game.player1:
-        game.current_turn_number += 1
+    return _ERRORS.get(code, 'Invalid Order')
 
 
 # Display ----------------------------------------------------------------------
@@ -307,7 +237,18 @@ def _print_screen(current_player: Player, other_player: Player,
                   orders: List[TraditionalOrder],
                   activity_log: TraditionalLog) -> None:
     """
-    Rearranges all information given and neatly prints on the screen.
+    Draws the game screen using the renderer selected in Settings.RENDERER.
+    See _build_screen() for the layout.
+    """
+    _SCREEN.render(_build_screen(current_player, other_player, orders,
+                                 activity_log))
+
+
+def _build_screen(current_player: Player, other_player: Player,
+                  orders: List[TraditionalOrder],
+                  activity_log: TraditionalLog) -> str:
+    """
+    Rearranges all information given so it can be neatly printed on the screen.
     Grids are printed in parallel at the top left of the screen.
     Allied and enemy vessel information is printed at the bottom left of
     the screen, with allied vessel information on top, and enemy vessel
@@ -477,4 +418,4 @@ def _print_screen(current_player: Player, other_player: Player,
     # Chart information + lower columns
     for i in range(len(full_info)):
         ret += f'{full_info[i]}  {lower[i]}\n'
-    print(ret)
+    return ret
@@ -0,0 +1,184 @@
+"""
+Tournament.py
+
+PURPOSE:
+Runs a round-robin tournament between computer players. Every competitor is a
+targeting strategy paired with a placement strategy (see Strategies.py), and
+every pair of competitors plays the same number of games, taking turns to go
+first. Games are played by the headless engine in a pool of worker processes,
+and each result is printed as soon as its game is over.
+
+Every game has its own seed, made from the tournament seed, the competitors
+and the game number, so a tournament gives the same results no matter how many
+worker processes are used or in which order games finish.
+
+Run from the root of the project:
+    python Main.py tournament [--targeting NAME ...] [--placement NAME ...]
+                              [--games N] [--fleets N] [--seed N]
+                              [--workers N]
+"""
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from typing import Dict, List, NamedTuple, Optional
+from Settings import DEFAULT, GREEN, PURPLE
+from Objects.AI.Strategies import TARGETING, PLACEMENT
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Player import Player
+
+
+class Match(NamedTuple):
+    """
+    A single game of the tournament.
+
+    Attribute(s):
+     - first: The competitor going first, as 'targeting/placement'
+     - second: The competitor going second
+     - number: The game number between these two competitors
+     - seed: The seed of the game
+     - fleets: The number of vessels of each class in each fleet
+    """
+    first: str
+    second: str
+    number: int
+    seed: str
+    fleets: int
+
+
+class Result(NamedTuple):
+    """
+    The result of a Match.
+
+    Attribute(s):
+     - match: The game that was played
+     - winner: The winning competitor
+     - turns: The number of turns the game took
+    """
+    match: Match
+    winner: str
+    turns: int
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """
+    Runs a tournament.
+
+    Parameter(s):
+     - args: The command line arguments after 'tournament'
+    """
+    options = _parse(args)
+    competitors = [f'{targeting}/{placement}'
+                   for targeting in options.targeting
+                   for placement in options.placement]
+    matches = schedule(competitors, options.games, options.seed,
+                       options.fleets)
+
+    print(f'{PURPLE}TOURNAMENT{DEFAULT}: {len(competitors)} competitors, '
+          f'{len(matches)} games, seed {options.seed}\n', flush=True)
+    wins = {competitor: 0 for competitor in competitors}
+    turns = {competitor: 0 for competitor in competitors}
+    for done, result in enumerate(run(matches, options.workers), 1):
+        match = result.match
+        print(f'{done:>6}/{len(matches)}  {match.first} vs {match.second} '
+              f'#{match.number + 1}: {GREEN}{result.winner}{DEFAULT} '
+              f'in {result.turns} turns', flush=True)
+        wins[result.winner] += 1
+        turns[result.winner] += result.turns
+
+    print(f'\n{PURPLE}STANDINGS{DEFAULT}')
+    played = options.games * (len(competitors) - 1)
+    for competitor in sorted(competitors, key=lambda c: (-wins[c], c)):
+        average = turns[competitor] / wins[competitor] \
+            if wins[competitor] else 0
+        print(f'{competitor:<30}{wins[competitor]:>6} / {played:<6}'
+              f'{average:>8.1f} turns per win')
+
+
+def _parse(args: Optional[List[str]]) -> argparse.Namespace:
+    """
+    Returns the tournament options given on the command line.
+
+    Parameter(s):
+     - args: The command line arguments after 'tournament'
+    """
+    parser = argparse.ArgumentParser(prog='Main.py tournament')
+    parser.add_argument('--targeting', nargs='+', choices=list(TARGETING),
+                        default=list(TARGETING))
+    parser.add_argument('--placement', nargs='+', choices=list(PLACEMENT),
+                        default=['random'])
+    parser.add_argument('--games', type=int, default=10,
+                        help='games between every pair of competitors')
+    parser.add_argument('--fleets', type=int, default=1,
+                        help='vessels of each class in each fleet')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes; one per CPU by default')
+    return parser.parse_args(args)
+
+
+def schedule(competitors: List[str], games: int, seed: int,
+             fleets: int = 1) -> List[Match]:
+    """
+    Returns every game of a round-robin tournament.
+
+    Parameter(s):
+     - competitors: The competitors, as 'targeting/placement'
+     - games: The number of games between every pair of competitors
+     - seed: The seed of the tournament
+     - fleets: The number of vessels of each class in each fleet
+    """
+    ret = []
+    for one, two in combinations(competitors, 2):
+        for number in range(games):
+            first, second = (one, two) if number % 2 == 0 else (two, one)
+            ret.append(Match(first, second, number,
+                             f'{seed}/{one}/{two}/{number}', fleets))
+    return ret
+
+
+def run(matches: List[Match], workers: Optional[int] = None):
+    """
+    Plays every match in a pool of worker processes and yields each Result as
+    soon as its game is over.
+
+    Parameter(s):
+     - matches: The games being played
+     - workers: The number of worker processes; one per CPU if None
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play, match) for match in matches]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def play(match: Match) -> Result:
+    """
+    Plays a single game between two computer players and returns the result.
+
+    Parameter(s):
+     - match: The game being played
+    """
+    competitors = (match.first, match.second)
+    game = Engine.new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2),
+                           match.fleets,
+                           rng=random.Random(f'{match.seed}/pennants'))
+    targeting: Dict[int, object] = {}
+    for player, competitor in zip((game.player1, game.player2), competitors):
+        targeting_name, placement_name = competitor.split('/')
+        PLACEMENT[placement_name](
+            player, random.Random(f'{match.seed}/{player.number}/placement'))
+        targeting[player.number] = TARGETING[targeting_name](
+            random.Random(f'{match.seed}/{player.number}/targeting'))
+
+    winner = None
+    turn = 0
+    while winner is None:
+        turn = game.current_turn_number
+        orders = targeting[game.current_player.number].choose(game)
+        result = Engine.submit_orders(game, orders)
+        if result != Engine.OK:
+            raise ValueError(f'{competitors[game.current_player.number - 1]} '
+                             f'gave an invalid order ({result})')
+        winner = Engine.step(game)
+    return Result(match, competitors[winner.number - 1], turn)
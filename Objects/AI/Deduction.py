@@ -0,0 +1,180 @@
+"""
+Deduction.py
+
+PURPOSE:
+Works out which nodes of a player's traditional grid must, or cannot, hold an
+enemy vessel, from the results of the player's orders and the enemy vessels
+still afloat. Sets of nodes and the nodes taken up by each placement of a
+vessel are bitsets (bit n is the node with cell id n), so every rule is a few
+integer operations.
+
+Rules are applied until nothing changes:
+ - A vessel afloat cannot lie on a missed or destroyed node, or only on
+   damaged nodes (it would have sunk)
+ - Every damaged node holds a vessel afloat, so the nodes shared by every
+   placement covering a node known to hold a vessel also hold that vessel
+ - If a single vessel is afloat, it covers every node known to hold a vessel
+Nodes no remaining placement covers cannot hold a vessel.
+"""
+from __future__ import annotations
+from collections import Counter
+from typing import Dict, Iterator, List
+from Objects.AI.Density import placements, remaining_lengths
+from Objects.Mechanics.Grid import Grid
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Node import MISSED, DAMAGED, DESTROYED
+
+# The bitset of every placement of each length, filled when first needed
+_MASKS: Dict[int, List[int]] = {}
+
+
+class Deduction:
+    """
+    Everything deduced about the enemy fleet from a player's traditional grid.
+
+    Attribute(s):
+     - lengths: The number of enemy vessels afloat of each length
+     - valid: Whether each placement of each length is still possible
+     - unknown: The nodes that have not been fired at yet
+     - must: The nodes that must hold a vessel afloat, damaged ones included
+     - possible: The nodes at least one possible placement covers
+     - empty: The nodes not fired at yet that cannot hold a vessel
+    """
+    lengths: Counter
+    valid: Dict[int, bytearray]
+    unknown: int
+    must: int
+    possible: int
+    empty: int
+
+    def __init__(self, blocked: int, damaged: int, unknown: int,
+                 lengths: Counter) -> None:
+        """
+        Initializes a new Deduction and applies every rule until nothing
+        changes.
+
+        Parameter(s):
+         - blocked: The nodes no vessel afloat can be on
+         - damaged: The nodes holding a damaged vessel that has not sunk yet
+         - unknown: The nodes that have not been fired at yet
+         - lengths: The number of enemy vessels afloat of each length
+        """
+        self.lengths = +lengths
+        self.unknown = unknown
+        self.must = damaged
+        self.valid = {}
+        for length in self.lengths:
+            self.valid[length] = bytearray(
+                not mask & blocked and bool(mask & ~damaged)
+                for mask in masks(length))
+        self._propagate()
+
+        self.possible = 0
+        for length, valid in self.valid.items():
+            for mask, ok in zip(masks(length), valid):
+                if ok:
+                    self.possible |= mask
+        self.empty = unknown & ~self.possible
+
+    @property
+    def certain(self) -> int:
+        """The nodes not fired at yet that must hold a vessel."""
+        return self.must & self.unknown
+
+    def _propagate(self) -> None:
+        """Applies every rule until nothing changes."""
+        single = sum(self.lengths.values()) == 1
+        changed = True
+        while changed:
+            changed = False
+
+            # A single vessel afloat covers every node holding a vessel
+            if single:
+                must = self.must
+                for length, valid in self.valid.items():
+                    for placement, mask in enumerate(masks(length)):
+                        if valid[placement] and mask & must != must:
+                            valid[placement] = 0
+
+            # Nodes shared by every placement covering a node with a vessel
+            for cell in bits(self.must):
+                shared = -1
+                for length, valid in self.valid.items():
+                    by_cell = placements(length)[1]
+                    for placement in by_cell[cell]:
+                        if valid[placement]:
+                            shared &= masks(length)[placement]
+                if shared != -1 and shared & ~self.must:
+                    self.must |= shared
+                    changed = True
+
+    def possible_placements(self, length: int) -> List[int]:
+        """
+        Returns the index of every placement of a vessel of the specified
+        length that is still possible (see Density.placements()).
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+        """
+        return [placement for placement, ok in enumerate(self.valid[length])
+                if ok]
+
+
+def deduce(player: Player, enemy: Player) -> Deduction:
+    """
+    Returns everything the player can deduce about the enemy fleet.
+
+    Parameter(s):
+     - player: The player looking at their traditional grid
+     - enemy: The enemy player
+    """
+    return deduce_grid(player.traditional, remaining_lengths(enemy))
+
+
+def deduce_grid(grid: Grid, lengths: Counter) -> Deduction:
+    """
+    Returns everything that can be deduced from a traditional grid about a
+    fleet with the specified vessels afloat.
+
+    Parameter(s):
+     - grid: The traditional grid
+     - lengths: The number of vessels afloat of each length
+    """
+    blocked = damaged = unknown = 0
+    for node in grid.nodes:
+        if node.state == MISSED or node.state == DESTROYED:
+            blocked |= 1 << node.cell
+        elif node.state == DAMAGED:
+            damaged |= 1 << node.cell
+        else:
+            unknown |= 1 << node.cell
+    return Deduction(blocked, damaged, unknown, lengths)
+
+
+def masks(length: int) -> List[int]:
+    """
+    Returns the bitset of every placement of a vessel of the specified length,
+    in the same order as Density.placements().
+
+    Parameter(s):
+     - length: The number of nodes the vessel takes up
+    """
+    try:
+        return _MASKS[length]
+    except KeyError:
+        _MASKS[length] = [sum(1 << cell for cell in covered)
+                          for covered in placements(length)[0]]
+        return _MASKS[length]
+
+
+def bits(bitset: int) -> Iterator[int]:
+    """
+    Yields the cell id of every node in a bitset, lowest first.
+
+    Parameter(s):
+     - bitset: The set of nodes
+    """
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
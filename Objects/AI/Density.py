@@ -0,0 +1,273 @@
+"""
+Density.py
+
+PURPOSE:
+Creates the probability density targeting strategy. For every node, it counts
+the legal placements of every enemy vessel still afloat that would cover the
+node; the nodes covered by the most placements are the most likely to hold a
+vessel. Placements covering damaged nodes count many times over, so damaged
+vessels are finished off first.
+
+The counts are built once per game and then kept up-to-date incrementally:
+every miss or sinking removes only the placements covering those nodes, and
+every hit only adds weight to the placements covering it. Changes are read
+from the change journal of the player's traditional grid, which keeps them for
+as long as the strategy holds a snapshot, so no node is looked at twice.
+"""
+from __future__ import annotations
+from collections import Counter
+from heapq import nlargest
+from random import Random
+from typing import Dict, List, Optional, Tuple
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Grid import Grid
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Coordinate import COORDINATES, SIZE, vessel_cells
+from Objects.Mechanics.Node import EMPTY_NODE, TARGETED, MISSED, DAMAGED, \
+    DESTROYED
+
+# How much more a placement covering a damaged node counts, per damaged node
+HIT_WEIGHT = 50
+
+# Placements of every vessel length: (cells of each placement, placements
+# covering each cell), filled the first time each length is needed
+_PLACEMENTS: Dict[int, Tuple[List[Tuple[int, ...]], List[List[int]]]] = {}
+
+
+def placements(length: int) -> Tuple[List[Tuple[int, ...]], List[List[int]]]:
+    """
+    Returns the cells of every placement of a vessel of the specified length
+    on a full sized grid, and the placements covering each cell. Placements
+    follow the same rules as Grid.check_placement(), less overlapping.
+
+    Parameter(s):
+     - length: The number of nodes the vessel takes up
+    """
+    try:
+        return _PLACEMENTS[length]
+    except KeyError:
+        cells = []
+        for direction in ('W', 'N') if length > 1 else ('W',):
+            for coordinate in COORDINATES:
+                covered = vessel_cells(coordinate, direction, length)
+                if covered is not None:
+                    cells.append(covered)
+        by_cell = [[] for _ in range(SIZE * SIZE)]
+        for placement, covered in enumerate(cells):
+            for cell in covered:
+                by_cell[cell].append(placement)
+        _PLACEMENTS[length] = (cells, by_cell)
+        return _PLACEMENTS[length]
+
+
+def remaining_lengths(player: Player) -> Counter:
+    """
+    Returns the number of vessels of each length the player has afloat. This
+    is shown to the enemy in the vessel information chart.
+
+    Parameter(s):
+     - player: The player whose vessels are counted
+    """
+    ret = Counter()
+    for vessel_class in (player.bb_curr, player.cc_curr, player.dd_curr,
+                         player.ff_curr, player.sm_curr, player.cv_curr):
+        for vessel in vessel_class:
+            ret[vessel.length] += 1
+    return ret
+
+
+class DensityTargeting:
+    """
+    Fires at the nodes most likely to hold an enemy vessel.
+
+    Attribute(s):
+     - rng: The random number generator used to break ties
+     - grid: The traditional grid the counts are kept for
+     - mark: The snapshot of the grid held since the counts were last
+       brought up-to-date
+     - known: The state of every node when it was last read
+     - lengths: The number of enemy vessels afloat of each length
+     - valid: Whether each placement of each length is still possible
+     - hits: The number of damaged nodes covered by each placement
+     - partial: The weighted number of possible placements of each length
+       covering each node
+     - score: The weighted number of possible placements of every vessel
+       afloat covering each node
+    """
+    rng: Random
+    grid: Optional[Grid]
+    mark: Optional[int]
+    known: List[int]
+    lengths: Counter
+    valid: Dict[int, bytearray]
+    hits: Dict[int, List[int]]
+    partial: Dict[int, List[float]]
+    score: List[float]
+
+    def __init__(self, rng: Random) -> None:
+        """
+        Initializes a new DensityTargeting. Counts are built on the first call
+        to choose().
+
+        Parameter(s):
+         - rng: The random number generator used to break ties
+        """
+        self.rng = rng
+        self.grid = None
+        self._reset(None)
+
+    def choose(self, game: BattleshipGame) -> List[Tuple[str, str]]:
+        """
+        Returns the coordinates the current player fires at this turn.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        self.update(game.current_player, game.other_player())
+        count = game.current_player.battle_total
+        cells = [cell for cell, state in enumerate(self.known)
+                 if state == EMPTY_NODE]
+        chosen = nlargest(count, cells, key=lambda cell: (
+            self.score[cell], self.rng.random()))
+        return [COORDINATES[cell] for cell in chosen]
+
+    # Counts -------------------------------------------------------------------
+    def update(self, player: Player, enemy: Player) -> None:
+        """
+        Brings the counts up-to-date with the player's traditional grid and
+        the enemy vessels afloat.
+
+        Parameter(s):
+         - player: The player the strategy is choosing targets for
+         - enemy: The enemy player
+        """
+        grid = player.traditional
+        if grid is not self.grid or grid.position < self.mark:
+            # New game, or the grid was restored: read every node
+            self._reset(grid)
+            changed = [(node.cell, node.state) for node in grid.nodes
+                       if node is not None and node.state != EMPTY_NODE]
+        else:
+            # Read only the nodes changed since the last update
+            changed = [(cell, state) for cell, state, _
+                       in grid.diff(self.mark)]
+            grid.release(self.mark)
+        self.mark = grid.snapshot()
+        for cell, state in sorted(changed):
+            self._observe(cell, state)
+
+        # Add or remove the placements of vessels that sank
+        lengths = remaining_lengths(enemy)
+        for length in set(lengths) | set(self.lengths):
+            change = lengths[length] - self.lengths[length]
+            if not change:
+                continue
+            if length not in self.partial:
+                self._track(length)
+            partial = self.partial[length]
+            score = self.score
+            for cell in range(len(score)):
+                score[cell] += change * partial[cell]
+            if not lengths[length]:  # No need to keep counting
+                del self.valid[length], self.hits[length], \
+                    self.partial[length]
+        self.lengths = +lengths
+
+    def _reset(self, grid: Optional[Grid]) -> None:
+        """
+        Forgets every count, so they are built again from every node of the
+        grid.
+
+        Parameter(s):
+         - grid: The player's traditional grid
+        """
+        if self.grid is not None and self.mark is not None:
+            self.grid.release(self.mark)
+        self.grid = grid
+        self.mark = None
+        self.known = [EMPTY_NODE] * (SIZE * SIZE)
+        self.lengths = Counter()
+        self.valid = {}
+        self.hits = {}
+        self.partial = {}
+        self.score = [0.0] * (SIZE * SIZE)
+
+    def _track(self, length: int) -> None:
+        """
+        Starts counting the placements of a vessel length, with every
+        placement ruled out by the nodes already fired at.
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+        """
+        cells, by_cell = placements(length)
+        self.valid[length] = valid = bytearray([1]) * len(cells)
+        self.hits[length] = hits = [0] * len(cells)
+        if all(state == EMPTY_NODE for state in self.known):
+            # Every placement is possible and covers no damaged node
+            self.partial[length] = [float(len(covering))
+                                    for covering in by_cell]
+            return
+
+        self.partial[length] = partial = [0.0] * (SIZE * SIZE)
+        for placement, covered in enumerate(cells):
+            for cell in covered:
+                state = self.known[cell]
+                if state == MISSED or state == DESTROYED:
+                    valid[placement] = 0
+                    break
+                elif state == DAMAGED:
+                    hits[placement] += 1
+            else:
+                weight = self._weight(hits[placement])
+                for cell in covered:
+                    partial[cell] += weight
+
+    def _observe(self, cell: int, state: int) -> None:
+        """
+        Updates the counts after a node of the traditional grid changed. Only
+        the placements covering the node are looked at.
+
+        Parameter(s):
+         - cell: The cell id of the node
+         - state: The new state of the node
+        """
+        if state == TARGETED:  # Planned orders do not change anything
+            state = EMPTY_NODE
+        old = self.known[cell]
+        if state == old:
+            return
+        self.known[cell] = state
+
+        score = self.score
+        for length, partial in self.partial.items():
+            cells, by_cell = placements(length)
+            valid = self.valid[length]
+            hits = self.hits[length]
+            count = self.lengths[length]
+            for placement in by_cell[cell]:
+                if not valid[placement]:
+                    continue
+                before = self._weight(hits[placement])
+                if state == MISSED or state == DESTROYED:
+                    valid[placement] = 0
+                    after = 0
+                else:
+                    hits[placement] += (state == DAMAGED) - (old == DAMAGED)
+                    after = self._weight(hits[placement])
+                change = after - before
+                if change:
+                    for covered in cells[placement]:
+                        partial[covered] += change
+                        score[covered] += change * count
+
+    @staticmethod
+    def _weight(hits: int) -> float:
+        """
+        Returns how much a possible placement counts towards the score of the
+        nodes it covers.
+
+        Parameter(s):
+         - hits: The number of damaged nodes the placement covers
+        """
+        return 1 + HIT_WEIGHT * hits
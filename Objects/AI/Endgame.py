@@ -0,0 +1,330 @@
+"""
+Endgame.py
+
+PURPOSE:
+Creates the endgame targeting strategy. Once the enemy has only a few vessels
+left afloat and some of them are damaged, every way those vessels can lie over
+the nodes known to hold one can be listed, and a salvo that minimizes the
+expected number of turns left to sink them can be searched for. The search is
+approximate: salvos are only made of the few nodes that have a vessel in the
+most layouts, and the search gives up for the turn after MAX_POSITIONS
+positions. Vessels not needed to cover those nodes are left out of the
+layouts; they are hunted by another targeting strategy, which is also used
+until the endgame, whenever no vessel is known to be damaged, whenever there
+are too many layouts to list, and whenever the search gives up. Salvos the
+solver does not fill are filled by the other strategy too.
+
+Layouts, the vessels of each layout and the nodes fired at are all bitsets
+(see Deduction.py). Every position of the search is a set of layouts still
+possible and the nodes fired at, so results are cached by the bitsets of
+both, and the cache is kept from turn to turn: the layouts still possible
+after every turn are always among those listed before.
+"""
+from __future__ import annotations
+from collections import Counter
+from itertools import combinations
+from random import Random
+from typing import Dict, List, Optional, Tuple
+from Objects.AI.Deduction import Deduction, deduce, bits, masks
+from Objects.AI.Density import DensityTargeting, placements
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Coordinate import COORDINATES
+from Objects.Mechanics.Node import MISSED, DAMAGED, DESTROYED
+
+# Most enemy vessels afloat the solver is used for
+MAX_VESSELS = 3
+
+# Most layouts the solver is used for
+MAX_LAYOUTS = 1000
+
+# Most positions searched in a turn before giving up for the turn
+MAX_POSITIONS = 300
+
+# Nodes considered for every salvo, beyond the number of orders
+EXTRA = 1
+
+
+class _SearchLimit(Exception):
+    """Raised once too many positions were searched in a turn."""
+
+
+def enumerate_layouts(deduction: Deduction, limit: int) \
+        -> Optional[List[Tuple[int, ...]]]:
+    """
+    Returns every way the vessels afloat allowed by the deduction can cover
+    the nodes known to hold one, each as the bitsets of the vessels covering
+    them, or None if there are more than limit. Vessels covering none of
+    those nodes are left out, so layouts can have fewer vessels than are
+    afloat. Vessels of the same length are interchangeable, so every layout
+    is only listed once.
+
+    Parameter(s):
+     - deduction: What is known about the enemy fleet
+     - limit: The most layouts to list
+    """
+    valid = deduction.valid
+    ret = []
+
+    def _cover(left: Counter, taken: int, uncovered: int,
+               chosen: Tuple[int, ...]) -> bool:
+        """
+        Places vessels over every node known to hold one, lowest node first.
+        Returns False once there are too many layouts.
+        """
+        if not uncovered:
+            ret.append(chosen)
+            return len(ret) <= limit
+        cell = (uncovered & -uncovered).bit_length() - 1
+        for length in [length for length, count in left.items() if count]:
+            for placement in placements(length)[1][cell]:
+                mask = masks(length)[placement]
+                if valid[length][placement] and not mask & taken:
+                    left[length] -= 1
+                    ok = _cover(left, taken | mask, uncovered & ~mask,
+                                chosen + (mask,))
+                    left[length] += 1
+                    if not ok:
+                        return False
+        return True
+
+    if not _cover(Counter(deduction.lengths), 0, deduction.must, ()):
+        return None
+    return ret
+
+
+class EndgameSolver:
+    """
+    Searches for the salvo that minimizes the expected number of turns left to
+    sink every vessel, over a fixed list of layouts. The salvos searched are
+    only made of the nodes that, together, have a vessel in the most layouts,
+    so the best salvo found is not always the best there is.
+
+    Attribute(s):
+     - layouts: The bitsets of the vessels of every layout
+     - union: The bitset of every node taken up by each layout
+     - sunk: The nodes of vessels that sank before the layouts were listed
+     - cache: The expected turns left and best salvo of every position
+       searched, by (layouts still possible, nodes fired at, orders)
+     - positions: The number of positions searched this turn
+    """
+    layouts: List[Tuple[int, ...]]
+    union: List[int]
+    sunk: int
+    cache: Dict[Tuple[int, int, int], Tuple[float, Tuple[int, ...]]]
+    positions: int
+
+    def __init__(self, layouts: List[Tuple[int, ...]], sunk: int) -> None:
+        """
+        Initializes a new EndgameSolver.
+
+        Parameter(s):
+         - layouts: The bitsets of the vessels of every layout
+         - sunk: The nodes of vessels that sank before the layouts were listed
+        """
+        self.layouts = layouts
+        self.sunk = sunk
+        self.union = []
+        for vessels in layouts:
+            union = 0
+            for mask in vessels:
+                union |= mask
+            self.union.append(union)
+        self.cache = {}
+        self.positions = 0
+
+    def consistent(self, blocked: int, hit: int, destroyed: int) -> int:
+        """
+        Returns the bitset of every layout that agrees with a traditional grid.
+
+        Parameter(s):
+         - blocked: The nodes missed
+         - hit: The nodes damaged or destroyed
+         - destroyed: The nodes destroyed
+        """
+        ret = 0
+        for layout, vessels in enumerate(self.layouts):
+            union = self.union[layout]
+            if union & blocked or hit & ~self.sunk & ~union:
+                continue
+            # Vessels sink only once every node they take up is hit
+            for mask in vessels:
+                if (mask & destroyed != 0) != (mask & ~hit == 0) or \
+                        (mask & destroyed and mask & ~destroyed):
+                    break
+            else:
+                ret |= 1 << layout
+        return ret
+
+    def solve(self, alive: int, fired: int, orders: int) \
+            -> Tuple[float, Tuple[int, ...]]:
+        """
+        Returns the expected number of turns left, and the best salvo, when
+        the layouts in alive are still possible. Raises _SearchLimit once too
+        many positions were searched this turn.
+
+        Parameter(s):
+         - alive: The bitset of every layout still possible
+         - fired: The nodes fired at
+         - orders: The number of orders every salvo can have
+        """
+        reach = 0
+        layouts = list(bits(alive))
+        for layout in layouts:
+            reach |= self.union[layout]
+        fired &= reach
+        key = (alive, fired, orders)
+        if key in self.cache:
+            return self.cache[key]
+
+        # Every node left fits in one salvo, or only one layout is left
+        left = reach & ~fired
+        if bin(left).count('1') <= orders or len(layouts) == 1:
+            cells = tuple(bits(left))
+            best = (float(-(-len(cells) // orders)), cells[:orders])
+            self.cache[key] = best
+            return best
+
+        self.positions += 1
+        if self.positions > MAX_POSITIONS:
+            raise _SearchLimit()
+
+        # Nodes holding a vessel in the most layouts not yet covered by the
+        # nodes picked before them
+        cover: Dict[int, int] = {}
+        for layout in layouts:
+            for cell in bits(self.union[layout] & ~fired):
+                cover[cell] = cover.get(cell, 0) | 1 << layout
+        cells = []
+        covered = 0
+        while cover and len(cells) < orders + EXTRA:
+            cell = max(cover, key=lambda cell: (
+                bin(cover[cell] & ~covered).count('1'),
+                bin(cover[cell]).count('1'), -cell))
+            cells.append(cell)
+            covered |= cover.pop(cell)
+
+        best = (float('inf'), ())
+        for salvo in combinations(cells, min(orders, len(cells))):
+            shot = 0
+            for cell in salvo:
+                shot |= 1 << cell
+            now_fired = fired | shot
+
+            # Layouts giving the same results can no longer be told apart
+            outcomes: Dict[Tuple[int, ...], int] = {}
+            for layout in layouts:
+                outcome = (shot & self.union[layout],) + tuple(sorted(
+                    mask for mask in self.layouts[layout]
+                    if mask & shot and not mask & ~now_fired))
+                outcomes[outcome] = outcomes.get(outcome, 0) | 1 << layout
+            groups = [group for group in outcomes.values()
+                      if self.union[(group & -group).bit_length() - 1] &
+                      ~now_fired]  # Vessels left afloat
+
+            # Every group left takes at least one more turn; stop as soon as
+            # this salvo cannot beat the best one
+            bound = sum(bin(group).count('1') for group in groups)
+            limit = (best[0] - 1) * len(layouts)
+            total = 0.0
+            for group in groups:
+                if total + bound >= limit:
+                    break
+                size = bin(group).count('1')
+                bound -= size
+                total += size * self.solve(group, now_fired, orders)[0]
+            else:
+                expected = 1 + total / len(layouts)
+                if expected < best[0]:
+                    best = (expected, salvo)
+
+        self.cache[key] = best
+        return best
+
+
+class EndgameTargeting:
+    """
+    Uses the endgame solver once few enough enemy vessels are afloat and some
+    are damaged, and another targeting strategy otherwise.
+
+    Attribute(s):
+     - heuristic: The targeting strategy used outside of the endgame
+     - solver: The solver of the current endgame, if any
+    """
+    heuristic: object
+    solver: Optional[EndgameSolver]
+
+    def __init__(self, rng: Random, heuristic: Optional[object] = None) \
+            -> None:
+        """
+        Initializes a new EndgameTargeting.
+
+        Parameter(s):
+         - rng: The random number generator used by the default heuristic
+         - heuristic: The targeting strategy used outside of the endgame;
+           probability density if None
+        """
+        self.heuristic = DensityTargeting(rng) if heuristic is None \
+            else heuristic
+        self.solver = None
+
+    def choose(self, game: BattleshipGame) -> List[Tuple[str, str]]:
+        """
+        Returns the coordinates the current player fires at this turn.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        salvo = self._solve(game)
+        if salvo is None:
+            return self.heuristic.choose(game)
+        ret = [COORDINATES[cell] for cell in salvo]
+        count = game.current_player.battle_total
+        if len(ret) < count:
+            ret += [coordinate for coordinate in self.heuristic.choose(game)
+                    if coordinate not in ret][:count - len(ret)]
+        return ret
+
+    def _solve(self, game: BattleshipGame) -> Optional[Tuple[int, ...]]:
+        """
+        Returns the best salvo of the endgame, or None if the game is not in
+        an endgame the solver can handle.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        player, enemy = game.current_player, game.other_player()
+        if enemy.battle_total > MAX_VESSELS:
+            return None
+
+        blocked = hit = destroyed = 0
+        for node in player.traditional.nodes:
+            if node.state == MISSED:
+                blocked |= 1 << node.cell
+            elif node.state == DAMAGED:
+                hit |= 1 << node.cell
+            elif node.state == DESTROYED:
+                hit |= 1 << node.cell
+                destroyed |= 1 << node.cell
+        if not hit & ~destroyed:  # No vessel afloat is known to be damaged
+            self.solver = None
+            return None
+
+        # Keep the layouts of the previous turn when they still explain the
+        # grid, so the cache is kept too
+        alive = 0
+        if self.solver is not None:
+            alive = self.solver.consistent(blocked, hit, destroyed)
+        if not alive:
+            layouts = enumerate_layouts(deduce(player, enemy), MAX_LAYOUTS)
+            if not layouts:
+                self.solver = None
+                return None
+            self.solver = EndgameSolver(layouts, destroyed)
+            alive = self.solver.consistent(blocked, hit, destroyed)
+
+        self.solver.positions = 0
+        try:
+            return self.solver.solve(alive, hit | blocked,
+                                     player.battle_total)[1]
+        except _SearchLimit:
+            return None
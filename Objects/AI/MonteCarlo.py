@@ -0,0 +1,349 @@
+"""
+MonteCarlo.py
+
+PURPOSE:
+Creates the Monte Carlo targeting strategy. Every turn, it samples as many
+random enemy fleet layouts as it can within a time budget, keeping only those
+that agree with everything its player has seen on their traditional grid:
+no vessel afloat lies on a missed or destroyed node, and every damaged node is
+covered by a vessel. Placements ruled out by deduction (see Deduction.py) are
+never tried. The nodes held by a vessel in the most layouts are fired at.
+
+Sampling is spread across a pool of worker processes, each of which samples
+until the budget runs out, so more cores or a larger budget give more layouts
+per turn and better targeting, while every turn takes about as long as the
+budget. Sampling can also carry on in the background while the enemy takes
+their turn.
+"""
+from __future__ import annotations
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from threading import Event, Thread
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from Objects.AI.Deduction import Deduction, bits
+from Objects.AI.Density import DensityTargeting, placements, remaining_lengths
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Coordinate import COORDINATES, SIZE
+from Objects.Mechanics.Node import EMPTY_NODE, MISSED, DAMAGED, DESTROYED
+
+# Default time spent sampling every turn, in milliseconds
+BUDGET = 250
+
+# Attempts at placing a single vessel before a layout is given up on
+ATTEMPTS = 50
+
+# Time spent sampling between checks for the end of the enemy's turn, in
+# milliseconds
+PONDER_CHUNK = 50
+
+
+class Observation(NamedTuple):
+    """
+    Everything a player knows about the enemy fleet, sent to every worker.
+
+    Attribute(s):
+     - lengths: The length of every enemy vessel afloat
+     - blocked: The nodes no vessel afloat can be on
+     - damaged: The nodes holding a damaged vessel that has not sunk yet
+    """
+    lengths: Tuple[int, ...]
+    blocked: frozenset
+    damaged: Tuple[int, ...]
+
+
+def sample(observation: Observation, budget: float, seed: int) \
+        -> Tuple[List[int], int]:
+    """
+    Samples random layouts agreeing with the observation until the budget runs
+    out. Returns how many layouts had a vessel on each node, and the number of
+    layouts sampled.
+
+    Parameter(s):
+     - observation: What the player knows about the enemy fleet
+     - budget: The time to sample for, in seconds
+     - seed: The seed of the random number generator
+    """
+    deadline = perf_counter() + budget
+    rng = Random(seed)
+    counts = [0] * (SIZE * SIZE)
+    lengths = observation.lengths
+    if not lengths:
+        return counts, 0
+
+    # Placements left once everything that can be deduced is ruled out
+    deduction = Deduction(sum(1 << cell for cell in observation.blocked),
+                          sum(1 << cell for cell in observation.damaged), 0,
+                          Counter(lengths))
+    must = tuple(bits(deduction.must))
+    possible: Dict[int, List[Tuple[int, ...]]] = {}
+    covering: Dict[int, Dict[int, List[Tuple[int, ...]]]] = {}
+    for length in set(lengths):
+        cells, by_cell = placements(length)
+        valid = deduction.valid[length]
+        possible[length] = [cells[placement] for placement in
+                            deduction.possible_placements(length)]
+        covering[length] = {
+            cell: [cells[placement] for placement in by_cell[cell]
+                   if valid[placement]]
+            for cell in must}
+
+    samples = 0
+    while perf_counter() < deadline:
+        layout = _layout(lengths, must, possible, covering, rng)
+        if layout is not None:
+            samples += 1
+            for cell in layout:
+                counts[cell] += 1
+    return counts, samples
+
+
+def _layout(lengths: Tuple[int, ...], must: Tuple[int, ...],
+            possible: Dict[int, List[Tuple[int, ...]]],
+            covering: Dict[int, Dict[int, List[Tuple[int, ...]]]],
+            rng: Random) -> Optional[set]:
+    """
+    Returns the nodes taken up by one random layout of the vessels afloat that
+    agrees with the observation, or None if this attempt failed. Vessels are
+    placed over nodes known to hold a vessel first, then the rest anywhere
+    they fit.
+
+    Parameter(s):
+     - lengths: The length of every vessel afloat
+     - must: The nodes known to hold a vessel
+     - possible: Every placement of each length not ruled out
+     - covering: Those placements covering each node in must, by length
+     - rng: The random number generator used
+    """
+    taken = set()
+    left = list(lengths)
+    uncovered = set(must)
+    while uncovered:
+        cell = rng.choice(sorted(uncovered))
+        options = [(length, placement) for length in set(left)
+                   for placement in covering[length][cell]
+                   if taken.isdisjoint(placement)]
+        if not options:
+            return None
+        length, placement = rng.choice(options)
+        left.remove(length)
+        taken.update(placement)
+        uncovered.difference_update(placement)
+
+    for length in left:
+        options = possible[length]
+        if not options:
+            return None
+        for _ in range(ATTEMPTS):
+            placement = options[rng.randrange(len(options))]
+            if taken.isdisjoint(placement):
+                taken.update(placement)
+                break
+        else:
+            return None
+    return taken
+
+
+class Pondered(NamedTuple):
+    """
+    The layouts sampled while the enemy was taking their turn.
+
+    Attribute(s):
+     - observation: What the player knew about the enemy fleet
+     - counts: How many layouts had a vessel on each node
+     - samples: The number of layouts sampled
+     - spent: The time spent sampling, in seconds
+    """
+    observation: Observation
+    counts: List[int]
+    samples: int
+    spent: float
+
+
+class MonteCarloTargeting:
+    """
+    Fires at the nodes holding a vessel in the most sampled layouts.
+
+    Nothing the player knows about the enemy fleet changes during the enemy's
+    turn, so ponder() can be called once the player's turn is over to keep
+    sampling on a background thread until the player's next turn. choose()
+    then starts from those layouts and only samples for whatever is left of
+    the budget.
+
+    Attribute(s):
+     - rng: The random number generator used to seed workers and break ties
+     - budget: The time spent sampling every turn, in milliseconds
+     - workers: The number of worker processes; 0 samples in this process
+     - pool: The worker processes, created on the first turn
+     - fallback: Chooses targets if no layout could be sampled in time
+     - samples: The number of layouts used during the last turn
+     - pondering: The background thread sampling during the enemy's turn
+     - stop: Set to stop the background thread
+     - pondered: The layouts sampled by the background thread
+    """
+    rng: Random
+    budget: int
+    workers: int
+    pool: Optional[ProcessPoolExecutor]
+    fallback: DensityTargeting
+    samples: int
+    pondering: Optional[Thread]
+    stop: Event
+    pondered: Optional[Pondered]
+
+    def __init__(self, rng: Random, budget: int = BUDGET,
+                 workers: Optional[int] = None) -> None:
+        """
+        Initializes a new MonteCarloTargeting.
+
+        Parameter(s):
+         - rng: The random number generator used to seed workers and break
+           ties
+         - budget: The time spent sampling every turn, in milliseconds
+         - workers: The number of worker processes; one per CPU if None, none
+           if 0
+        """
+        self.rng = rng
+        self.budget = budget
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pool = None
+        self.fallback = DensityTargeting(rng)
+        self.samples = 0
+        self.pondering = None
+        self.stop = Event()
+        self.pondered = None
+
+    def choose(self, game: BattleshipGame) -> List[Tuple[str, str]]:
+        """
+        Returns the coordinates the current player fires at this turn.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        observation = _observe(game.current_player, game.other_player())
+
+        # Start from the layouts sampled during the enemy's turn, if any
+        self._stop_pondering()
+        pondered = self.pondered
+        self.pondered = None
+        if pondered is not None and pondered.observation == observation:
+            counts, samples = pondered.counts, pondered.samples
+            budget = self.budget / 1000 - pondered.spent
+        else:
+            counts, samples = [0] * (SIZE * SIZE), 0
+            budget = self.budget / 1000
+
+        if budget > 0:
+            more_counts, more_samples = self._sample(observation, budget)
+            counts = [one + two for one, two in zip(counts, more_counts)]
+            samples += more_samples
+        self.samples = samples
+        if not samples:
+            return self.fallback.choose(game)
+
+        nodes = game.current_player.traditional.nodes
+        cells = [node.cell for node in nodes if node.state == EMPTY_NODE]
+        count = game.current_player.battle_total
+        chosen = sorted(cells, key=lambda cell: (
+            counts[cell], self.rng.random()), reverse=True)[:count]
+        return [COORDINATES[cell] for cell in chosen]
+
+    # Pondering ----------------------------------------------------------------
+    def ponder(self, player: Player, enemy: Player) -> None:
+        """
+        Starts sampling layouts for the player's next turn on a background
+        thread, until choose() or close() is called.
+
+        Parameter(s):
+         - player: The player the strategy is choosing targets for
+         - enemy: The enemy player, whose turn it is
+
+        Precondition(s):
+         - The player's turn is over
+        """
+        self._stop_pondering()
+        self.pondered = None
+        self.stop.clear()
+        self.pondering = Thread(target=self._ponder,
+                                args=(_observe(player, enemy),), daemon=True)
+        self.pondering.start()
+
+    def _ponder(self, observation: Observation) -> None:
+        """
+        Samples layouts a little at a time until asked to stop, then stores
+        every layout sampled in pondered.
+
+        Parameter(s):
+         - observation: What the player knows about the enemy fleet
+        """
+        counts = [0] * (SIZE * SIZE)
+        samples = 0
+        start = perf_counter()
+        while not self.stop.is_set():
+            more_counts, more_samples = self._sample(observation,
+                                                     PONDER_CHUNK / 1000)
+            counts = [one + two for one, two in zip(counts, more_counts)]
+            samples += more_samples
+        self.pondered = Pondered(observation, counts, samples,
+                                 perf_counter() - start)
+
+    def _stop_pondering(self) -> None:
+        """Stops the background thread, if running, and waits for it."""
+        if self.pondering is not None:
+            self.stop.set()
+            self.pondering.join()
+            self.pondering = None
+
+    # Sampling -----------------------------------------------------------------
+    def _sample(self, observation: Observation, budget: float) \
+            -> Tuple[List[int], int]:
+        """
+        Samples layouts in every worker for the length of the budget and
+        returns the combined counts and number of layouts.
+
+        Parameter(s):
+         - observation: What the player knows about the enemy fleet
+         - budget: The time to sample for, in seconds
+        """
+        if not self.workers:
+            return sample(observation, budget, self.rng.getrandbits(64))
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        futures = [self.pool.submit(sample, observation, budget,
+                                    self.rng.getrandbits(64))
+                   for _ in range(self.workers)]
+        counts = [0] * (SIZE * SIZE)
+        samples = 0
+        for future in futures:
+            worker_counts, worker_samples = future.result()
+            samples += worker_samples
+            for cell, value in enumerate(worker_counts):
+                counts[cell] += value
+        return counts, samples
+
+    def close(self) -> None:
+        """Stops the background thread and the worker processes, if any."""
+        self._stop_pondering()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+def _observe(player: Player, enemy: Player) -> Observation:
+    """
+    Returns what the player knows about the enemy fleet.
+
+    Parameter(s):
+     - player: The player looking at their traditional grid
+     - enemy: The enemy player
+    """
+    nodes = player.traditional.nodes
+    return Observation(
+        tuple(sorted(remaining_lengths(enemy).elements())),
+        frozenset(node.cell for node in nodes
+                  if node.state == MISSED or node.state == DESTROYED),
+        tuple(node.cell for node in nodes if node.state == DAMAGED))
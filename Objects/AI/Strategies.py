@@ -0,0 +1,205 @@
+"""
+Strategies.py
+
+PURPOSE:
+Creates the targeting and placement strategies that computer players use to
+play Traditional Battleship through the engine (see Engine.py). Strategies
+only look at what their player is allowed to see: their own grids and the
+results of their own orders on the traditional grid.
+
+A targeting strategy is created once per game with its own random number
+generator, and choose() is called at the start of every turn of its player. A
+placement strategy is a function that places every vessel the player has in
+port. New strategies are added to TARGETING or PLACEMENT by name.
+"""
+from __future__ import annotations
+from random import Random
+from typing import Callable, Dict, List, Set, Tuple
+from Objects.AI.Density import DensityTargeting
+from Objects.AI.Endgame import EndgameTargeting
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Coordinate import COORDINATES, SIZE, STEPS, \
+    vessel_cells
+from Objects.Mechanics.Node import EMPTY_NODE, DAMAGED, DESTROYED
+
+
+class RandomTargeting:
+    """
+    Fires at random nodes that have not been fired at yet.
+
+    Attribute(s):
+     - rng: The random number generator used
+     - order: Every node in the order it will be fired at; the end of the list
+       is fired at first
+    """
+    rng: Random
+    order: List[int]
+
+    def __init__(self, rng: Random) -> None:
+        """
+        Initializes a new RandomTargeting.
+
+        Parameter(s):
+         - rng: The random number generator used
+        """
+        self.rng = rng
+        self.order = list(range(SIZE * SIZE))
+        rng.shuffle(self.order)
+
+    def choose(self, game: BattleshipGame) -> List[Tuple[str, str]]:
+        """
+        Returns the coordinates the current player fires at this turn.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        nodes = game.current_player.traditional.nodes
+        ret = []
+        while self.order and len(ret) < game.current_player.battle_total:
+            cell = self.order.pop()
+            if nodes[cell].state == EMPTY_NODE:
+                ret.append(COORDINATES[cell])
+        return ret
+
+
+class HuntTargeting(RandomTargeting):
+    """
+    Fires at random nodes of a checkerboard pattern, which every vessel
+    crosses, until a vessel is damaged. Nodes next to damaged nodes are then
+    fired at first, until the damaged vessel is sunk.
+
+    Attribute(s):
+     - fired: The nodes fired at during the previous turn
+     - damaged: Nodes known to hold a damaged vessel that has not sunk yet
+    """
+    fired: List[int]
+    damaged: Set[int]
+
+    def __init__(self, rng: Random) -> None:
+        """
+        Initializes a new HuntTargeting.
+
+        Parameter(s):
+         - rng: The random number generator used
+        """
+        super().__init__(rng)
+        # Checkerboard nodes last, so they are fired at first
+        self.order.sort(key=lambda cell: sum(divmod(cell, SIZE)) % 2 == 0)
+        self.fired = []
+        self.damaged = set()
+
+    def choose(self, game: BattleshipGame) -> List[Tuple[str, str]]:
+        """
+        Returns the coordinates the current player fires at this turn.
+
+        Parameter(s):
+         - game: The current game taking place
+        """
+        nodes = game.current_player.traditional.nodes
+
+        # Learn from the results of the previous turn
+        for cell in self.fired:
+            if nodes[cell].state == DAMAGED:
+                self.damaged.add(cell)
+        self.damaged = {cell for cell in self.damaged
+                        if nodes[cell].state != DESTROYED}
+
+        # Nodes next to damaged vessels first
+        count = game.current_player.battle_total
+        chosen = []
+        for cell in sorted(self.damaged):
+            row, col = divmod(cell, SIZE)
+            for d_row, d_col in STEPS.values():
+                n_row, n_col = row + d_row, col + d_col
+                if 0 <= n_row < SIZE and 0 <= n_col < SIZE:
+                    neighbour = n_row * SIZE + n_col
+                    if nodes[neighbour].state == EMPTY_NODE and \
+                            neighbour not in chosen:
+                        chosen.append(neighbour)
+
+        self.rng.shuffle(chosen)
+        chosen = chosen[:count]
+        while self.order and len(chosen) < count:
+            cell = self.order.pop()
+            if nodes[cell].state == EMPTY_NODE and cell not in chosen:
+                chosen.append(cell)
+
+        self.fired = chosen
+        return [COORDINATES[cell] for cell in chosen]
+
+
+def random_placement(player: Player, rng: Random) -> None:
+    """
+    Places every vessel the player has in port at a random position.
+
+    Parameter(s):
+     - player: The player whose fleet is being placed
+     - rng: The random number generator used
+    """
+    Engine.deploy_randomly(player, rng)
+
+
+def apart_placement(player: Player, rng: Random) -> None:
+    """
+    Places every vessel the player has in port at a random position where it
+    does not touch another vessel, not even diagonally.
+
+    Parameter(s):
+     - player: The player whose fleet is being placed
+     - rng: The random number generator used
+    """
+    grid = player.personal
+    for vessel in [vessel for lst in player.fleet for vessel in lst]:
+        for _ in range(1000):
+            coordinate = rng.choice(COORDINATES)
+            direction = rng.choice('NSEW')
+            if grid.check_placement(vessel.length, direction, coordinate) and \
+                    not _touching(player, vessel.length, direction, coordinate):
+                break
+        else:  # Grid too crowded; any legal position will do
+            while not grid.check_placement(vessel.length, direction,
+                                           coordinate):
+                coordinate = rng.choice(COORDINATES)
+                direction = rng.choice('NSEW')
+        player.place_vessel(vessel.abbrev, vessel.pennant, coordinate,
+                            direction)
+
+
+def _touching(player: Player, length: int, direction: str,
+              coordinate: Tuple[str, str]) -> bool:
+    """
+    Returns whether a vessel placed at the coordinate would touch a vessel
+    that is already on the player's personal grid.
+
+    Parameter(s):
+     - player: The player placing the vessel
+     - length: The number of nodes the vessel takes up
+     - direction: The direction the vessel faces
+     - coordinate: The coordinate of the bow of the vessel
+
+    Precondition(s):
+     - The vessel fits at the coordinate
+    """
+    nodes = player.personal.nodes
+    for cell in vessel_cells(coordinate, direction, length):
+        row, col = divmod(cell, SIZE)
+        for n_row in range(max(row - 1, 0), min(row + 2, SIZE)):
+            for n_col in range(max(col - 1, 0), min(col + 2, SIZE)):
+                if nodes[n_row * SIZE + n_col].occupied:
+                    return True
+    return False
+
+
+# Strategies by name
+TARGETING: Dict[str, Callable[[Random], object]] = {
+    'random': RandomTargeting,
+    'hunt': HuntTargeting,
+    'density': DensityTargeting,
+    'endgame': EndgameTargeting,
+}
+PLACEMENT: Dict[str, Callable[[Player, Random], None]] = {
+    'random': random_placement,
+    'apart': apart_placement,
+}
@@ -0,0 +1,356 @@
+"""
+BitGrid.py
+
+PURPOSE:
+Creates a bitboard alternative to the Grid. Instead of linking a Node object for
+every coordinate, each layer of the board (occupied, hit, miss, destroyed and
+targeted) is stored as a single integer bitmask, so hit tests, placement checks
+and sinking are a handful of bitwise operations and copying a board is cheap.
+
+BitGrid is a standalone alternative: the game, the batch simulator and the
+benchmarks all play on Grid. Like Grid, placing a vessel stores the cells it
+takes up on the vessel, which every later lookup of the vessel's nodes uses.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple, Optional
+from Settings import ROW_ICON, COL_ICON, ROW_SEP, CORNER, COL_SPACER, COL_SEP, \
+    BOW, STERN, DEFAULT, GREEN, PURPLE, BLUE, RED, YELLOW, \
+    EMPTY, HIT, MISS, DROP
+from Objects.Mechanics.Coordinate import SIZE, to_index, vessel_cells
+from Objects.Vessels.Vessel import TraditionalVessel
+
+
+class BitGrid:
+    """
+    A grid that players will place vessels on and play with, stored as one
+    bitmask per layer. Bit (row * size + col) represents the node at that row
+    and column, with row 0 being the top row of the printed grid.
+
+    Attribute(s):
+     - size: The side length of the grid (all grids are square)
+
+     - occupied: Nodes where a vessel is located
+     - hit: Nodes where a vessel has been damaged by any armament
+     - miss: Nodes where an armament landed in empty water
+     - destroyed: Nodes belonging to a vessel that has been sunk
+     - targeted: Nodes currently being targeted by a planned order
+
+     - vessels: The vessel located at each occupied node
+     - signs: The symbol displayed at each occupied node
+    """
+    size: int
+
+    occupied: int
+    hit: int
+    miss: int
+    destroyed: int
+    targeted: int
+
+    vessels: Dict[int, TraditionalVessel]
+    signs: Dict[int, str]
+
+    def __init__(self, size: int = 36) -> None:
+        """
+        Initiates a new BitGrid object.
+
+        Parameter(s):
+        - size: The side length of the grid.
+
+        Precondition(s):
+         - size <= 36
+        """
+        self.size = size
+
+        self.occupied = 0
+        self.hit = 0
+        self.miss = 0
+        self.destroyed = 0
+        self.targeted = 0
+
+        self.vessels = {}
+        self.signs = {}
+
+    def __copy__(self) -> BitGrid:
+        """Returns a complete copy of the BitGrid."""
+        ret = BitGrid(self.size)
+
+        ret.occupied = self.occupied
+        ret.hit = self.hit
+        ret.miss = self.miss
+        ret.destroyed = self.destroyed
+        ret.targeted = self.targeted
+
+        ret.vessels = self.vessels.copy()
+        ret.signs = self.signs.copy()
+
+        return ret
+
+    def __repr__(self) -> str:
+        """Used for printing the personal grid."""
+        row = ROW_ICON[36 - self.size::]
+        lines = []
+
+        # Get each row's representation
+        for i in range(self.size):
+            cells = [self._node_repr(i * self.size + j)
+                     for j in range(self.size)]
+            lines.append(f'{row[i]} {ROW_SEP} ' + ' '.join(cells))
+
+        # Create column header and return
+        lines.append(f'  {CORNER}' + f'{COL_SPACER}{COL_SEP}' * self.size)
+        lines.append('    ' + ' '.join(COL_ICON[:self.size]))
+
+        return '\n'.join(lines) + '\n'
+
+    # Helper functions ---------------------------------------------------------
+    def _bit(self, coordinate: Tuple[str, str]) -> int:
+        """
+        Returns the bit index of the specified node.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        row, col = to_index(coordinate)
+        return (row - (36 - self.size)) * self.size + col
+
+    def _cell_bit(self, cell: int) -> int:
+        """
+        Returns the bit index of the node with a packed cell id.
+
+        Parameter(s):
+         - cell: The packed cell id of the node
+        """
+        row, col = divmod(cell, SIZE)
+        return (row - (SIZE - self.size)) * self.size + col
+
+    def _node_repr(self, bit: int) -> str:
+        """
+        Returns the colored symbol of the node at the specified bit index.
+
+        Parameter(s):
+         - bit: The bit index of the node
+        """
+        mask = 1 << bit
+        if self.occupied & mask:
+            sign = self.signs[bit]
+            if self.destroyed & mask:
+                return f'{RED}{sign}{DEFAULT}'
+            elif self.hit & mask:
+                return f'{YELLOW}{sign}{DEFAULT}'
+            return f'{GREEN}{sign}{DEFAULT}'
+        elif self.destroyed & mask:
+            return f'{RED}{HIT}{DEFAULT}'
+        elif self.hit & mask:
+            return f'{YELLOW}{HIT}{DEFAULT}'
+        elif self.miss & mask:
+            return f'{BLUE}{MISS}{DEFAULT}'
+        elif self.targeted & mask:
+            return f'{PURPLE}{DROP}{DEFAULT}'
+        return f'{DEFAULT}{EMPTY}{DEFAULT}'
+
+    def cells(self, length: int, direction: str,
+              coordinate: Tuple[str, str]) -> Optional[List[int]]:
+        """
+        Returns the bit indices of all nodes a vessel would take up, ordered
+        from bow to stern, or None if the vessel does not fit within the grid.
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+         - direction: The direction the bow of the vessel is facing
+         - coordinate: The col and row of the bow
+        """
+        cells = vessel_cells(coordinate, direction, length, self.size)
+        if cells is None:
+            return None
+        return [self._cell_bit(cell) for cell in cells]
+
+    def footprint(self, length: int, direction: str,
+                  coordinate: Tuple[str, str]) -> Optional[int]:
+        """
+        Returns the mask of all nodes a vessel would take up, or None if the
+        vessel does not fit within the grid.
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+         - direction: The direction the bow of the vessel is facing
+         - coordinate: The col and row of the bow
+        """
+        bits = self.cells(length, direction, coordinate)
+        if bits is None:
+            return None
+
+        mask = 0
+        for bit in bits:
+            mask |= 1 << bit
+        return mask
+
+    def _vessel_mask(self, vessel: TraditionalVessel) -> int:
+        """
+        Returns the mask of all nodes the placed vessel takes up.
+
+        Parameter(s):
+         - vessel: The vessel that has been placed on a grid
+        """
+        mask = 0
+        for cell in vessel.cells:
+            mask |= 1 << self._cell_bit(cell)
+        return mask
+
+    # Queries ------------------------------------------------------------------
+    def check_placement(self, length: int, direction: str,
+                        coordinate: Tuple[str, str]) -> bool:
+        """
+        Checks to see if a vessel can be placed at the coordinate and direction
+        given without leaving the grid or overlapping another vessel.
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+         - direction: The direction the vessel is facing
+         - coordinate: The col and row of the bow
+        """
+        mask = self.footprint(length, direction, coordinate)
+        return mask is not None and not mask & self.occupied
+
+    def vessel_at(self, coordinate: Tuple[str, str]) \
+            -> Optional[TraditionalVessel]:
+        """
+        Returns the vessel located at the node, if any.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        return self.vessels.get(self._bit(coordinate))
+
+    def is_hit(self, coordinate: Tuple[str, str]) -> bool:
+        """
+        Returns whether the node has been hit or not by any armament.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        return bool((self.hit | self.miss) >> self._bit(coordinate) & 1)
+
+    # Player placement (grid setup) --------------------------------------------
+    def add_vessel(self, vessel: TraditionalVessel, coordinate: Tuple[str, str],
+                   direction: str) -> None:
+        """
+        Places a vessel on the grid in the specified direction at the specified
+        node and stores the cells it takes up on the vessel.
+
+        Parameter(s):
+         - vessel: The vessel that is being placed on the grid
+         - coordinate: The col and row
+         - direction: The direction the bow of the vessel is facing
+        """
+        length = vessel.length
+        vessel.cells = vessel_cells(coordinate, direction, length, self.size)
+        bits = [self._cell_bit(cell) for cell in vessel.cells]
+
+        for i, bit in enumerate(bits):
+            self.occupied |= 1 << bit
+            self.vessels[bit] = vessel
+            if i == 0:
+                self.signs[bit] = BOW[direction]
+            elif i == length - 1:
+                self.signs[bit] = STERN[direction]
+            else:
+                self.signs[bit] = vessel.symbol
+
+    def remove_vessel(self, vessel: TraditionalVessel) -> None:
+        """
+        Removes a vessel from the grid.
+
+        Parameter(s):
+         - vessel: The vessel that is being removed from the grid
+        """
+        mask = self._vessel_mask(vessel)
+        self.occupied &= ~mask
+
+        while mask:
+            bit = (mask & -mask).bit_length() - 1
+            del self.vessels[bit]
+            del self.signs[bit]
+            mask &= mask - 1
+
+    # Planning -----------------------------------------------------------------
+    def target_and_drop(self, coordinate: Tuple[str, str]) -> None:
+        """
+        Marks the node as targeted by a planned order.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        self.targeted |= 1 << self._bit(coordinate)
+
+    def not_target_and_drop(self, coordinate: Tuple[str, str]) -> None:
+        """
+        Reverses changes caused by method target_and_drop().
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        self.targeted &= ~(1 << self._bit(coordinate))
+
+    # After shooting -----------------------------------------------------------
+    def fire(self, coordinate: Tuple[str, str]) -> bool:
+        """
+        Resolves an armament landing on the node. Returns True if a vessel was
+        damaged, False otherwise.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        mask = 1 << self._bit(coordinate)
+        self.targeted &= ~mask
+        if self.occupied & mask:
+            self.hit |= mask
+            return True
+        self.miss |= mask
+        return False
+
+    def damaged(self, coordinate: Tuple[str, str]) -> None:
+        """
+        Marks the node as damaged on radar / sonar grids.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        mask = 1 << self._bit(coordinate)
+        self.targeted &= ~mask
+        self.hit |= mask
+
+    def missed(self, coordinate: Tuple[str, str]) -> None:
+        """
+        Marks the node as a miss.
+
+        Parameter(s):
+         - coordinate: The col and row
+        """
+        mask = 1 << self._bit(coordinate)
+        self.targeted &= ~mask
+        self.miss |= mask
+
+    def ally_sunk(self, vessel: TraditionalVessel) -> None:
+        """
+        Converts the nodes where the sunk vessel is to destroyed on personal
+        grids.
+
+        Parameter(s):
+         - vessel: The vessel that has been destroyed
+        """
+        mask = self._vessel_mask(vessel)
+        self.hit |= mask
+        self.destroyed |= mask
+
+    def enemy_sunk(self, vessel: TraditionalVessel) -> None:
+        """
+        Converts the nodes where the sunk vessel is to destroyed on radar /
+        sonar (or traditional) grids.
+
+        Parameter(s):
+         - vessel: The vessel that has been destroyed
+        """
+        mask = self._vessel_mask(vessel)
+        self.targeted &= ~mask
+        self.hit |= mask
+        self.destroyed |= mask
@@ -0,0 +1,108 @@
+"""
+Coordinate.py
+
+PURPOSE:
+Converts between the (col, row) string coordinates shown to players and the
+indices used to look up nodes. All lookups are precomputed so that converting a
+coordinate never scans Settings.COL_ICON / Settings.ROW_ICON.
+
+Cell ids pack a node into a single integer, row * SIZE + col, where row and col
+are the indices of the node within a full sized grid.
+"""
+from typing import Dict, List, Tuple, Optional
+from Settings import ROW_ICON, COL_ICON
+
+# The side length of a full sized grid
+SIZE = 36
+
+# Icon -> index lookups
+COL_INDEX: Dict[str, int] = {icon: i for i, icon in enumerate(COL_ICON)}
+ROW_INDEX: Dict[str, int] = {icon: i for i, icon in enumerate(ROW_ICON)}
+
+# Cell id <-> coordinate lookups
+COORDINATES: List[Tuple[str, str]] = [(col, row) for row in ROW_ICON
+                                      for col in COL_ICON]
+CELL_IDS: Dict[Tuple[str, str], int] = {coord: i for i, coord in
+                                        enumerate(COORDINATES)}
+
+# The (row, col) step from the bow towards the stern for each bow direction
+STEPS = {'N': (1, 0), 'S': (-1, 0), 'E': (0, -1), 'W': (0, 1)}
+
+
+def is_valid(col: str, row: str) -> bool:
+    """
+    Returns whether the col and row given exist on a full sized grid.
+
+    Parameter(s):
+     - col: The col icon
+     - row: The row icon
+    """
+    return col in COL_INDEX and row in ROW_INDEX
+
+
+def to_index(coordinate: Tuple[str, str]) -> Tuple[int, int]:
+    """
+    Returns the (row, col) indices of a coordinate.
+
+    Parameter(s):
+     - coordinate: The col and row
+    """
+    return ROW_INDEX[coordinate[1]], COL_INDEX[coordinate[0]]
+
+
+def to_cell(coordinate: Tuple[str, str]) -> int:
+    """
+    Returns the packed cell id of a coordinate.
+
+    Parameter(s):
+     - coordinate: The col and row
+    """
+    return CELL_IDS[coordinate]
+
+
+def from_cell(cell: int) -> Tuple[str, str]:
+    """
+    Returns the (col, row) coordinate of a packed cell id.
+
+    Parameter(s):
+     - cell: The packed cell id
+    """
+    return COORDINATES[cell]
+
+
+def display_cell(cell: int) -> str:
+    """
+    Returns a packed cell id the way coordinates are displayed to players.
+
+    Parameter(s):
+     - cell: The packed cell id
+    """
+    col, row = COORDINATES[cell]
+    return f'({col}, {row})'
+
+
+def vessel_cells(coordinate: Tuple[str, str], direction: str, length: int,
+                 size: int = SIZE) -> Optional[Tuple[int, ...]]:
+    """
+    Returns the cell ids of every node a vessel would take up, ordered from bow
+    to stern, or None if the vessel would not fit within the grid.
+
+    Parameter(s):
+     - coordinate: The col and row of the bow
+     - direction: The direction the bow of the vessel is facing
+     - length: The number of nodes the vessel takes up
+     - size: The side length of the grid
+    """
+    row, col = to_index(coordinate)
+    row_step, col_step = STEPS[direction]
+    end_row = row + row_step * (length - 1)
+    end_col = col + col_step * (length - 1)
+
+    # Smaller grids use the last rows and first columns of a full sized grid
+    if not (SIZE - size <= row < SIZE and SIZE - size <= end_row < SIZE and
+            0 <= col < size and 0 <= end_col < size):
+        return None
+
+    step = row_step * SIZE + col_step
+    bow = row * SIZE + col
+    return tuple(bow + i * step for i in range(length))
@@ -0,0 +1,526 @@
+"""
+Engine.py
+
+PURPOSE:
+The rules of Traditional Battleship without any input or output. Games are
+created, fleets deployed, orders submitted and turns resolved through the
+functions below, which report invalid moves with result codes instead of
+prompting anyone. The Two Player Traditional mode drives a game through this
+engine, and the same functions can run games with no terminal at all.
+
+A headless game looks like:
+    game = new_game(Player('One', 'UK', 1), Player('Two', 'FR', 2))
+    deploy_randomly(game.player1, rng)
+    deploy_randomly(game.player2, rng)
+    while winner(game) is None:
+        submit_orders(game, coordinates)
+        step(game)
+"""
+from random import Random
+from typing import List, Tuple, Optional, Iterable
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Order import TraditionalOrder
+from Objects.Mechanics.GridState import GridState
+from Objects.Mechanics.Coordinate import COORDINATES, is_valid, to_index
+from Objects.Mechanics.Fleet import PORT, DEPLOYED, CLASSES
+from Objects.Mechanics.Names import vessel_name, max_pennants
+from Objects.Mechanics.Node import Node, EMPTY_NODE, TARGETED, MISSED, \
+    OCCUPIED
+from Objects.Vessels.Vessel import TraditionalVessel
+from Objects.Vessels.Battleship import TraditionalBattleship
+from Objects.Vessels.Cruiser import TraditionalCruiser
+from Objects.Vessels.Destroyer import TraditionalDestroyer
+from Objects.Vessels.Frigate import TraditionalFrigate
+from Objects.Vessels.Submarine import TraditionalSubmarine
+from Objects.Vessels.Carrier import TraditionalCarrier
+
+# Result codes
+OK = 0
+INVALID_VESSEL = 1      # The vessel does not exist or cannot do that
+INVALID_COORDINATE = 2  # The coordinate does not exist or was already hit
+INVALID_DIRECTION = 3   # The direction is not N, S, E or W
+INVALID_NODES = 4       # The vessel does not fit at the coordinate
+MAX_ORDERS = 5          # Every deployed vessel already has an order
+INVALID_ORDER = 6       # The order already exists or does not exist
+
+# Node states that can still be targeted; neither hit nor targeted already
+OPEN_STATES = (EMPTY_NODE, OCCUPIED)
+
+# One vessel of every class, in the order vessel lists are kept
+VESSEL_TYPES = (TraditionalBattleship, TraditionalCruiser, TraditionalDestroyer,
+                TraditionalFrigate, TraditionalSubmarine, TraditionalCarrier)
+
+# The vessel class of every class abbreviation
+CLASS_TYPES = dict(zip(CLASSES, VESSEL_TYPES))
+
+# The result of an order: (cell, outcome, class, pennant, bow). The outcome is
+# the new state of the node on the traditional grid: MISSED, DAMAGED, or
+# DESTROYED if the order sank the vessel. The class abbreviation and pennant
+# number are those of the vessel hit ('' and 0 if none), and the bow is where
+# the vessel lies, ((col, row), direction), if the order sank it, else None
+Shot = Tuple[int, int, str, int, Optional[Tuple[Tuple[str, str], str]]]
+
+
+# Setup ------------------------------------------------------------------------
+def new_game(p1: Player, p2: Player, fleets: int = 1, battles: int = 1,
+             rng: Optional[Random] = None) -> BattleshipGame:
+    """
+    Creates a new game and gives both players their fleets, in port. Player 1
+    has the first turn.
+
+    Parameter(s):
+     - p1: Player 1
+     - p2: Player 2
+     - fleets: The number of vessels of each class given to each player
+     - battles: The number of battles that need to be played
+     - rng: The random number generator pennant numbers are drawn with; a
+       new one if None
+    """
+    game = BattleshipGame(p1, p2, battles)
+    for _ in range(fleets):
+        setup_fleet(game.player1, rng)
+        setup_fleet(game.player2, rng)
+    game.update_p1_backup()
+    game.update_p2_backup()
+    return game
+
+
+def setup_fleet(player: Player, rng: Optional[Random] = None) -> None:
+    """
+    Adds one vessel of every class to the player's fleet.
+
+    Parameter(s):
+     - player: The player that the fleet is currently being setup for
+     - rng: The random number generator pennant numbers are drawn with; a
+       new one if None
+    """
+    for vessel_type in VESSEL_TYPES:
+        player.add_vessel(vessel_type, rng)
+
+
+def enlist(player: Player, abbrev: str, pennant: int) -> int:
+    """
+    Adds a vessel with a specific pennant number to the player's fleet, in
+    port, such as a vessel of a fleet set up elsewhere. Returns OK, or
+    INVALID_VESSEL if the class does not exist or the pennant number is not
+    available.
+
+    Parameter(s):
+     - player: The player the vessel is added to
+     - abbrev: The class abbreviation of the vessel
+     - pennant: The pennant number of the vessel
+    """
+    vessel_type = CLASS_TYPES.get(abbrev)
+    if vessel_type is None or \
+            not 1 <= pennant <= max_pennants(player.nation[0], vessel_type):
+        return INVALID_VESSEL
+    try:
+        player.pennant_pool(vessel_type).take(pennant)
+    except ValueError:  # Already in use
+        return INVALID_VESSEL
+    player.vessels.add(vessel_type(
+        player.nation[0], vessel_name(player.nation[0], vessel_type, pennant),
+        pennant))
+    return OK
+
+
+def check_deployment(player: Player, abbrev: str, pennant: int,
+                     coordinate: Tuple[str, str], direction: str) -> int:
+    """
+    Returns OK if the vessel can be placed on the player's personal grid, or
+    the result code explaining why not.
+
+    Parameter(s):
+     - player: The player placing the vessel
+     - abbrev: The class abbreviation of the vessel
+     - pennant: The pennant number of the vessel
+     - coordinate: The coordinate of the bow of the vessel
+     - direction: The direction the vessel faces
+    """
+    if player.vessels.get(abbrev, pennant) is None:
+        return INVALID_VESSEL
+    elif not is_valid(coordinate[0], coordinate[1]):
+        return INVALID_COORDINATE
+    elif direction not in ('N', 'S', 'E', 'W'):
+        return INVALID_DIRECTION
+    elif player.vessels.status_of(abbrev, pennant) != PORT:
+        return INVALID_VESSEL
+
+    vessel = player.vessels.get(abbrev, pennant)
+    if not player.personal.check_placement(vessel.length, direction,
+                                           coordinate):
+        return INVALID_NODES
+    return OK
+
+
+def deploy(player: Player, abbrev: str, pennant: int,
+           coordinate: Tuple[str, str], direction: str) -> int:
+    """
+    Places a vessel from port on the player's personal grid. Returns OK, or the
+    result code explaining why the vessel could not be placed.
+
+    Parameter(s):
+     - player: The player placing the vessel
+     - abbrev: The class abbreviation of the vessel
+     - pennant: The pennant number of the vessel
+     - coordinate: The coordinate of the bow of the vessel
+     - direction: The direction the vessel faces
+    """
+    result = check_deployment(player, abbrev, pennant, coordinate, direction)
+    if result == OK:
+        player.place_vessel(abbrev, pennant, coordinate, direction)
+    return result
+
+
+def withdraw(player: Player, abbrev: str, pennant: int) -> int:
+    """
+    Removes a vessel from the player's personal grid and returns it to port.
+    Returns OK, or INVALID_VESSEL if the vessel is not on the grid.
+
+    Parameter(s):
+     - player: The player removing the vessel
+     - abbrev: The class abbreviation of the vessel
+     - pennant: The pennant number of the vessel
+    """
+    if player.vessels.status_of(abbrev, pennant) != DEPLOYED:
+        return INVALID_VESSEL
+    player.remove_vessel(abbrev, pennant)
+    return OK
+
+
+def deploy_randomly(player: Player, rng: Random) -> None:
+    """
+    Places every vessel the player has in port at a random position on their
+    personal grid.
+
+    Parameter(s):
+     - player: The player whose fleet is being placed
+     - rng: The random number generator used
+    """
+    for vessel in [vessel for lst in player.fleet for vessel in lst]:
+        while True:
+            coordinate = rng.choice(COORDINATES)
+            direction = rng.choice('NSEW')
+            if player.personal.check_placement(vessel.length, direction,
+                                               coordinate):
+                break
+        player.place_vessel(vessel.abbrev, vessel.pennant, coordinate,
+                            direction)
+
+
+# Orders -----------------------------------------------------------------------
+def check_order(game: BattleshipGame, coordinate: Tuple[str, str]) -> int:
+    """
+    Returns OK if the current player can add an order targeting the
+    coordinate, or the result code explaining why not.
+
+    Parameter(s):
+     - game: The current game taking place
+     - coordinate: The coordinate being targeted (col, row)
+    """
+    if not is_valid(coordinate[0], coordinate[1]):
+        return INVALID_COORDINATE
+    elif len(game.current_orders) == game.current_player.battle_total:
+        return MAX_ORDERS
+
+    # Nodes already targeted by an order are marked on the traditional grid
+    row, col = to_index(coordinate)
+    node = game.current_player.traditional.grid[row][col]
+    if node.state == TARGETED:
+        return INVALID_ORDER
+    elif node.hit:
+        return INVALID_COORDINATE
+    return OK
+
+
+def add_order(game: BattleshipGame, coordinate: Tuple[str, str]) -> None:
+    """
+    Adds an order to the current player's orders. The order must be valid;
+    see check_order().
+
+    Parameter(s):
+     - game: The current game taking place
+     - coordinate: The coordinate being targeted (col, row)
+    """
+    order_id = len(game.current_orders) + 1
+    game.current_orders.append(TraditionalOrder(order_id, coordinate))
+
+    # Change grid characteristics
+    row, col = to_index(coordinate)
+    game.current_player.traditional.grid[row][col].target_and_drop()
+
+
+def remove_order(game: BattleshipGame, order_id: int) -> int:
+    """
+    Removes an order from the current player's orders and renumbers the orders
+    after it. Returns OK, or INVALID_ORDER if the order does not exist.
+
+    Parameter(s):
+     - game: The current game taking place
+     - order_id: The number of the order being removed, starting at 1
+    """
+    if not 1 <= order_id <= len(game.current_orders):
+        return INVALID_ORDER
+
+    order = game.current_orders.pop(order_id - 1)
+    for i in range(order_id - 1, len(game.current_orders)):
+        game.current_orders[i].order_id -= 1
+
+    # Adjust grid node
+    row, col = to_index(order.coordinate)
+    game.current_player.traditional.grid[row][col].not_target_and_drop()
+    return OK
+
+
+def submit_orders(game: BattleshipGame,
+                  coordinates: Iterable[Tuple[str, str]]) -> int:
+    """
+    Adds an order for every coordinate to the current player's orders. Returns
+    OK, or the result code of the first invalid order, in which case none of
+    the orders are added.
+
+    Parameter(s):
+     - game: The current game taking place
+     - coordinates: The coordinates being targeted (col, row)
+    """
+    added = 0
+    for coordinate in coordinates:
+        result = check_order(game, coordinate)
+        if result != OK:
+            for _ in range(added):
+                remove_order(game, len(game.current_orders))
+            return result
+        add_order(game, coordinate)
+        added += 1
+    return OK
+
+
+def legal_targets(game: BattleshipGame) -> List[Tuple[str, str]]:
+    """
+    Returns every coordinate the current player could still add an order for.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    nodes = game.current_player.traditional.nodes
+    return [COORDINATES[cell] for cell, node in enumerate(nodes)
+            if node.state in OPEN_STATES]
+
+
+# Turns ------------------------------------------------------------------------
+def step(game: BattleshipGame) -> Optional[Player]:
+    """
+    Resolves the current player's orders, ends their turn and returns the
+    winner, or None if the game is not over.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    end_turn(game)
+    return winner(game)
+
+
+def forfeit(game: BattleshipGame) -> Player:
+    """
+    The current player forfeits the game. Returns the winner.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    game.current_player.forfeit = True
+    return winner(game)
+
+
+def winner(game: BattleshipGame) -> Optional[Player]:
+    """
+    Returns the winner of the game, or None if the game is not over.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    return game.check_winner()[1]
+
+
+def end_turn(game: BattleshipGame) -> List[Shot]:
+    """
+    Ends the current player's turn and updates all game attributes. Returns
+    the result of every order, in order.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    layer = game.other_player().personal.state_layer()
+    if layer is None:
+        shots = [_resolve_order(game, order) for order in game.current_orders]
+    else:
+        shots = _resolve_salvo(game, layer)
+    _next_turn(game)
+    return shots
+
+
+def apply_shots(game: BattleshipGame, shots: Iterable[Shot]) -> None:
+    """
+    Ends the current player's turn from the results of their orders, exactly
+    like end_turn(), for copies of a game that do not know where the enemy
+    vessels are, such as a LAN player's; enemy vessels are placed on the
+    enemy's personal grid once sunk. Raises ValueError if a vessel hit is not
+    in the enemy fleet.
+
+    Parameter(s):
+     - game: The current game taking place
+     - shots: The result of every order of the current player, in order
+    """
+    traditional_grid = game.current_player.traditional
+    enemy = game.other_player()
+    for cell, outcome, abbrev, pennant, bow in shots:
+        t_node = traditional_grid.nodes[cell]
+        p_node = enemy.personal.nodes[cell]
+        if outcome == MISSED:
+            p_node.miss()
+            t_node.miss()
+            continue
+
+        vessel = enemy.vessels.get(abbrev, pennant)
+        if vessel is None or enemy.vessels.status_of(abbrev,
+                                                     pennant) != DEPLOYED:
+            raise ValueError(f'Not an enemy vessel afloat: {abbrev} {pennant}')
+        if bow is not None and vessel.cells is None:
+            enemy.personal.add_vessel(vessel, bow[0], bow[1])
+            vessel.bow = bow
+        _vessel_hit(game, t_node, p_node, vessel, vessel.hp == 1)
+    _next_turn(game)
+
+
+def _next_turn(game: BattleshipGame) -> None:
+    """
+    Clears the current player's orders, drops the node changes no snapshot
+    needs and gives the turn to the other player.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    game.current_orders = []
+    game.trim_journals()
+
+    # Switch current player
+    game.current_player = game.other_player()
+    if game.current_player == game.player1:
+        game.current_turn_number += 1
+
+
+def _resolve_order(game: BattleshipGame, order: TraditionalOrder) -> Shot:
+    """
+    Resolves a single order of the current player's salvo and returns its
+    result.
+
+    Parameter(s):
+     - game: The current game taking place
+     - order: The order being resolved
+    """
+    # Get affected node
+    row, col = to_index(order.coordinate)
+    t_node = game.current_player.traditional.grid[row][col]
+    p_node = game.other_player().personal.grid[row][col]
+    vessel = p_node.vessel
+
+    # If vessel is located at the node
+    if p_node.occupied:
+        _vessel_hit(game, t_node, p_node, vessel, vessel.hp == 1)
+    else:  # Node is empty
+        p_node.miss()
+        t_node.miss()
+    return _shot(t_node, vessel)
+
+
+def _resolve_salvo(game: BattleshipGame, layer: GridState) -> List[Shot]:
+    """
+    Resolves all orders of the current player's salvo using the NumPy state
+    layer of the enemy's personal grid to find the vessel hit by every order
+    and the vessels sunk at once, then updates the nodes, vessels and Activity
+    Log in order, exactly like resolving the orders one at a time. Returns the
+    result of every order.
+
+    Parameter(s):
+     - game: The current game taking place
+     - layer: The state layer of the enemy's personal grid
+    """
+    indices = [to_index(order.coordinate) for order in game.current_orders]
+    rows = [row for row, _ in indices]
+    cols = [col for _, col in indices]
+    _, ids, sunk = layer.resolve_salvo(rows, cols)
+    ids = ids.tolist()
+
+    # The last order hitting each vessel sunk is the one that sinks it
+    sinking = {}
+    for index, vessel_id in enumerate(ids):
+        if vessel_id >= 0:
+            sinking[vessel_id] = index
+    sinks = {sinking[vessel_id] for vessel_id in sunk.tolist()}
+
+    traditional_grid = game.current_player.traditional
+    personal_grid = game.other_player().personal
+    shots = []
+    for index, (row, col, vessel_id) in enumerate(zip(rows, cols, ids)):
+        t_node = traditional_grid.grid[row][col]
+        p_node = personal_grid.grid[row][col]
+
+        if vessel_id >= 0:
+            vessel = layer.vessels[vessel_id]
+            _vessel_hit(game, t_node, p_node, vessel, index in sinks)
+        else:  # Node is empty
+            vessel = None
+            p_node.miss()
+            t_node.miss()
+        shots.append(_shot(t_node, vessel))
+    return shots
+
+
+def _shot(t_node: Node, vessel: Optional[TraditionalVessel]) -> Shot:
+    """
+    Returns the result of an order that was just resolved.
+
+    Parameter(s):
+     - t_node: The node targeted on the current player's traditional grid
+     - vessel: The vessel at the node, if any
+    """
+    if vessel is None:
+        return t_node.cell, t_node.state, '', 0, None
+    return t_node.cell, t_node.state, vessel.abbrev, vessel.pennant, \
+        vessel.bow if vessel.sunk else None
+
+
+def _vessel_hit(game: BattleshipGame, t_node: Node, p_node: Node,
+                vessel: TraditionalVessel, sinks: bool) -> None:
+    """
+    Updates the nodes, vessel and Activity Log when an order hits a vessel.
+
+    Parameter(s):
+     - game: The current game taking place
+     - t_node: The node hit on the current player's traditional grid
+     - p_node: The node hit on the enemy's personal grid
+     - vessel: The enemy vessel hit
+     - sinks: Whether the order sinks the vessel
+
+    Precondition(s):
+     - sinks if and only if the vessel has 1 hp left
+    """
+    vessel.hp -= 1
+    vessel.hits_received += 1
+
+    # Vessel destroyed by this order
+    if sinks:
+        game.enemy_sunk(vessel, game.other_player())
+        return
+
+    # Vessel still functional; change grid icons and node attributes
+    p_node.personal_damaged()
+    t_node.damaged()
+    vessel.hit = True
+    vessel.update_health_color()
+
+    # Create Activity log message
+    game.log.ally_hit(vessel, game.other_player().number, p_node,
+                      game.current_turn_number)
+    game.log.enemy_hit(vessel, game.current_player.number, p_node,
+                       game.current_turn_number)
@@ -0,0 +1,169 @@
+"""
+Fleet.py
+
+PURPOSE:
+Creates the vessel registry that keeps track of every vessel a player owns,
+keyed by (class, pennant number), and whether each vessel is in port, deployed
+in the current battle, or sunk. Looking up, moving and counting vessels never
+has to search through the fleet.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple, Optional
+from Objects.Vessels.Vessel import TraditionalVessel
+
+# Vessel statuses
+PORT = 0
+DEPLOYED = 1
+SUNK = 2
+
+# Vessel class abbreviations, in the order vessel lists are kept
+CLASSES = ('BB', 'CC', 'DD', 'FF', 'SM', 'CV')
+CLASS_INDEX = {abbrev: i for i, abbrev in enumerate(CLASSES)}
+
+
+class Fleet:
+    """
+    A registry of all vessels owned by a player.
+
+    Attribute(s):
+     - vessels: Every vessel, keyed by (class abbreviation, pennant number)
+     - status: The status of every vessel, keyed like vessels
+     - groups: The vessels of each status and class, keyed by pennant number
+       and kept in the order they were moved there; groups[status][class]
+    """
+    vessels: Dict[Tuple[str, int], TraditionalVessel]
+    status: Dict[Tuple[str, int], int]
+    groups: List[List[Dict[int, TraditionalVessel]]]
+
+    def __init__(self) -> None:
+        """Initializes a new, empty Fleet."""
+        self.vessels = {}
+        self.status = {}
+        self.groups = [[{} for _ in CLASSES] for _ in (PORT, DEPLOYED, SUNK)]
+
+    def __copy__(self) -> Fleet:
+        """Returns a complete copy of the fleet, including every vessel."""
+        ret = Fleet()
+        for key, vessel in self.vessels.items():
+            ret.vessels[key] = vessel.__copy__()
+        ret.status = self.status.copy()
+        ret.groups = [[{pennant: ret.vessels[(CLASSES[i], pennant)]
+                        for pennant in group}
+                       for i, group in enumerate(status)]
+                      for status in self.groups]
+        return ret
+
+    def __len__(self) -> int:
+        return len(self.vessels)
+
+    # Snapshots ----------------------------------------------------------------
+    def snapshot(self) -> Tuple[dict, dict, list]:
+        """
+        Returns a snapshot of which vessels are owned and where they are. The
+        vessels themselves are shared, not copied.
+        """
+        return self.vessels.copy(), self.status.copy(), \
+            [[group.copy() for group in status] for status in self.groups]
+
+    def restore(self, snapshot: Tuple[dict, dict, list]) -> None:
+        """
+        Restores the fleet to a snapshot. The snapshot can be restored again
+        afterwards.
+
+        Parameter(s):
+         - snapshot: A snapshot previously returned by snapshot()
+        """
+        vessels, status, groups = snapshot
+        self.vessels = vessels.copy()
+        self.status = status.copy()
+        self.groups = [[group.copy() for group in lst] for lst in groups]
+
+    # Registry -----------------------------------------------------------------
+    def add(self, vessel: TraditionalVessel) -> None:
+        """
+        Adds a new vessel to the fleet, in port. Raises ValueError if the
+        fleet already has a vessel of the same class and pennant number.
+
+        Parameter(s):
+         - vessel: The vessel being added
+        """
+        key = (vessel.abbrev, vessel.pennant)
+        if key in self.vessels:
+            raise ValueError(f'{vessel.abbrev} {vessel.pennant} is already in '
+                             f'the fleet')
+        self.vessels[key] = vessel
+        self.status[key] = PORT
+        self.groups[PORT][CLASS_INDEX[vessel.abbrev]][vessel.pennant] = vessel
+
+    def get(self, abbrev: str, pennant: int) -> Optional[TraditionalVessel]:
+        """
+        Returns the vessel with the specified class and pennant number, if the
+        player owns it.
+
+        Parameter(s):
+         - abbrev: The class abbreviation of the vessel
+         - pennant: The pennant number of the vessel
+        """
+        return self.vessels.get((abbrev, pennant))
+
+    def status_of(self, abbrev: str, pennant: int) -> Optional[int]:
+        """
+        Returns the status of the vessel with the specified class and pennant
+        number, or None if the player does not own it.
+
+        Parameter(s):
+         - abbrev: The class abbreviation of the vessel
+         - pennant: The pennant number of the vessel
+        """
+        return self.status.get((abbrev, pennant))
+
+    def move(self, abbrev: str, pennant: int, status: int) \
+            -> TraditionalVessel:
+        """
+        Changes the status of a vessel and returns it.
+
+        Parameter(s):
+         - abbrev: The class abbreviation of the vessel
+         - pennant: The pennant number of the vessel
+         - status: The new status of the vessel
+        """
+        key = (abbrev, pennant)
+        index = CLASS_INDEX[abbrev]
+        vessel = self.groups[self.status[key]][index].pop(pennant)
+        self.groups[status][index][pennant] = vessel
+        self.status[key] = status
+        return vessel
+
+    # Lists and counts ---------------------------------------------------------
+    def vessels_in(self, status: int, index: int) -> List[TraditionalVessel]:
+        """
+        Returns the vessels of a class with the specified status.
+
+        Parameter(s):
+         - status: PORT, DEPLOYED or SUNK
+         - index: The index of the vessel class in CLASSES
+        """
+        return list(self.groups[status][index].values())
+
+    def pennants_in(self, status: int, index: int) -> List[int]:
+        """
+        Returns the pennant numbers of a class with the specified status.
+
+        Parameter(s):
+         - status: PORT, DEPLOYED or SUNK
+         - index: The index of the vessel class in CLASSES
+        """
+        return list(self.groups[status][index])
+
+    def count(self, status: int, index: Optional[int] = None) -> int:
+        """
+        Returns the number of vessels with the specified status, of one class
+        or of all classes.
+
+        Parameter(s):
+         - status: PORT, DEPLOYED or SUNK
+         - index: The index of the vessel class in CLASSES, None for all
+        """
+        if index is None:
+            return sum([len(group) for group in self.groups[status]])
+        return len(self.groups[status][index])
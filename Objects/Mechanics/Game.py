@@ -9,7 +9,9 @@ from typing import List, Tuple, Optional
 from Objects.Vessels.Vessel import TraditionalVessel
 from Objects.Mechanics.ActivityLog import TraditionalLog
 from Objects.Mechanics.Order import TraditionalOrder
-from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Fleet import DEPLOYED, SUNK
+from Objects.Mechanics.Player import Player, PlayerSnapshot
+from Objects.Mechanics.Zobrist import PLAYER_KEY, turn_key, rotate
 
 
 class BattleshipGame:
@@ -24,8 +26,10 @@ class BattleshipGame:
      - current_player: The player who is currently having their turn
      - current_turn_number: The current turn number
 
-     - player1_backup: A copy of player1 before major changes occur
-     - player2_backup: A copy of player2 before major changes occur
+     - player1_backup: A snapshot of player1 before major changes occur, until
+       the first turn ends
+     - player2_backup: A snapshot of player2 before major changes occur, until
+       the first turn ends
 
      - battles: The number of battles that need to be played
      - current_battle: The current battle number that is being played
@@ -33,14 +37,21 @@ class BattleshipGame:
      - nations_joined: List of currently joined nations in this game
      - log: The Activity Log with all important information for each player
      - current_orders: List of orders the current player is planning
+
+     - turn_zobrist: The Zobrist hash of the current player and turn number,
+       kept up-to-date whenever either changes
+
+    Property(s):
+     - zobrist: The 64-bit Zobrist hash of the whole game; the grids of both
+       players, the current player and the turn number
     """
     player1: Player
     player2: Player
-    current_player: Player
-    current_turn_number: int
+    _current_player: Player
+    _current_turn_number: int
 
-    player1_backup: Player
-    player2_backup: Player
+    player1_backup: Optional[PlayerSnapshot]
+    player2_backup: Optional[PlayerSnapshot]
 
     battles: int
     current_battle: int
@@ -48,15 +59,18 @@ class BattleshipGame:
     log: TraditionalLog
     current_orders: List[TraditionalOrder]
 
+    turn_zobrist: int
+
     def __init__(self, p1: Player, p2: Player, battles: int) -> None:
         """Initializes a new game of Battleship."""
         self.player1 = p1
         self.player2 = p2
-        self.current_player = self.player1
-        self.current_turn_number = 1
+        self._current_player = self.player1
+        self._current_turn_number = 1
+        self.turn_zobrist = turn_key(1)
 
-        self.player1_backup = self.player1.__copy__()
-        self.player2_backup = self.player2.__copy__()
+        self.player1_backup = self.player1.snapshot()
+        self.player2_backup = self.player2.snapshot()
 
         self.battles = battles
         self.current_battle = 1
@@ -64,22 +78,82 @@ class BattleshipGame:
         self.log = TraditionalLog()
         self.current_orders = []
 
+    # Properties ---------------------------------------------------------------
+    @property
+    def current_player(self) -> Player:
+        return self._current_player
+
+    @current_player.setter
+    def current_player(self, player: Player) -> None:
+        if (player is self.player2) != (self._current_player is self.player2):
+            self.turn_zobrist ^= PLAYER_KEY
+        self._current_player = player
+
+    @property
+    def current_turn_number(self) -> int:
+        return self._current_turn_number
+
+    @current_turn_number.setter
+    def current_turn_number(self, turn: int) -> None:
+        self.turn_zobrist ^= turn_key(self._current_turn_number) ^ \
+            turn_key(turn)
+        self._current_turn_number = turn
+
+    @property
+    def zobrist(self) -> int:
+        # Both players' grids use the same keys, so each grid is rotated by a
+        # different amount to keep them from cancelling each other out
+        return self.turn_zobrist ^ \
+            self.player1.personal.zobrist ^ \
+            rotate(self.player1.traditional.zobrist, 16) ^ \
+            rotate(self.player2.personal.zobrist, 32) ^ \
+            rotate(self.player2.traditional.zobrist, 48)
+
     # Player related methods
     def reset_p1(self) -> None:
-        """Resets Player 1 by making it a copy of Player 1's backup."""
-        self.player1 = self.player1_backup.__copy__()
+        """
+        Resets Player 1, in place, to Player 1's backup.
+
+        Precondition(s):
+         - The first turn has not ended
+        """
+        self.player1.restore(self.player1_backup)
 
     def reset_p2(self) -> None:
-        """Resets Player 2 by making it a copy of Player 2's backup."""
-        self.player2 = self.player2_backup.__copy__()
+        """
+        Resets Player 2, in place, to Player 2's backup.
+
+        Precondition(s):
+         - The first turn has not ended
+        """
+        self.player2.restore(self.player2_backup)
 
     def update_p1_backup(self) -> None:
         """Brings Player 1's backup up-to-date."""
-        self.player1_backup = self.player1.__copy__()
+        if self.player1_backup is not None:
+            self.player1_backup.release(self.player1)
+        self.player1_backup = self.player1.snapshot()
 
     def update_p2_backup(self) -> None:
         """Brings Player 2's backup up-to-date."""
-        self.player2_backup = self.player2.__copy__()
+        if self.player2_backup is not None:
+            self.player2_backup.release(self.player2)
+        self.player2_backup = self.player2.snapshot()
+
+    def trim_journals(self) -> None:
+        """
+        Releases both backups, which are only needed while setting up, and
+        drops every node change of every grid that no snapshot still needs.
+        """
+        if self.player1_backup is not None:
+            self.player1_backup.release(self.player1)
+            self.player1_backup = None
+        if self.player2_backup is not None:
+            self.player2_backup.release(self.player2)
+            self.player2_backup = None
+        for player in (self.player1, self.player2):
+            player.personal.trim()
+            player.traditional.trim()
 
     def check_winner(self) -> Tuple[bool, Optional[Player]]:
         """Checks to see if a winner is found."""
@@ -115,25 +189,14 @@ class BattleshipGame:
         vessel.update_health_color()
 
         # Change player attributes
-        ves_dict = {'BB': player.bb_curr, 'CC': player.cc_curr,
-                    'DD': player.dd_curr, 'FF': player.ff_curr,
-                    'SM': player.sm_curr, 'CV': player.cv_curr}
-        index_dict = {'BB': 0, 'CC': 1, 'DD': 2, 'FF': 3, 'SM': 4, 'CV': 5}
-
-        index = index_dict[vessel.abbrev]
-        vessel_lst = ves_dict[vessel.abbrev]
-
-        for i, ves in enumerate(vessel_lst):
-            if ves.pennant == vessel.pennant:
-                player.battle_sunk[index].append(vessel_lst.pop(i))
-                player.battle_total -= 1
-                player.battle_id[index].remove(ves.pennant)
-
-                # Update Activity Logs
-                self.log.ally_sunk(vessel, self.other_player().number,
-                                   self.current_turn_number)
-                self.log.enemy_sunk(vessel, self.current_player.number,
-                                    self.current_turn_number)
+        if player.vessels.status_of(vessel.abbrev, vessel.pennant) == DEPLOYED:
+            player.vessels.move(vessel.abbrev, vessel.pennant, SUNK)
+
+            # Update Activity Logs
+            self.log.ally_sunk(vessel, self.other_player().number,
+                               self.current_turn_number)
+            self.log.enemy_sunk(vessel, self.current_player.number,
+                                self.current_turn_number)
 
         # Change grid / node attributes
         player.personal.ally_sunk(vessel)
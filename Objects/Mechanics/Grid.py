@@ -5,12 +5,21 @@ PURPOSE:
 Creates the Grid and stores all relevant game information within each node.
 """
 from __future__ import annotations
-from typing import List, Tuple
+from collections import Counter
+from typing import List, Tuple, Optional, Set
 from Settings import ROW_ICON, COL_ICON, ROW_SEP, CORNER, COL_SPACER, COL_SEP, \
     BOW, STERN
-from Objects.Mechanics.Node import Node
+from Objects.Mechanics.Node import Node, OCCUPIED
+from Objects.Mechanics.Coordinate import SIZE, vessel_cells
+from Objects.Mechanics.GridState import GridState, available
+from Objects.Mechanics.Zobrist import NODE_KEYS, STATES
 from Objects.Vessels.Vessel import TraditionalVessel
 
+# Changes to a grid: the packed cell id, state code and glyph (see Node.py) of
+# every node changed. A node's occupied, hit, sign and color all follow from
+# its state and glyph
+Delta = List[Tuple[int, int, Optional[str]]]
+
 
 class Grid:
     """
@@ -18,10 +27,35 @@ class Grid:
 
     Attribute(s):
      - grid: A list of nodes that form the grid
+     - nodes: Every node of the grid, indexed by cell id
      - size: The side length of the grid (all grids are square)
+     - state: The NumPy state layer mirroring the grid, if one was created
+     - journal: The previous state of every node change, oldest first, since
+       the oldest snapshot still held
+     - trimmed: The number of node changes dropped from the front of the
+       journal; positions in the journal count them too
+     - holds: The number of snapshots held at every journal position
+     - zobrist: The 64-bit Zobrist hash of the state of every node, kept
+       up-to-date by every node change (see Zobrist.py)
+
+     - rendered: The rendered string of every row, if rendered before
+     - rendered_mark: The journal position when rows were last rendered
+     - dirty: Cells changed since rows were last rendered but no longer in the
+       journal
     """
     grid: List[List[Node]]
+    nodes: List[Optional[Node]]
     size: int
+    state: Optional[GridState]
+    journal: List[Tuple[Node, int, Optional[str],
+                        Optional[TraditionalVessel]]]
+    trimmed: int
+    holds: Counter
+    zobrist: int
+
+    rendered: Optional[List[str]]
+    rendered_mark: int
+    dirty: Set[int]
 
     def __init__(self, size: int = 36) -> None:
         """
@@ -34,42 +68,213 @@ class Grid:
          - size <= 36
         """
         self.grid = []
+        self.nodes = [None] * (SIZE * SIZE)
         self.size = size
+        self.state = None
+        self.journal = []
+        self.trimmed = 0
+        self.holds = Counter()
+        self.zobrist = 0
+
+        self.rendered = None
+        self.rendered_mark = 0
+        self.dirty = set()
 
         self._create_node()
         self._link_nodes()
 
     def __copy__(self) -> Grid:
-        ret = Grid()
+        ret = Grid(self.size)
         for i in range(len(ret.grid)):
             for j in range(len(ret.grid)):
                 ret.grid[i][j] = self.grid[i][j].__copy__()
+                ret.grid[i][j].grid = ret
+                ret.nodes[ret.grid[i][j].cell] = ret.grid[i][j]
         ret._link_nodes()
+        ret.zobrist = self.zobrist
 
         return ret
 
     def __repr__(self) -> str:
         """Used for printing the personal grid."""
-        ret = ''
-        row = ROW_ICON[36 - self.size::]
-        col = COL_ICON[:self.size]
-
-        # Get each row's representation
-        for i in range(len(row)):
-            temp_row = f'{row[i]} {ROW_SEP} '
-            for j in range(len(col)):
-                temp_row += f'{repr(self.grid[i][j])} '
-            ret += temp_row.rstrip() + f'\n'
+        lines = self.rows()
 
         # Create column header and return
-        ret += f'  {CORNER}' + f'{COL_SPACER}{COL_SEP}' * self.size
+        lines.append(f'  {CORNER}' + f'{COL_SPACER}{COL_SEP}' * self.size)
+        lines.append('    ' + ' '.join(COL_ICON[:self.size]))
 
-        col_header = f'\n    '
-        for i in range(self.size):
-            col_header += f'{COL_ICON[i]} '
-        ret += col_header.rstrip() + f'\n'
+        return '\n'.join(lines) + '\n'
 
-        return ret
+    # Rendering ----------------------------------------------------------------
+    def rows(self) -> List[str]:
+        """
+        Returns the rendered string of every row of the grid, top to bottom.
+        Rows are cached between calls; only rows containing a node that changed
+        since the last call are rendered again.
+        """
+        if self.rendered is None:
+            self.rendered = [self._render_row(i) for i in range(self.size)]
+        else:
+            changed = self.dirty
+            changed.update([cell for cell, _, _
+                            in self.diff(self.rendered_mark)])
+
+            offset = SIZE - self.size
+            for i in {cell // SIZE - offset for cell in changed}:
+                self.rendered[i] = self._render_row(i)
+
+        self.rendered_mark = self.position
+        self.dirty.clear()
+        return self.rendered.copy()
+
+    def _render_row(self, index: int) -> str:
+        """
+        Renders a single row of the grid.
+
+        Parameter(s):
+         - index: The index of the row, 0 being the top row
+        """
+        icon = ROW_ICON[SIZE - self.size + index]
+        return f'{icon} {ROW_SEP} ' + ' '.join(
+            [repr(node) for node in self.grid[index]])
+
+    def state_layer(self) -> Optional[GridState]:
+        """
+        Returns the NumPy state layer of the grid, creating it from the current
+        nodes the first time it is requested. Returns None if NumPy is not
+        installed. Once created, the layer is only kept up-to-date by salvos
+        resolved through it, so it should be requested after grid setup.
+        """
+        if self.state is None and available():
+            self.state = GridState(self)
+        return self.state
+
+    # Snapshots ----------------------------------------------------------------
+    @property
+    def position(self) -> int:
+        """The number of node changes made to the grid so far."""
+        return self.trimmed + len(self.journal)
+
+    def snapshot(self) -> int:
+        """
+        Returns a snapshot of the grid that can later be restored. Taking a
+        snapshot only marks the current position in the change journal, which
+        is kept from then on until the snapshot is released.
+        """
+        position = self.trimmed + len(self.journal)
+        self.holds[position] += 1
+        return position
+
+    def release(self, snapshot: int) -> None:
+        """
+        Releases a snapshot that is no longer needed, so trim() can drop the
+        node changes made since it was taken.
+
+        Parameter(s):
+         - snapshot: A snapshot previously returned by snapshot()
+
+        Precondition(s):
+         - The snapshot has not been released already
+        """
+        holds = self.holds
+        holds[snapshot] -= 1
+        if not holds[snapshot]:
+            del holds[snapshot]
+
+    def trim(self) -> None:
+        """
+        Drops every node change older than the oldest snapshot still held, or
+        the whole journal if none is. Rows changed since they were last
+        rendered are remembered as dirty.
+        """
+        journal = self.journal
+        keep = min(self.holds, default=self.trimmed + len(journal))
+        drop = keep - self.trimmed
+        if drop <= 0:
+            return
+        if self.rendered_mark < keep:
+            self.dirty.update([node.cell for node, *_ in journal[
+                max(0, self.rendered_mark - self.trimmed):drop]])
+            self.rendered_mark = keep
+        del journal[:drop]
+        self.trimmed = keep
+
+    def restore(self, snapshot: int) -> None:
+        """
+        Restores the grid to the state it was in when the snapshot was taken by
+        undoing every node change made since, newest first. The snapshot is
+        still held afterwards.
+
+        Parameter(s):
+         - snapshot: A snapshot previously returned by snapshot()
+
+        Precondition(s):
+         - The snapshot has not been released
+         - The grid has not been restored to an earlier snapshot since
+        """
+        journal = self.journal
+        zobrist = self.zobrist
+        while len(journal) > snapshot - self.trimmed:
+            node, state, node.glyph, node.vessel = journal.pop()
+            index = node.cell * STATES
+            zobrist ^= NODE_KEYS[index + node.state] ^ NODE_KEYS[index + state]
+            node.state = state
+            self.dirty.add(node.cell)
+        self.zobrist = zobrist
+        self.rendered_mark = min(self.rendered_mark, self.position)
+
+        # The state layer no longer mirrors the grid
+        self.state = None
+
+    # Deltas -------------------------------------------------------------------
+    def diff(self, snapshot: int) -> Delta:
+        """
+        Returns every node whose state or glyph is no longer what it was when
+        the snapshot was taken, in the order they were first changed. Only the
+        node changes made since are looked at, so the cost does not depend on
+        the size of the grid; nodes changed and then changed back are left out.
+
+        Parameter(s):
+         - snapshot: A snapshot previously returned by snapshot()
+
+        Precondition(s):
+         - The snapshot has not been released
+         - The grid has not been restored to an earlier snapshot since
+        """
+        before = {}
+        for node, state, glyph, _ in self.journal[snapshot - self.trimmed:]:
+            if node not in before:
+                before[node] = (state, glyph)
+        return [(node.cell, node.state, node.glyph)
+                for node, previous in before.items()
+                if (node.state, node.glyph) != previous]
+
+    def apply(self, delta: Delta) -> None:
+        """
+        Changes nodes to the state and glyph given by a delta, such as one
+        returned by diff() on another grid of the same size. The changes are
+        recorded in the journal like any other, so restore() undoes them.
+        Vessels are not part of a delta; a node keeps its vessel while it stays
+        occupied. Raises ValueError, without changing any node, if the delta
+        makes a node occupied that has no vessel.
+
+        Parameter(s):
+         - delta: The nodes changed
+        """
+        nodes = self.nodes
+        for cell, state, _ in delta:
+            if state >= OCCUPIED and nodes[cell].vessel is None:
+                raise ValueError(f'No vessel to occupy cell {cell}')
+
+        for cell, state, glyph in delta:
+            node = nodes[cell]
+            vessel = node.vessel if state >= OCCUPIED else None
+            node._change(state)
+            node.glyph = glyph
+            node.vessel = vessel
+
+        # The state layer no longer mirrors the grid
+        self.state = None
 
     # Helper functions for __init__
     def _create_node(self) -> None:
@@ -83,6 +288,8 @@ class Grid:
             temp_row = []
             for j in range(len(col)):
                 temp_node = Node(col[j], row[i])
+                temp_node.grid = self
+                self.nodes[temp_node.cell] = temp_node
                 temp_row.append(temp_node)
             self.grid.append(temp_row)
 
@@ -126,51 +333,63 @@ class Grid:
                 except IndexError:
                     node.west = None
 
+    # Queries ------------------------------------------------------------------
+    def node_at(self, cell: int) -> Node:
+        """
+        Returns the node with the specified cell id.
+
+        Parameter(s):
+         - cell: The packed cell id of the node
+        """
+        return self.nodes[cell]
+
+    def vessel_at(self, cell: int) -> Optional[TraditionalVessel]:
+        """
+        Returns the vessel located at the specified cell, if any.
+
+        Parameter(s):
+         - cell: The packed cell id of the node
+        """
+        return self.nodes[cell].vessel
+
+    def check_placement(self, length: int, direction: str,
+                        coordinate: Tuple[str, str]) -> bool:
+        """
+        Checks to see if a vessel can be placed at the coordinate and direction
+        given without leaving the grid or overlapping another vessel.
+
+        Parameter(s):
+         - length: The number of nodes the vessel takes up
+         - direction: The direction the vessel is facing
+         - coordinate: The col and row of the bow
+        """
+        cells = vessel_cells(coordinate, direction, length, self.size)
+        if cells is None:
+            return False
+        for cell in cells:
+            if self.nodes[cell].occupied:
+                return False
+        return True
+
     # Player placement (grid setup) --------------------------------------------
     def add_vessel(self, vessel: TraditionalVessel, coordinate: Tuple[str, str],
                    direction: str) -> None:
         """
         Places a vessel on the grid in the specified direction at the specified
-        node.
+        node and stores the cells it takes up on the vessel.
 
         Parameter(s):
          - vessel: The vessel that is being placed on the grid
          - coordinate: The col and row
          - direction: The direction the bow of the vessel is facing
-         - player_num: The assigned player number
-        """
-        mid = vessel.symbol
-        col = COL_ICON.index(coordinate[0])
-        row = ROW_ICON.index(coordinate[1])
-        leftover = vessel.hp - 1
-
-        node = self.grid[row][col]
-        node.occupy(vessel, BOW[direction])
-
-        if direction == 'N':
-            while leftover > 1:
-                node = node.south
-                node.occupy(vessel, mid)
-                leftover -= 1
-            node.south.occupy(vessel, STERN[direction])
-        elif direction == 'S':
-            while leftover > 1:
-                node = node.north
-                node.occupy(vessel, mid)
-                leftover -= 1
-            node.north.occupy(vessel, STERN[direction])
-        elif direction == 'E':
-            while leftover > 1:
-                node = node.west
-                node.occupy(vessel, mid)
-                leftover -= 1
-            node.west.occupy(vessel, STERN[direction])
-        else:
-            while leftover > 1:
-                node = node.east
-                node.occupy(vessel, mid)
-                leftover -= 1
-                node.east.occupy(vessel, STERN[direction])
+        """
+        cells = vessel_cells(coordinate, direction, vessel.length, self.size)
+        vessel.cells = cells
+
+        self.nodes[cells[0]].occupy(vessel, BOW[direction])
+        for cell in cells[1:-1]:
+            self.nodes[cell].occupy(vessel, vessel.symbol)
+        self.nodes[cells[-1]].occupy(vessel, STERN[direction])
 
     def remove_vessel(self, vessel: TraditionalVessel) -> None:
         """
@@ -179,39 +398,8 @@ class Grid:
         Parameter(s):
          - vessel: The vessel that is being removed from the grid
         """
-        col = COL_ICON.index(vessel.bow[0][0])
-        row = ROW_ICON.index(vessel.bow[0][1])
-
-        leftover = vessel.hp - 1
-        direction = vessel.bow[1]
-
-        node = self.grid[row][col]
-        node.vacant()
-
-        if direction == 'N':
-            while leftover > 1:
-                node = node.south
-                node.vacant()
-                leftover -= 1
-            node.south.vacant()
-        elif direction == 'S':
-            while leftover > 1:
-                node = node.north
-                node.vacant()
-                leftover -= 1
-            node.north.vacant()
-        elif direction == 'E':
-            while leftover > 1:
-                node = node.west
-                node.vacant()
-                leftover -= 1
-            node.west.vacant()
-        else:
-            while leftover > 1:
-                node = node.east
-                node.vacant()
-                leftover -= 1
-            node.east.vacant()
+        for cell in vessel.cells:
+            self.nodes[cell].vacant()
 
     def ally_sunk(self, vessel: TraditionalVessel) -> None:
         """
@@ -221,39 +409,8 @@ class Grid:
         Parameter(s):
          - vessel: The vessel that has been destroyed
         """
-        hp_dict = {'BB': 6, 'CC': 5, 'DD': 4, 'FF': 3, 'SM': 4, 'CV': 5}
-        row = ROW_ICON.index(vessel.bow[0][1])
-        col = COL_ICON.index(vessel.bow[0][0])
-        leftover = hp_dict[vessel.abbrev] - 1
-        direction = vessel.bow[1]
-
-        node = self.grid[row][col]
-        node.personal_destroyed()
-
-        if direction == 'N':
-            while leftover > 1:
-                node = node.south
-                node.personal_destroyed()
-                leftover -= 1
-            node.south.personal_destroyed()
-        elif direction == 'S':
-            while leftover > 1:
-                node = node.north
-                node.personal_destroyed()
-                leftover -= 1
-            node.north.personal_destroyed()
-        elif direction == 'E':
-            while leftover > 1:
-                node = node.west
-                node.personal_destroyed()
-                leftover -= 1
-            node.west.personal_destroyed()
-        else:
-            while leftover > 1:
-                node = node.east
-                node.personal_destroyed()
-                leftover -= 1
-            node.east.personal_destroyed()
+        for cell in vessel.cells:
+            self.nodes[cell].personal_destroyed()
 
     def enemy_sunk(self, vessel: TraditionalVessel) -> None:
         """
@@ -263,36 +420,5 @@ class Grid:
         Parameter(s):
          - vessel: The vessel that has been destroyed
         """
-        hp_dict = {'BB': 6, 'CC': 5, 'DD': 4, 'FF': 3, 'SM': 4, 'CV': 5}
-        row = ROW_ICON.index(vessel.bow[0][1])
-        col = COL_ICON.index(vessel.bow[0][0])
-        leftover = hp_dict[vessel.abbrev] - 1
-        direction = vessel.bow[1]
-
-        node = self.grid[row][col]
-        node.destroyed()
-
-        if direction == 'N':
-            while leftover > 1:
-                node = node.south
-                node.destroyed()
-                leftover -= 1
-            node.south.destroyed()
-        elif direction == 'S':
-            while leftover > 1:
-                node = node.north
-                node.destroyed()
-                leftover -= 1
-            node.north.destroyed()
-        elif direction == 'E':
-            while leftover > 1:
-                node = node.west
-                node.destroyed()
-                leftover -= 1
-            node.west.destroyed()
-        else:
-            while leftover > 1:
-                node = node.east
-                node.destroyed()
-                leftover -= 1
-            node.east.destroyed()
+        for cell in vessel.cells:
+            self.nodes[cell].destroyed()
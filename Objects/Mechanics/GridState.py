@@ -0,0 +1,111 @@
+"""
+GridState.py
+
+PURPOSE:
+Creates an optional NumPy state layer for a Grid. The layer mirrors the personal
+grid as a uint8 array of node states and an int16 array of vessel ids so that a
+whole salvo can be resolved with a single gather / scatter instead of one order
+at a time. NumPy is not required to play; if it is not installed, the layer is
+simply unavailable and the Grid is used on its own.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+from Objects.Vessels.Vessel import TraditionalVessel
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+# Node states stored in the state array
+EMPTY_STATE = 0
+OCCUPIED_STATE = 1
+MISS_STATE = 2
+DAMAGED_STATE = 3
+DESTROYED_STATE = 4
+
+
+def available() -> bool:
+    """Returns whether NumPy is installed and the state layer can be used."""
+    return np is not None
+
+
+class GridState:
+    """
+    The NumPy state layer of a personal Grid.
+
+    Attribute(s):
+     - state: The state of every node, indexed by [row, col]
+     - vessel_id: The id of the vessel at every node, -1 if there is none
+     - vessels: The vessel belonging to each vessel id
+     - hp: The number of undamaged nodes left for each vessel id
+    """
+    state: np.ndarray
+    vessel_id: np.ndarray
+    vessels: List[TraditionalVessel]
+    hp: np.ndarray
+
+    def __init__(self, grid) -> None:
+        """
+        Initializes the state layer from the current nodes of a Grid.
+
+        Parameter(s):
+         - grid: The personal Grid being mirrored
+
+        Precondition(s):
+         - available()
+        """
+        size = grid.size
+        self.state = np.zeros((size, size), dtype=np.uint8)
+        self.vessel_id = np.full((size, size), -1, dtype=np.int16)
+        self.vessels = []
+
+        ids = {}
+        for i, row in enumerate(grid.grid):
+            for j, node in enumerate(row):
+                if node.occupied:
+                    key = id(node.vessel)
+                    if key not in ids:
+                        ids[key] = len(self.vessels)
+                        self.vessels.append(node.vessel)
+                    self.vessel_id[i, j] = ids[key]
+                    self.state[i, j] = OCCUPIED_STATE
+
+        self.hp = np.array([vessel.hp for vessel in self.vessels],
+                           dtype=np.int16)
+
+    def resolve_salvo(self, rows: List[int], cols: List[int]) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resolves every order of a salvo at once and updates the state layer.
+        Returns, in order, whether each order hit a vessel, the vessel id hit by
+        each order (-1 for a miss) and the ids of all vessels sunk by the salvo.
+
+        Parameter(s):
+         - rows: The row index targeted by each order
+         - cols: The col index targeted by each order
+
+        Precondition(s):
+         - No node is targeted twice and no targeted node has been hit before
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+
+        # Gather
+        ids = self.vessel_id[rows, cols]
+        hits = ids >= 0
+
+        # Damage every vessel by the number of orders that landed on it
+        damage = np.bincount(ids[hits], minlength=len(self.vessels))
+        before = self.hp > 0
+        self.hp -= damage.astype(np.int16)
+        sunk = np.flatnonzero(before & (self.hp <= 0))
+
+        # Scatter
+        self.state[rows[hits], cols[hits]] = DAMAGED_STATE
+        self.state[rows[~hits], cols[~hits]] = MISS_STATE
+        if len(sunk):
+            self.state[np.isin(self.vessel_id, sunk)] = DESTROYED_STATE
+
+        return hits, ids, sunk
@@ -0,0 +1,62 @@
+"""
+Names.py
+
+PURPOSE:
+A process-wide registry of vessel names. Each Nations/<nation>/<class>.txt file
+is read at most once, the first time a vessel of that nation and class is
+created, and every name is then looked up by pennant number. Files are found
+relative to this project rather than the current working directory.
+"""
+from pathlib import Path
+from typing import Dict, List, Tuple
+from Settings import PENNANTS, FILE_NAMES
+
+# Directory holding the name files of every nation
+NATIONS_DIR = Path(__file__).resolve().parents[2] / 'Nations'
+
+# Names of every (nation, vessel class), in pennant order
+_NAMES: Dict[Tuple[str, type], List[str]] = {}
+
+
+def vessel_names(nation: str, vessel_type: type) -> List[str]:
+    """
+    Returns the names available to a nation for a vessel class, where the name
+    of pennant number n is at index n - 1.
+
+    Parameter(s):
+     - nation: The nation's abbreviation
+     - vessel_type: The vessel class
+    """
+    key = (nation, vessel_type)
+    try:
+        return _NAMES[key]
+    except KeyError:
+        path = NATIONS_DIR / nation / f'{FILE_NAMES[vessel_type]}.txt'
+        with open(path, 'r', encoding='utf-8') as f:
+            names = [line.strip() for line in f]
+        _NAMES[key] = names[:PENNANTS[nation][vessel_type]]
+        return _NAMES[key]
+
+
+def vessel_name(nation: str, vessel_type: type, pennant: int) -> str:
+    """
+    Returns the name of a vessel.
+
+    Parameter(s):
+     - nation: The nation's abbreviation
+     - vessel_type: The vessel class
+     - pennant: The pennant number of the vessel, starting at 1
+    """
+    return vessel_names(nation, vessel_type)[pennant - 1]
+
+
+def max_pennants(nation: str, vessel_type: type) -> int:
+    """
+    Returns the number of pennant numbers available to a nation for a vessel
+    class. This is Settings.PENNANTS, limited to the names that exist.
+
+    Parameter(s):
+     - nation: The nation's abbreviation
+     - vessel_type: The vessel class
+    """
+    return len(vessel_names(nation, vessel_type))
@@ -6,11 +6,33 @@ Creates the node object for the Grid object. Stores all relevant information
 about vessels.
 """
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Tuple, Dict, TYPE_CHECKING
 from Settings import \
     DEFAULT, GREEN, PURPLE, BLUE, RED, YELLOW, \
     EMPTY, HIT, MISS, DROP
 from Objects.Vessels.Vessel import TraditionalVessel
+from Objects.Mechanics.Coordinate import to_cell
+from Objects.Mechanics.Zobrist import NODE_KEYS, STATES
+if TYPE_CHECKING:
+    from Objects.Mechanics.Grid import Grid
+
+
+# Node state codes
+EMPTY_NODE = 0          # Nothing has happened at the node
+TARGETED = 1            # Targeted by a planned order
+MISSED = 2              # Armament landed in empty water
+DAMAGED = 3             # Enemy vessel damaged (radar / sonar grids)
+DESTROYED = 4           # Enemy vessel destroyed (radar / sonar grids)
+OCCUPIED = 5            # Allied vessel located at the node
+OCCUPIED_DAMAGED = 6    # Allied vessel damaged (personal grids)
+OCCUPIED_DESTROYED = 7  # Allied vessel destroyed (personal grids)
+
+# Sign and color of each state; occupied nodes display the vessel's glyph
+SIGNS = (EMPTY, DROP, MISS, HIT, HIT, None, None, None)
+COLORS = (DEFAULT, PURPLE, BLUE, YELLOW, RED, GREEN, YELLOW, RED)
+
+# Rendered (state, glyph) pairs, filled the first time each pair is displayed
+RENDERED: Dict[Tuple[int, Optional[str]], str] = {}
 
 
 class Node:
@@ -21,32 +43,43 @@ class Node:
     Attribute(s):
      - row: The row the node is in
      - col: The column the node is in
+     - cell: The packed cell id of the node
 
      - north: The node directly north of the current node or None if nonexistent
      - south: The node directly south of the current node or None if nonexistent
      - east: The node directly east of the current node or None if nonexistent
      - west: The node directly west of the current node or None if nonexistent
 
+     - state: The state code of the node; see the state codes above
+     - glyph: The part of the vessel displayed at the node, if occupied
+     - vessel: The vessel that occupies the node, if any
+
+     - grid: The grid the node belongs to, if any
+
+    Property(s):
      - occupied: True if there is a vessel located at the node, False otherwise
      - hit: Whether the node has been hit or not by any armament
      - sign: The relevant symbol; hit, miss, etc.
      - color: The color of the symbol when displayed on the grid
-     - vessel: The vessel that occupies the node, if any
     """
+    __slots__ = ('row', 'col', 'cell', 'north', 'south', 'east', 'west',
+                 'state', 'glyph', 'vessel', 'grid')
+
     row: str
     col: str
+    cell: int
 
     north: Optional[Node]
     south: Optional[Node]
     east: Optional[Node]
     west: Optional[Node]
 
-    occupied: bool
-    hit: bool
-    sign: str
-    color: str
+    state: int
+    glyph: Optional[str]
     vessel: Optional[TraditionalVessel]
 
+    grid: Optional[Grid]
+
     def __init__(self, col: str, row: str) -> None:
         """
         Initiates a new Node object.
@@ -57,26 +90,25 @@ class Node:
         """
         self.row = row
         self.col = col
+        self.cell = to_cell((col, row))
 
         self.north = None
         self.south = None
         self.east = None
         self.west = None
 
-        self.occupied = False
-        self.hit = False
-        self.sign = EMPTY
-        self.color = f'{DEFAULT}'
+        self.state = EMPTY_NODE
+        self.glyph = None
         self.vessel = None
 
+        self.grid = None
+
     def __copy__(self) -> Node:
         """Returns a complete copy of a Node"""
         ret = Node(self.col, self.row)
 
-        ret.occupied = self.occupied
-        ret.hit = self.hit
-        ret.sign = self.sign
-        ret.color = self.color
+        ret.state = self.state
+        ret.glyph = self.glyph
         ret.vessel = self.vessel
 
         return ret
@@ -85,7 +117,47 @@ class Node:
         return f'({self.col}, {self.row})'
 
     def __repr__(self) -> str:
-        return f'{self.color}{self.sign}{DEFAULT}'
+        key = (self.state, self.glyph)
+        try:
+            return RENDERED[key]
+        except KeyError:
+            RENDERED[key] = f'{self.color}{self.sign}{DEFAULT}'
+            return RENDERED[key]
+
+    # Properties ---------------------------------------------------------------
+    @property
+    def occupied(self) -> bool:
+        return self.state >= OCCUPIED
+
+    @property
+    def hit(self) -> bool:
+        return self.state >= MISSED and self.state != OCCUPIED
+
+    @property
+    def sign(self) -> str:
+        return self.glyph if self.state >= OCCUPIED else SIGNS[self.state]
+
+    @property
+    def color(self) -> str:
+        return COLORS[self.state]
+
+    # Change journal -----------------------------------------------------------
+    def _change(self, state: int) -> None:
+        """
+        Records the current state of the node in the grid's change journal so
+        that the change can be undone, brings the grid's hash up-to-date and
+        changes the state of the node.
+
+        Parameter(s):
+         - state: The new state code of the node
+        """
+        grid = self.grid
+        if grid is not None:
+            grid.journal.append((self, self.state, self.glyph, self.vessel))
+            index = self.cell * STATES
+            grid.zobrist ^= NODE_KEYS[index + self.state] ^ \
+                NODE_KEYS[index + state]
+        self.state = state
 
     # Grid setup ---------------------------------------------------------------
     def occupy(self, vessel: TraditionalVessel, sign: str) -> None:
@@ -93,26 +165,18 @@ class Node:
         Changes attributes when vessel occupies the node.
 
         Parameter(s):
-         - vc: The vessel's class abbreviation
-         - v_id: The vessel's pennant number
+         - vessel: The vessel occupying the node
          - sign: The sign that is being displayed at the node
         """
-        self.occupied = True
+        self._change(OCCUPIED)
+        self.glyph = sign
         self.vessel = vessel
-        self.sign = f'{sign}'
-        self.color = f'{GREEN}'
 
     def vacant(self) -> None:
-        """
-        Resets the attributes for a node.
-
-        Parameter(s):
-         - sign: The default sign to use
-        """
-        self.occupied = False
+        """Resets the attributes for a node."""
+        self._change(EMPTY_NODE)
+        self.glyph = None
         self.vessel = None
-        self.sign = EMPTY
-        self.color = f'{DEFAULT}'
 
     # Planning -----------------------------------------------------------------
     def target_and_drop(self) -> None:
@@ -121,43 +185,31 @@ class Node:
         where the armament will "drop" into the water. Applies to only radar and
         sonar grids (or the traditional grid).
         """
-        self.sign = f'{DROP}'
-        self.color = f'{PURPLE}'
+        self._change(TARGETED)
 
     def not_target_and_drop(self, ) -> None:
         """
         Reverses changes caused by method target_and_drop().
         """
-        self.sign = f'{EMPTY}'
-        self.color = f'{DEFAULT}'
+        self._change(EMPTY_NODE)
 
     # After shooting -----------------------------------------------------------
     def miss(self) -> None:
         """Changes sign to miss for all grids."""
-        self.sign = f'{MISS}'
-        self.color = f'{BLUE}'
-        self.hit = True
+        self._change(MISSED)
 
     def damaged(self) -> None:
         """Changes sign to damaged on radar / sonar grids."""
-        self.sign = f'{HIT}'
-        self.color = f'{YELLOW}'
-        self.hit = True
+        self._change(DAMAGED)
 
     def personal_damaged(self) -> None:
         """Changes sign to damaged on personal grids."""
-        self.sign = f'{self.sign}'
-        self.color = f'{YELLOW}'
-        self.hit = True
+        self._change(OCCUPIED_DAMAGED)
 
     def destroyed(self) -> None:
         """Changes sign to destroyed on radar / sonar grids."""
-        self.sign = f'{HIT}'
-        self.color = f'{RED}'
-        self.hit = True
+        self._change(DESTROYED)
 
     def personal_destroyed(self) -> None:
         """Changes sign to destroyed on personal grids."""
-        self.sign = f'{self.sign}'
-        self.color = f'{RED}'
-        self.hit = True
+        self._change(OCCUPIED_DESTROYED)
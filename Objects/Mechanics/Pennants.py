@@ -0,0 +1,89 @@
+"""
+Pennants.py
+
+PURPOSE:
+Creates the pennant pool that hands out unused pennant numbers for one vessel
+class of one player. Pennant numbers are drawn without replacement from a
+shuffled pool, so allocating one never has to retry, and running out of
+pennant numbers fails immediately instead of looping forever. The pool is the
+only record of which pennant numbers are free: specific pennant numbers are
+taken out of it, and pennant numbers no longer in use are returned to it.
+"""
+from __future__ import annotations
+from random import Random
+from typing import List, Optional
+
+
+class PennantPool:
+    """
+    The pennant numbers of a vessel class that are not in use yet.
+
+    Attribute(s):
+     - name: What the pool is for, used in error messages
+     - free: The unused pennant numbers, in random order
+     - rng: The random number generator that keeps the pool shuffled
+    """
+    name: str
+    free: List[int]
+    rng: Random
+
+    def __init__(self, count: int, name: str = 'vessel',
+                 rng: Optional[Random] = None) -> None:
+        """
+        Initializes a new pool with pennant numbers 1 to count.
+
+        Parameter(s):
+         - count: The number of pennant numbers available
+         - name: What the pool is for, used in error messages
+         - rng: The random number generator used to shuffle the pool; a new
+           one if None
+        """
+        self.name = name
+        self.free = list(range(1, count + 1))
+        self.rng = rng or Random()
+        self.rng.shuffle(self.free)
+
+    def __copy__(self) -> PennantPool:
+        """Returns a complete copy of the pool."""
+        ret = PennantPool(0, self.name, self.rng)
+        ret.free = self.free.copy()
+        return ret
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def allocate(self) -> int:
+        """Removes and returns a random unused pennant number."""
+        if not self.free:
+            raise ValueError(f'No {self.name} pennant numbers left')
+        return self.free.pop()
+
+    def take(self, pennant: int) -> None:
+        """
+        Removes a specific pennant number from the pool, such as that of a
+        vessel set up elsewhere. Raises ValueError if it is already in use.
+
+        Parameter(s):
+         - pennant: The pennant number taken
+        """
+        try:
+            self.free.remove(pennant)
+        except ValueError:
+            raise ValueError(f'{self.name} pennant number {pennant} is '
+                             f'already in use') from None
+
+    def release(self, pennant: int) -> None:
+        """
+        Returns a pennant number to the pool so it can be allocated again.
+
+        Parameter(s):
+         - pennant: The pennant number no longer in use
+
+        Precondition(s):
+         - The pennant number is in use and belongs to the pool
+        """
+        # Swap into a random position to keep the pool shuffled
+        free = self.free
+        free.append(pennant)
+        i = self.rng.randrange(len(free))
+        free[i], free[-1] = free[-1], free[i]
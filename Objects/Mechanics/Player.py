@@ -5,11 +5,14 @@ PURPOSE:
 Creates the Players that participate in a game of Battleship.
 """
 from __future__ import annotations
-from typing import Tuple, List
-from random import randint
-from pathlib import Path
-from Settings import NATIONS, PENNANTS, FILE_NAMES
+from random import Random
+from typing import Tuple, List, Optional
+from Settings import NATIONS, FILE_NAMES
 from Objects.Mechanics.Grid import Grid
+from Objects.Mechanics.Fleet import \
+    Fleet, PORT, DEPLOYED, SUNK, CLASS_INDEX
+from Objects.Mechanics.Names import vessel_name, max_pennants
+from Objects.Mechanics.Pennants import PennantPool
 from Objects.Vessels.Vessel import TraditionalVessel
 from Objects.Vessels.Battleship import TraditionalBattleship
 from Objects.Vessels.Cruiser import TraditionalCruiser
@@ -28,9 +31,18 @@ class Player:
      - number: The player number; 0 is CPU, 1 is Player1, 2 is Player2
      - forfeit: Whether the player forfeits or not
 
+     - vessels: The registry of every vessel the player owns, in port, in the
+       current battle, or sunk
+     - pennants: The unused pennant numbers of each vessel class, created
+       when the first vessel of that class is added
+
+     - personal: The Grid that displays all the positions of your own fleet
+     - traditional: The Grid used for the Traditional game mode
+
+    Property(s):
      - fleet: List of all vessels the player currently owns in port
-     - total: The total number of vessels the player owns in port
-     - all_id: List of all vessel pennant numbers in port
+     - total: The total number of vessels the player owns
+     - all_id: List of all vessel pennant numbers the player owns
 
      - battle_total: The total number of vessels currently in the battle
      - battle_id: List of vessel pennant numbers in the current battle
@@ -41,28 +53,14 @@ class Player:
      - sm_curr: List of Submarines being used in the current battle
      - cv_curr: List of Aircraft Carriers being used in the current battle
      - battle_sunk: List of all vessels that were sunk in the current battle
-
-     - personal: The Grid that displays all the positions of your own fleet
-     - traditional: The Grid used for the Traditional game mode
     """
     name: str
     nation: Tuple[str, str]  # name, sign
     number: int
     forfeit: bool
 
-    fleet: List[List[TraditionalVessel]]
-    total: int
-    all_id: List[List[int]]
-
-    battle_total: int
-    battle_id: List[List[int]]
-    bb_curr: List[TraditionalVessel]
-    cc_curr: List[TraditionalVessel]
-    dd_curr: List[TraditionalVessel]
-    ff_curr: List[TraditionalVessel]
-    sm_curr: List[TraditionalVessel]
-    cv_curr: List[TraditionalVessel]
-    battle_sunk: List[List[TraditionalVessel]]
+    vessels: Fleet
+    pennants: List[Optional[PennantPool]]
 
     personal: Grid
     traditional: Grid
@@ -74,62 +72,134 @@ class Player:
         self.number = number
         self.forfeit = False
 
-        self.fleet = [[], [], [], [], [], []]
-        self.total = 0
-        self.all_id = [[], [], [], [], [], []]
-
-        self.battle_total = 0
-        self.battle_id = [[], [], [], [], [], []]
-        self.bb_curr = []
-        self.cc_curr = []
-        self.dd_curr = []
-        self.ff_curr = []
-        self.sm_curr = []
-        self.cv_curr = []
-        self.battle_sunk = [[], [], [], [], [], []]
+        self.vessels = Fleet()
+        self.pennants = [None, None, None, None, None, None]
 
         self.personal = Grid()
         self.traditional = Grid()
 
     def __copy__(self) -> Player:
         """Returns a complete copy of the player."""
-        new_name = self.name.split(' ')
-
-        ret = Player(new_name[1].strip(), self.nation[0], self.number)
-
-        for i in range(len(ret.fleet)):
-            ret.fleet[i] = [vessel_class.__copy__() for
-                            vessel_class in self.fleet[i]]
-        ret.total = self.total
-        ret.all_id = [pennant_lst.copy() for pennant_lst in self.all_id]
-
-        ret.battle_total = self.battle_total
-        ret.battle_id = [pennant_lst.copy() for pennant_lst in self.battle_id]
-        ret.bb_curr = [vessel.__copy__() for vessel in self.bb_curr]
-        ret.cc_curr = [vessel.__copy__() for vessel in self.cc_curr]
-        ret.dd_curr = [vessel.__copy__() for vessel in self.dd_curr]
-        ret.ff_curr = [vessel.__copy__() for vessel in self.ff_curr]
-        ret.sm_curr = [vessel.__copy__() for vessel in self.sm_curr]
-        ret.cv_curr = [vessel.__copy__() for vessel in self.cv_curr]
-        for i in range(len(ret.battle_sunk)):
-            ret.battle_sunk[i] = [vessel_class.__copy__() for
-                                  vessel_class in self.battle_sunk[i]]
+        ret = Player.__new__(Player)
+        ret.name = self.name
+        ret.nation = self.nation
+        ret.number = self.number
+        ret.forfeit = self.forfeit
+
+        ret.vessels = self.vessels.__copy__()
+        ret.pennants = [pool if pool is None else pool.__copy__()
+                        for pool in self.pennants]
 
         ret.personal = self.personal.__copy__()
         ret.traditional = self.traditional.__copy__()
 
         return ret
 
-    def add_vessel(self, vessel_type: type) -> None:
+    # Properties ---------------------------------------------------------------
+    @property
+    def fleet(self) -> List[List[TraditionalVessel]]:
+        return [self.vessels.vessels_in(PORT, i) for i in range(6)]
+
+    @property
+    def total(self) -> int:
+        return len(self.vessels)
+
+    @property
+    def all_id(self) -> List[List[int]]:
+        ret = [[], [], [], [], [], []]
+        for abbrev, pennant in self.vessels.vessels:
+            ret[CLASS_INDEX[abbrev]].append(pennant)
+        return ret
+
+    @property
+    def battle_total(self) -> int:
+        return self.vessels.count(DEPLOYED)
+
+    @property
+    def battle_id(self) -> List[List[int]]:
+        return [self.vessels.pennants_in(DEPLOYED, i) for i in range(6)]
+
+    @property
+    def bb_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 0)
+
+    @property
+    def cc_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 1)
+
+    @property
+    def dd_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 2)
+
+    @property
+    def ff_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 3)
+
+    @property
+    def sm_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 4)
+
+    @property
+    def cv_curr(self) -> List[TraditionalVessel]:
+        return self.vessels.vessels_in(DEPLOYED, 5)
+
+    @property
+    def battle_sunk(self) -> List[List[TraditionalVessel]]:
+        return [self.vessels.vessels_in(SUNK, i) for i in range(6)]
+
+    # Snapshots ----------------------------------------------------------------
+    def snapshot(self) -> PlayerSnapshot:
         """
-        Creates and adds a vessel to the player's fleet.
+        Returns a snapshot of the player that can later be restored. Grids are
+        not copied; only their position in the change journal is kept, and
+        the snapshot must be released once no longer needed.
+        """
+        return PlayerSnapshot(self)
+
+    def restore(self, snapshot: PlayerSnapshot) -> None:
+        """
+        Restores the player, in place, to the state it was in when the snapshot
+        was taken.
+
+        Parameter(s):
+         - snapshot: A snapshot previously returned by snapshot()
+        """
+        snapshot.restore(self)
+
+    def add_vessel(self, vessel_type: type,
+                   rng: Optional[Random] = None) -> None:
+        """
+        Creates and adds a vessel to the player's fleet. Raises ValueError if
+        every pennant number of the vessel class is already in use.
 
         Parameter(s):
          - vessel_type: The vessel class that is to be created
+         - rng: The random number generator the pennant numbers of the class
+           are shuffled with, the first time a vessel of the class is added;
+           a new one if None
+        """
+        # Draw a pennant number that is not already being used
+        line_num = self.pennant_pool(vessel_type, rng).allocate()
+
+        name = vessel_name(self.nation[0], vessel_type, line_num)
+
+        # Update player attributes
+        self.vessels.add(vessel_type(self.nation[0], name, line_num))
+
+    def pennant_pool(self, vessel_type: type,
+                     rng: Optional[Random] = None) -> PennantPool:
+        """
+        Returns the unused pennant numbers of a vessel class, creating them the
+        first time they are needed.
+
+        Parameter(s):
+         - vessel_type: The vessel class
+         - rng: The random number generator the pennant numbers are shuffled
+           with, if they are created; a new one if None
         """
         # Helper function
         def select_id() -> int:
-            """Returns correct index for all_id based on vessel class."""
+            """Returns the index of the vessel class in vessel lists."""
             if vessel_type is TraditionalBattleship:
                 return 0
             elif vessel_type is TraditionalCruiser:
@@ -142,37 +212,13 @@ class Player:
                 return 4
             return 5
 
-        def read_line(filepath: str, line: int) -> str:
-            """
-            Reads the specified line of a file.
-
-            Parameter(s):
-             - filepath: The specified file path
-             - line: The line number to read
-            """
-            with open(filepath, 'r') as f:
-                for i, text_line in enumerate(f):
-                    if i + 1 == line:
-                        return text_line
-
         # ----------------------------------------------------------------------
-        # Check that name is not already being used
-        max_pennants = PENNANTS[self.nation[0]][vessel_type]
         index = select_id()
-
-        line_num = randint(1, max_pennants)
-        while line_num in self.all_id[index]:
-            line_num = randint(1, max_pennants)
-
-        file_path = str(Path().absolute()) + f'/Nations/{self.nation[0]}/' \
-                                             f'{FILE_NAMES[vessel_type]}.txt'
-        vessel_name = read_line(file_path, line_num).strip()
-
-        # Update player attributes
-        self.fleet[index].append(
-            vessel_type(self.nation[0], vessel_name, line_num))
-        self.all_id[index].append(line_num)
-        self.total += 1
+        if self.pennants[index] is None:
+            self.pennants[index] = PennantPool(
+                max_pennants(self.nation[0], vessel_type),
+                f'{self.nation[0]} {FILE_NAMES[vessel_type].upper()}', rng)
+        return self.pennants[index]
 
     def place_vessel(self, vessel_type: str, pennant: int,
                      coordinate: Tuple[str, str], direction: str) -> None:
@@ -186,20 +232,10 @@ class Player:
          - direction: The direction the vessel faces
          - coordinate: The coordinate the bow of the vessel is located
         """
-        id_dict = {'BB': 0, 'CC': 1, 'DD': 2, 'FF': 3, 'SM': 4, 'CV': 5}
-        fleet_dict = {'BB': self.bb_curr, 'CC': self.cc_curr,
-                      'DD': self.dd_curr, 'FF': self.ff_curr,
-                      'SM': self.sm_curr, 'CV': self.cv_curr}
-
-        for i, vessel in enumerate(self.fleet[id_dict[vessel_type]]):
-            if vessel.pennant == pennant:
-                self.personal.add_vessel(vessel, coordinate, direction)
-
-                vessel.bow = (coordinate, direction)
-                fleet_dict[vessel_type].append(
-                    self.fleet[id_dict[vessel_type]].pop(i))
-                self.battle_id[id_dict[vessel_type]].append(pennant)
-                self.battle_total += 1
+        if self.vessels.status_of(vessel_type, pennant) == PORT:
+            vessel = self.vessels.move(vessel_type, pennant, DEPLOYED)
+            self.personal.add_vessel(vessel, coordinate, direction)
+            vessel.bow = (coordinate, direction)
 
     def remove_vessel(self, vessel_type: str, pennant: int) -> None:
         """
@@ -210,17 +246,85 @@ class Player:
         - vessel_type: The class of the vessel
         - pennant: The id number of the vessel
         """
-        id_dict = {'BB': 0, 'CC': 1, 'DD': 2, 'FF': 3, 'SM': 4, 'CV': 5}
-        fleet_dict = {'BB': self.bb_curr, 'CC': self.cc_curr,
-                      'DD': self.dd_curr, 'FF': self.ff_curr,
-                      'SM': self.sm_curr, 'CV': self.cv_curr}
+        if self.vessels.status_of(vessel_type, pennant) == DEPLOYED:
+            vessel = self.vessels.move(vessel_type, pennant, PORT)
+            self.personal.remove_vessel(vessel)
+            vessel.bow = None
+            vessel.cells = None
+
+
+class PlayerSnapshot:
+    """
+    A snapshot of a Player taken before major changes occur. The vessel
+    registry is saved without copying vessels and vessel attributes are saved
+    separately, while grids are restored by undoing the nodes changed since the
+    snapshot.
+
+    Attribute(s):
+     - forfeit: Whether the player forfeits or not
+     - fleet: The snapshot of the player's vessel registry
+     - pennants: Copies of the player's pennant pools
+     - vessels: The vessel and its changeable attributes, for every vessel
+     - personal: The snapshot of the personal Grid
+     - traditional: The snapshot of the traditional Grid
+    """
+    forfeit: bool
+    fleet: tuple
+    pennants: List[Optional[PennantPool]]
+    vessels: List[Tuple[TraditionalVessel, tuple]]
+    personal: int
+    traditional: int
+
+    def __init__(self, player: Player) -> None:
+        """
+        Takes a new snapshot of the player.
 
-        for i, vessel in enumerate(fleet_dict[vessel_type]):
-            if vessel.pennant == pennant:
-                self.personal.remove_vessel(vessel)
+        Parameter(s):
+         - player: The player being saved
+        """
+        self.forfeit = player.forfeit
+        self.fleet = player.vessels.snapshot()
+        self.pennants = [pool if pool is None else pool.__copy__()
+                         for pool in player.pennants]
+
+        self.vessels = []
+        for vessel in player.vessels.vessels.values():
+            self.vessels.append((vessel, (
+                vessel.bow, vessel.cells, vessel.hp, vessel.hits_received,
+                vessel.health_color, vessel.enemy_hp_color, vessel.hit,
+                vessel.sunk)))
+
+        self.personal = player.personal.snapshot()
+        self.traditional = player.traditional.snapshot()
+
+    def restore(self, player: Player) -> None:
+        """
+        Restores the player to the state saved in this snapshot. The snapshot
+        can be restored again afterwards.
 
-                popped = fleet_dict[vessel_type].pop(i)
-                self.fleet[id_dict[vessel_type]].append(popped)
-                self.battle_id[id_dict[vessel_type]].remove(pennant)
-                self.battle_total -= 1
-                vessel.bow = None
+        Parameter(s):
+         - player: The player that the snapshot was taken of
+        """
+        player.forfeit = self.forfeit
+        player.vessels.restore(self.fleet)
+        player.pennants = [pool if pool is None else pool.__copy__()
+                           for pool in self.pennants]
+
+        for vessel, state in self.vessels:
+            vessel.bow, vessel.cells, vessel.hp, vessel.hits_received, \
+                vessel.health_color, vessel.enemy_hp_color, vessel.hit, \
+                vessel.sunk = state
+
+        player.personal.restore(self.personal)
+        player.traditional.restore(self.traditional)
+
+    def release(self, player: Player) -> None:
+        """
+        Releases the grid snapshots kept, so the grids can drop the node
+        changes made since. The snapshot cannot be restored afterwards.
+
+        Parameter(s):
+         - player: The player that the snapshot was taken of
+        """
+        player.personal.release(self.personal)
+        player.traditional.release(self.traditional)
@@ -0,0 +1,313 @@
+"""
+Simulator.py
+
+PURPOSE:
+Creates the batched simulator that plays many independent games of Traditional
+Battleship in lock-step. Every game is a row of a few stacked NumPy arrays,
+each turn of every game is resolved together with vectorized operations and
+no Player, Grid or Node objects are created. Games follow the same rules as
+the engine (see Engine.py): a player fires one order per vessel they have
+left, a vessel sinks once every node it occupies has been hit and a player
+loses when their last vessel sinks. Activity Logs are not kept.
+
+Like the state layer in GridState.py, the simulator needs NumPy; available()
+reports whether it can be used.
+"""
+from __future__ import annotations
+from typing import Callable, Optional, Tuple
+from Objects.Mechanics.Coordinate import SIZE, STEPS
+from Objects.Mechanics.Player import Player
+from Objects.Mechanics.Fleet import DEPLOYED, CLASSES
+from Objects.Mechanics.GridState import available
+from Objects.Mechanics.Engine import VESSEL_TYPES
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# The (row, col) step from the bow towards the stern, indexed by direction
+DIRECTIONS = 'NSEW'
+_STEPS = [STEPS[direction] for direction in DIRECTIONS]
+
+
+class BatchSimulator:
+    """
+    Plays many games of Traditional Battleship at once. Array dimensions are
+    [side, game, ...], where side 0 is Player 1 and side 1 is Player 2, and
+    nodes are numbered row * size + col.
+
+    Without a targeting strategy, each side fires at random. Every game then
+    draws a random firing order for each side once and fires at the next nodes
+    in that order every turn, which is the same as picking nodes at random each
+    turn but never has to look at the whole grid again. A targeting strategy is
+    a function strategy(sim, side) that returns a (games, size * size) array of
+    priorities; every turn each game fires at the nodes with the highest
+    priorities that it has not fired at yet.
+
+    Attribute(s):
+     - games: The number of games being played
+     - size: The side length of every grid
+     - lengths: The length of each vessel of a fleet
+     - occupant: The vessel at every node of each personal grid, -1 if none
+     - shot: Whether each side has fired at every node of the enemy's grid
+     - hp: The number of undamaged nodes left for every vessel
+     - order: The random firing order of each side, created when first needed
+     - position: How far each side has gone through its firing order
+     - current: The side whose turn it is, the same in every game
+     - turn: The current turn number, the same in every game
+     - winner: The winning player number of every game, 0 while it is running
+     - turns: The turn number every game ended on, 0 while it is running
+     - rng: The random number generator used
+    """
+    games: int
+    size: int
+    lengths: np.ndarray
+    occupant: np.ndarray
+    shot: np.ndarray
+    hp: np.ndarray
+    order: Optional[np.ndarray]
+    position: np.ndarray
+    current: int
+    turn: int
+    winner: np.ndarray
+    turns: np.ndarray
+    rng: np.random.Generator
+
+    def __init__(self, games: int, fleets: int = 1, size: int = SIZE,
+                 seed: Optional[int] = None) -> None:
+        """
+        Initializes the simulator with every vessel in port.
+
+        Parameter(s):
+         - games: The number of games being played
+         - fleets: The number of vessels of each class in each fleet
+         - size: The side length of every grid
+         - seed: The seed of the random number generator
+
+        Precondition(s):
+         - available()
+        """
+        self.games = games
+        self.size = size
+        self.lengths = np.array(
+            [vessel_type('', '', 0).length for vessel_type in VESSEL_TYPES] *
+            fleets, dtype=np.int16)
+
+        cells = size * size
+        vessels = len(self.lengths)
+        self.occupant = np.full((2, games, cells), -1, dtype=np.int16)
+        self.shot = np.zeros((2, games, cells), dtype=bool)
+        self.hp = np.zeros((2, games, vessels), dtype=np.int16)
+        self.order = None
+        self.position = np.zeros((2, games), dtype=np.intp)
+
+        self.current = 0
+        self.turn = 1
+        self.winner = np.zeros(games, dtype=np.int8)
+        self.turns = np.zeros(games, dtype=np.int32)
+        self.rng = np.random.default_rng(seed)
+
+    # Setup --------------------------------------------------------------------
+    def deploy_randomly(self) -> None:
+        """Places every vessel of both sides at a random position."""
+        size = self.size
+        steps = np.array(_STEPS, dtype=np.intp)
+        self.occupant[:] = -1
+        for side in (0, 1):
+            occupant = self.occupant[side]
+            for vessel, length in enumerate(self.lengths.tolist()):
+                pending = np.arange(self.games)
+                offsets = np.arange(length)
+                while len(pending):
+                    count = len(pending)
+                    rows = self.rng.integers(0, size, count)
+                    cols = self.rng.integers(0, size, count)
+                    step = steps[self.rng.integers(0, 4, count)]
+
+                    # Nodes from the bow to the stern, one row per game
+                    rows = rows[:, None] + step[:, 0, None] * offsets
+                    cols = cols[:, None] + step[:, 1, None] * offsets
+                    inside = ((rows >= 0) & (rows < size) &
+                              (cols >= 0) & (cols < size)).all(axis=1)
+                    cells = np.where(inside[:, None], rows * size + cols, 0)
+                    free = (occupant[pending[:, None], cells] < 0).all(axis=1)
+
+                    placed = inside & free
+                    games = pending[placed]
+                    occupant[games[:, None], cells[placed]] = vessel
+                    pending = pending[~placed]
+                self.hp[side, :, vessel] = length
+
+    def load(self, game: int, side: int, player: Player) -> None:
+        """
+        Copies the deployed vessels of a player, their damage and the nodes the
+        player has fired at into one game of the simulator. The player must
+        have the same fleet as the simulator, one vessel of each class per
+        fleet, and a full sized grid.
+
+        Parameter(s):
+         - game: The game being set
+         - side: The side (0 or 1) of the player
+         - player: The player being copied
+        """
+        self.occupant[side, game] = -1
+        self.hp[side, game] = 0
+        for i in range(len(CLASSES)):
+            for j, vessel in enumerate(player.vessels.vessels_in(DEPLOYED, i)):
+                slot = j * len(CLASSES) + i
+                self.occupant[side, game, list(vessel.cells)] = slot
+                self.hp[side, game, slot] = vessel.hp
+        self.shot[side, game] = [node.hit for node in player.traditional.nodes]
+
+    # Turns --------------------------------------------------------------------
+    def running(self) -> np.ndarray:
+        """Returns the index of every game that is not over yet."""
+        return np.flatnonzero(self.winner == 0)
+
+    def shots(self) -> np.ndarray:
+        """
+        Returns the number of orders the current side fires this turn in every
+        game; one per vessel they have left, none if the game is over.
+        """
+        shots = (self.hp[self.current] > 0).sum(axis=1)
+        shots[self.winner != 0] = 0
+        return shots
+
+    def choose_targets(self, strategy: Optional[Callable] = None) \
+            -> np.ndarray:
+        """
+        Returns the nodes the current side fires at this turn in every game, one
+        row per game, padded with -1.
+
+        Parameter(s):
+         - strategy: The targeting strategy of the current side; random if None
+        """
+        if strategy is None:
+            return self._next_in_order()
+
+        priority = np.array(strategy(self, self.current), dtype=np.float32)
+        priority[self.shot[self.current]] = -np.inf
+
+        # Highest priorities first
+        shots = self.shots()
+        most = max(int(shots.max()), 1)
+        best = np.argpartition(-priority, most - 1, axis=1)[:, :most]
+        order = np.argsort(
+            -np.take_along_axis(priority, best, axis=1), axis=1, kind='stable')
+        targets = np.take_along_axis(best, order, axis=1)
+
+        valid = np.arange(most) < shots[:, None]
+        valid &= np.take_along_axis(priority, targets, axis=1) > -np.inf
+        return np.where(valid, targets, -1)
+
+    def _next_in_order(self) -> np.ndarray:
+        """
+        Returns the next nodes of each game's firing order that the current
+        side has not fired at yet, one row per game, padded with -1.
+        """
+        cells = self.size * self.size
+        if self.order is None:
+            self.order = np.tile(np.arange(cells, dtype=np.int16),
+                                 (2, self.games, 1))
+            self.rng.permuted(self.order, axis=2, out=self.order)
+        side = self.current
+        order = self.order[side]
+        position = self.position[side]
+        shot = self.shot[side]
+
+        need = self.shots()
+        targets = np.full((self.games, max(int(need.max()), 1)), -1,
+                          dtype=np.intp)
+        filled = np.zeros(self.games, dtype=np.intp)
+        pending = np.flatnonzero((need > 0) & (position < cells))
+
+        # Nodes fired at some other way are skipped, so a window of the order
+        # may not hold enough nodes; keep going until every game is done
+        while len(pending):
+            width = int(need[pending].max())
+            index = position[pending, None] + np.arange(width)
+            inside = index < cells
+            window = order[pending[:, None], np.minimum(index, cells - 1)]
+            fresh = inside & ~shot[pending[:, None], window]
+            rank = np.cumsum(fresh, axis=1)
+            take = fresh & (rank <= need[pending, None])
+
+            games, i = np.nonzero(take)
+            rows = pending[games]
+            targets[rows, filled[rows] + rank[games, i] - 1] = window[games, i]
+
+            # Move past the last node taken, or the whole window
+            got = take.sum(axis=1)
+            last = width - np.argmax(take[:, ::-1], axis=1)
+            position[pending] += np.where(got == need[pending], last, width)
+            filled[pending] += got
+            need[pending] -= got
+            pending = pending[(need[pending] > 0) &
+                              (position[pending] < cells)]
+        return targets
+
+    def step(self, targets: Optional[np.ndarray] = None,
+             strategy: Optional[Callable] = None) -> int:
+        """
+        Resolves one turn of the current side in every game that is running,
+        then passes the turn to the other side. Returns the number of games
+        still running.
+
+        Parameter(s):
+         - targets: The nodes fired at in every game, one row per game padded
+           with -1; chosen by the strategy if not given
+         - strategy: The targeting strategy of the current side; random if
+           None
+
+        Precondition(s):
+         - No row of targets fires at a node twice, or at a node the current
+           side has already fired at
+        """
+        side = self.current
+        enemy = 1 - side
+        if targets is None:
+            targets = self.choose_targets(strategy)
+
+        # Every order of every running game
+        fired = (targets >= 0) & (self.winner == 0)[:, None]
+        games, index = np.nonzero(fired)
+        cells = targets[games, index]
+        self.shot[side, games, cells] = True
+
+        # Damage every vessel by the number of orders that landed on it
+        vessels = self.occupant[enemy, games, cells]
+        hit = vessels >= 0
+        count = self.hp.shape[2]
+        damage = np.bincount(games[hit] * count + vessels[hit],
+                             minlength=self.games * count)
+        self.hp[enemy] -= damage.reshape(self.games, count).astype(np.int16)
+
+        # A side loses once its last vessel sinks
+        lost = (self.winner == 0) & ~(self.hp[enemy] > 0).any(axis=1)
+        self.winner[lost] = side + 1
+        self.turns[lost] = self.turn
+
+        # Switch current side
+        self.current = enemy
+        if self.current == 0:
+            self.turn += 1
+        return int((self.winner == 0).sum())
+
+    def run(self, strategies: Tuple[Optional[Callable],
+                                    Optional[Callable]] = (None, None),
+            max_turns: Optional[int] = None) -> np.ndarray:
+        """
+        Plays every game until it is over, or until max_turns turns have been
+        played, and returns the winner of every game.
+
+        Parameter(s):
+         - strategies: The targeting strategy of each side; random if None
+         - max_turns: The turn number to stop after; no limit if None
+        """
+        while (self.winner == 0).any():
+            if max_turns is not None and self.turn > max_turns:
+                break
+            self.step(strategy=strategies[self.current])
+        return self.winner
+
@@ -0,0 +1,86 @@
+"""
+Zobrist.py
+
+PURPOSE:
+Creates the random keys used to hash grids and games. The hash of a grid is
+the XOR of the key of every node's (cell, state) pair, so a node changing state
+only takes two XORs to bring the hash up-to-date, and undoing the change
+restores the previous hash exactly. Empty nodes have a key of 0, so a new grid
+always hashes to 0.
+
+Keys are drawn from a seeded random number generator, so hashes are the same
+in every process and every run and can be stored or sent elsewhere. Turn keys
+are drawn when first needed, one thread at a time, so games played on several
+threads at once (see Modes/Lobby.py) still draw them in the same order.
+"""
+from random import Random
+from threading import Lock
+from typing import List
+from Objects.Mechanics.Coordinate import SIZE
+
+# Number of node state codes (see Node.py)
+STATES = 8
+
+# Seed of the random number generator the keys are drawn from
+SEED = 0x5EED
+
+# Bits in every key
+BITS = 64
+MASK = (1 << BITS) - 1
+
+_RNG = Random(SEED)
+
+# Key of every (cell, state) pair, indexed by cell * STATES + state
+NODE_KEYS: List[int] = [0 if i % STATES == 0 else _RNG.getrandbits(BITS)
+                        for i in range(SIZE * SIZE * STATES)]
+
+# Key XORed in while it is Player 2's turn
+PLAYER_KEY = _RNG.getrandbits(BITS)
+
+# Key of every turn number, extended when first needed while holding the lock
+TURN_KEYS: List[int] = [0]
+_TURN_LOCK = Lock()
+
+
+def node_key(cell: int, state: int) -> int:
+    """
+    Returns the key of a node in a state.
+
+    Parameter(s):
+     - cell: The packed cell id of the node
+     - state: The state code of the node
+    """
+    return NODE_KEYS[cell * STATES + state]
+
+
+def turn_key(turn: int) -> int:
+    """
+    Returns the key of a turn number.
+
+    Parameter(s):
+     - turn: The turn number
+
+    Precondition(s):
+     - turn >= 0
+    """
+    if len(TURN_KEYS) <= turn:
+        with _TURN_LOCK:
+            while len(TURN_KEYS) <= turn:
+                TURN_KEYS.append(_RNG.getrandbits(BITS))
+    return TURN_KEYS[turn]
+
+
+def rotate(value: int, amount: int) -> int:
+    """
+    Returns a hash rotated left by a number of bits, so hashes made with the
+    same keys (such as those of two grids) can be combined without cancelling
+    each other out.
+
+    Parameter(s):
+     - value: The hash being rotated
+     - amount: The number of bits to rotate by
+
+    Precondition(s):
+     - 0 <= amount < BITS
+    """
+    return ((value << amount) | (value >> (BITS - amount))) & MASK
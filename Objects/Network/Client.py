@@ -0,0 +1,242 @@
+"""
+Client.py
+
+PURPOSE:
+Plays a LAN game hosted elsewhere (see Modes/Server.py). The client keeps its
+own copy of the game, in which the enemy fleet is only known as far as the
+results of the player's orders reveal it, so orders are planned and the screen
+is drawn without the host; the host is only sent the player's fleet and, once
+a turn is over, their orders (see Protocol.py). An interface decides what the
+player does and shows them what happens. Interfaces have the following
+coroutines:
+ - join(number, taken): Returns the player's name and nation, given their
+   player number and the nations already taken
+ - deploy(player): Places the player's fleet on their personal grid
+ - turn(game): Plans the player's orders on the copy of the game, which is
+   their turn, and returns True to end the turn or False to forfeit
+ - wait(game): Called when the other player's turn starts
+ - over(winner, number): Called once the game is over, given the player
+   number of the winner and of the player
+
+Spectators watch a game with a spectator interface, which has the following
+coroutines:
+ - start(game): Called once the game starts, given the spectator's copy of it
+ - update(game): Called every time a turn ends
+ - over(winner): Called once the game is over, given the player number of the
+   winner
+"""
+import asyncio
+from typing import List, Tuple
+from Settings import NATIONS
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Coordinate import to_cell
+from Objects.Mechanics.Fleet import DEPLOYED
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Protocol import HELLO, JOIN, DEPLOY, START, ORDERS, \
+    FORFEIT, RESULTS, OVER, ERROR, WATCH, FLEET, encode, receive
+
+
+async def play(host: str, port: int, interface: object) -> int:
+    """
+    Plays a LAN game until it is over and returns the player number of the
+    winner. Raises ConnectionError if the host closes the connection, rejects
+    the player or sends a message that is not allowed.
+
+    Parameter(s):
+     - host: The address of the host
+     - port: The port the host is listening on
+     - interface: Decides what the player does (see above)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        number, taken, fleet = await _expect(reader, HELLO)
+        name, nation = await interface.join(number, taken)
+        writer.write(encode(JOIN, nation, name))
+        player = Player(name, nation, number)
+        for index, count in enumerate(fleet):
+            for _ in range(count):
+                player.add_vessel(Engine.VESSEL_TYPES[index])
+        await interface.deploy(player)
+        writer.write(encode(DEPLOY, deployment(player)))
+        await writer.drain()
+
+        game = _copy(player, *await _expect(reader, START))
+        while True:
+            if game.check_winner()[0]:
+                pass  # Only waiting for the host to end the game
+            elif game.current_player is player:
+                if await interface.turn(game):
+                    writer.write(encode(ORDERS, orders(game)))
+                else:
+                    writer.write(encode(FORFEIT))
+                await writer.drain()
+            else:
+                await interface.wait(game)
+
+            kind, fields = await _next(reader)
+            if kind == OVER:
+                await interface.over(fields[0], number)
+                return fields[0]
+            _results(game, kind, fields)
+    except ValueError as error:
+        raise ConnectionError(f'Invalid message from the host: {error}') \
+            from error
+    finally:
+        writer.close()
+
+
+async def watch(host: str, port: int, view: int, interface: object,
+                number: int = 1) -> int:
+    """
+    Watches a LAN game until it is over and returns the player number of the
+    winner. Turns already played are caught up on first. Raises
+    ConnectionError if the host closes the connection, rejects the spectator
+    or sends a message that is not allowed.
+
+    Parameter(s):
+     - host: The address of the host
+     - port: The port the host is listening on for spectators
+     - view: The player numbers whose fleet the spectator asks to see, added
+       together (0 for neither, 3 for both); the host may still hide them
+       until the game is over
+     - interface: Shows the spectator what happens (see above)
+     - number: The number of the game, if the host has more than one
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(encode(WATCH, view, number))
+        await writer.drain()
+        players = sorted([_player(*await _expect(reader, FLEET))
+                          for _ in range(2)], key=lambda p: p.number)
+        if [player.number for player in players] != [1, 2]:
+            raise ValueError('Not a fleet of each player')
+        game = Engine.new_game(*players, fleets=0)
+        await interface.start(game)
+
+        while True:
+            kind, fields = await _next(reader)
+            if kind == OVER:
+                await interface.over(fields[0])
+                return fields[0]
+            _results(game, kind, fields)
+            await interface.update(game)
+    except ValueError as error:
+        raise ConnectionError(f'Invalid message from the host: {error}') \
+            from error
+    finally:
+        writer.close()
+
+
+def deployment(player: Player) -> List[Tuple[str, int, Tuple[str, str], str]]:
+    """
+    Returns every vessel the player has placed on their personal grid, as
+    (class, pennant, coordinate, direction), in the order they are listed.
+
+    Parameter(s):
+     - player: The player whose fleet is placed
+    """
+    return [(vessel.abbrev, vessel.pennant, vessel.bow[0], vessel.bow[1])
+            for lst in (player.bb_curr, player.cc_curr, player.dd_curr,
+                        player.ff_curr, player.sm_curr, player.cv_curr)
+            for vessel in lst]
+
+
+def orders(game: BattleshipGame) -> List[int]:
+    """
+    Returns the cell id targeted by every order of the current player.
+
+    Parameter(s):
+     - game: The current game taking place
+    """
+    return [to_cell(order.coordinate) for order in game.current_orders]
+
+
+# Helper functions -------------------------------------------------------------
+def _copy(player: Player, nation: str, fleet: List[Tuple[str, int]],
+          name: str) -> BattleshipGame:
+    """
+    Returns the player's copy of a game that has just started.
+
+    Parameter(s):
+     - player: The player, with their fleet placed
+     - nation: The enemy's nation
+     - fleet: Every enemy vessel, as (class, pennant), in the order listed
+     - name: The enemy's name
+    """
+    enemy = _player(3 - player.number, nation, fleet, name)
+    if player.number == 1:
+        return Engine.new_game(player, enemy, fleets=0)
+    return Engine.new_game(enemy, player, fleets=0)
+
+
+def _player(number: int, nation: str, fleet: list, name: str) -> Player:
+    """
+    Returns a player whose fleet is known from the host. Vessels sent without
+    where they lie are deployed without being placed on the player's personal
+    grid, since nobody knows where they are but the player.
+
+    Parameter(s):
+     - number: The player number
+     - nation: The player's nation
+     - fleet: Every vessel of the player, in the order listed, as (class,
+       pennant) or (class, pennant, coordinate, direction)
+     - name: The player's name
+    """
+    if nation not in NATIONS:
+        raise ValueError(f'Unknown nation: {nation}')
+    player = Player(name, nation, number)
+    for abbrev, pennant, *placement in fleet:
+        if Engine.enlist(player, abbrev, pennant) != Engine.OK:
+            raise ValueError(f'Invalid vessel: {abbrev} {pennant}')
+        if not placement:
+            player.vessels.move(abbrev, pennant, DEPLOYED)
+        elif Engine.deploy(player, abbrev, pennant, *placement) != Engine.OK:
+            raise ValueError(f'Invalid deployment: {abbrev} {pennant}')
+    return player
+
+
+def _results(game: BattleshipGame, kind: int, fields: tuple) -> None:
+    """
+    Ends the current turn of a copy of the game from the results sent by the
+    host. Raises ValueError if the message is not the results of that turn.
+
+    Parameter(s):
+     - game: The copy of the game
+     - kind: The kind of message
+     - fields: The fields of the message
+    """
+    if kind != RESULTS or fields[:2] != (game.current_player.number,
+                                         game.current_turn_number):
+        raise ValueError(f'Unexpected message: {kind}')
+    Engine.apply_shots(game, fields[2])
+
+
+async def _next(reader: asyncio.StreamReader) -> Tuple[int, tuple]:
+    """
+    Returns the kind and fields of the next message. Raises ConnectionError if
+    the connection is closed or the host sent ERROR.
+
+    Parameter(s):
+     - reader: Where messages from the host are read
+    """
+    message = await receive(reader)
+    if message is None:
+        raise ConnectionError('The host closed the connection')
+    elif message[0] == ERROR:
+        raise ConnectionError(message[1][0])
+    return message
+
+
+async def _expect(reader: asyncio.StreamReader, kind: int) -> tuple:
+    """
+    Returns the fields of the next message, which must be of a specific kind.
+
+    Parameter(s):
+     - reader: Where messages from the host are read
+     - kind: The kind of message expected
+    """
+    received, fields = await _next(reader)
+    if received != kind:
+        raise ValueError(f'Unexpected message: {received}')
+    return fields
@@ -0,0 +1,322 @@
+"""
+Protocol.py
+
+PURPOSE:
+The messages exchanged between LAN players and the host, packed with the
+struct module so that a whole turn takes a few dozen bytes. Players keep their
+own copy of the game and draw their own screen (see Client.py), so the host
+only sends what a player could not know themselves: the other player's fleet
+once the game starts, and the result of every order once a turn ends. Nodes
+are sent as packed cell ids (see Coordinate.py) and nations as their two
+letter codes.
+
+Every message is a frame: the length of the payload and the kind of message,
+followed by the payload. A game goes:
+ - Host -> player: HELLO (protocol version, player number, nations already
+   taken, number of vessels of each class in a fleet)
+ - Player -> host: JOIN (protocol version, nation, name), then DEPLOY (every
+   vessel placed)
+ - Host -> player: START (the other player's nation, fleet and name) once both
+   fleets are placed; Player 1 has the first turn
+ - Current player -> host: ORDERS (the cell ids targeted) or FORFEIT
+ - Host -> player: RESULTS (the player, the turn number and the result of
+   every order; see Engine.Shot) once a turn ends
+ - Host -> player: OVER (the winner's player number) once the game is over
+The host sends ERROR and closes the connection whenever a message is not
+allowed, including messages of another version of the protocol.
+
+Spectators connect to a port of their own and only listen (see Server.py):
+ - Spectator -> host: WATCH (protocol version, the players whose fleet they
+   see, the game number)
+ - Host -> spectator: FLEET (a player's number, nation, fleet and name) for
+   both players once the game starts; where vessels lie is only sent if the
+   spectator asked to see that player's fleet and the host shows fleets
+   before the game is over. Then RESULTS and OVER, exactly as the
+   players receive them, including those of every turn already played
+"""
+import asyncio
+import struct
+from typing import Callable, Dict, List, Optional, Tuple
+from Objects.Mechanics.Coordinate import COORDINATES, to_cell
+from Objects.Mechanics.Engine import Shot
+from Objects.Mechanics.Fleet import CLASSES, CLASS_INDEX
+from Objects.Mechanics.Node import MISSED, DAMAGED, DESTROYED
+
+# Version of the protocol; both sides of a connection must use the same one
+VERSION = 3
+
+# Message kinds
+HELLO = 1
+JOIN = 2
+DEPLOY = 3
+START = 4
+ORDERS = 5
+FORFEIT = 6
+RESULTS = 7
+OVER = 8
+ERROR = 9
+WATCH = 10
+FLEET = 11
+
+# Directions a vessel can face, by the index sent
+DIRECTIONS = 'NSEW'
+
+# Frame header; payload length, kind
+_HEADER = struct.Struct('!HB')
+
+# Longest payload, in bytes
+LIMIT = (1 << 16) - 1
+
+# Fixed parts of payloads
+_HELLO = struct.Struct(f'!BB{len(CLASSES)}B')  # version, number, fleet
+_JOIN = struct.Struct('!B2s')      # version, nation; followed by the name
+_VESSEL = struct.Struct('!BBHB')   # class, pennant, bow cell, direction
+_START = struct.Struct('!2sB')     # nation, vessels; followed by the vessels
+_ENLISTED = struct.Struct('!BB')   # class, pennant
+_CELL = struct.Struct('!H')        # cell id
+_RESULTS = struct.Struct('!BH')    # player number, turn number
+_SHOT = struct.Struct('!HBBBHB')   # cell, outcome, class, pennant, bow cell
+                                   # and direction of a vessel sunk
+_OVER = struct.Struct('!B')        # winner number
+_WATCH = struct.Struct('!BBH')     # version, players seen, game number
+_FLEET = struct.Struct('!B2s?B')   # number, nation, whether vessels are
+                                   # placed, vessels; followed by the vessels
+
+
+def encode(kind: int, *fields) -> bytes:
+    """
+    Returns a message as the bytes sent over the connection. Raises ValueError
+    if the message is too long.
+
+    Parameter(s):
+     - kind: The kind of message
+     - fields: The fields of the message, in the order decode() returns them
+    """
+    payload = _ENCODERS[kind](*fields)
+    if len(payload) > LIMIT:
+        raise ValueError('Message too long')
+    return _HEADER.pack(len(payload), kind) + payload
+
+
+def decode(kind: int, payload: bytes) -> tuple:
+    """
+    Returns the fields of a message. Raises ValueError if the message is not
+    a valid message of that kind and version.
+
+    Parameter(s):
+     - kind: The kind of message
+     - payload: The message, without its header
+    """
+    decoder = _DECODERS.get(kind)
+    if decoder is None:
+        raise ValueError(f'Unknown message: {kind}')
+    try:
+        return decoder(payload)
+    except (struct.error, IndexError) as error:
+        raise ValueError('Malformed message') from error
+
+
+async def receive(reader: asyncio.StreamReader) -> Optional[Tuple[int, tuple]]:
+    """
+    Returns the kind and fields of the next message, or None once the
+    connection is closed. Raises ValueError if the message is not valid.
+
+    Parameter(s):
+     - reader: The connection the message is read from
+    """
+    try:
+        length, kind = _HEADER.unpack(
+            await reader.readexactly(_HEADER.size))
+        if kind not in _DECODERS:
+            raise ValueError(f'Unknown message: {kind}')
+        payload = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return kind, decode(kind, payload)
+
+
+# Encoders ---------------------------------------------------------------------
+def _hello(number: int, taken: List[str], fleet: List[int]) -> bytes:
+    return _HELLO.pack(VERSION, number, *fleet) + _nations(taken)
+
+
+def _join(nation: str, name: str) -> bytes:
+    return _JOIN.pack(VERSION, nation.encode('ascii')) + name.encode()
+
+
+def _deploy(fleet: List[Tuple[str, int, Tuple[str, str], str]]) -> bytes:
+    return b''.join([_VESSEL.pack(CLASS_INDEX[abbrev], pennant,
+                                  to_cell(coordinate),
+                                  DIRECTIONS.index(direction))
+                     for abbrev, pennant, coordinate, direction in fleet])
+
+
+def _start(nation: str, fleet: List[Tuple[str, int]], name: str) -> bytes:
+    return _START.pack(nation.encode('ascii'), len(fleet)) + \
+        b''.join([_ENLISTED.pack(CLASS_INDEX[abbrev], pennant)
+                  for abbrev, pennant in fleet]) + name.encode()
+
+
+def _orders(cells: List[int]) -> bytes:
+    return struct.pack(f'!{len(cells)}H', *cells)
+
+
+def _forfeit() -> bytes:
+    return b''
+
+
+def _results(number: int, turn: int, shots: List[Shot]) -> bytes:
+    payload = [_RESULTS.pack(number, turn)]
+    for cell, outcome, abbrev, pennant, bow in shots:
+        if bow is None:
+            payload.append(_SHOT.pack(cell, outcome,
+                                      CLASS_INDEX.get(abbrev, 0), pennant,
+                                      0, 0))
+        else:
+            payload.append(_SHOT.pack(cell, outcome, CLASS_INDEX[abbrev],
+                                      pennant, to_cell(bow[0]),
+                                      DIRECTIONS.index(bow[1])))
+    return b''.join(payload)
+
+
+def _over(winner: int) -> bytes:
+    return _OVER.pack(winner)
+
+
+def _error(text: str) -> bytes:
+    return text.encode()
+
+
+def _watch(view: int, number: int) -> bytes:
+    return _WATCH.pack(VERSION, view, number)
+
+
+def _fleet(number: int, nation: str, fleet: list, name: str) -> bytes:
+    placed = any(len(vessel) == 4 for vessel in fleet)
+    vessels = _deploy(fleet) if placed else \
+        b''.join([_ENLISTED.pack(CLASS_INDEX[abbrev], pennant)
+                  for abbrev, pennant in fleet])
+    return _FLEET.pack(number, nation.encode('ascii'), placed, len(fleet)) + \
+        vessels + name.encode()
+
+
+# Decoders ---------------------------------------------------------------------
+def _read_hello(payload: bytes) -> Tuple[int, List[str], List[int]]:
+    _check_version(payload)
+    _, number, *fleet = _HELLO.unpack_from(payload)
+    return number, _read_nations(payload[_HELLO.size:]), fleet
+
+
+def _read_join(payload: bytes) -> Tuple[str, str]:
+    _check_version(payload)
+    _, nation = _JOIN.unpack_from(payload)
+    return nation.decode('ascii'), payload[_JOIN.size:].decode()
+
+
+def _read_deploy(payload: bytes) \
+        -> Tuple[List[Tuple[str, int, Tuple[str, str], str]]]:
+    fleet = [(CLASSES[index], pennant, COORDINATES[cell], DIRECTIONS[direction])
+             for index, pennant, cell, direction
+             in _VESSEL.iter_unpack(payload)]
+    return (fleet,)
+
+
+def _read_start(payload: bytes) -> Tuple[str, List[Tuple[str, int]], str]:
+    nation, count = _START.unpack_from(payload)
+    end = _START.size + count * _ENLISTED.size
+    fleet = [(CLASSES[index], pennant) for index, pennant
+             in _ENLISTED.iter_unpack(payload[_START.size:end])]
+    return nation.decode('ascii'), fleet, payload[end:].decode()
+
+
+def _read_orders(payload: bytes) -> Tuple[List[int]]:
+    cells = [_check_cell(cell) for cell, in _CELL.iter_unpack(payload)]
+    return (cells,)
+
+
+def _read_forfeit(payload: bytes) -> tuple:
+    if payload:
+        raise ValueError('Malformed message')
+    return ()
+
+
+def _read_results(payload: bytes) -> Tuple[int, int, List[Shot]]:
+    number, turn = _RESULTS.unpack_from(payload)
+    shots = []
+    for cell, outcome, index, pennant, bow, direction \
+            in _SHOT.iter_unpack(payload[_RESULTS.size:]):
+        _check_cell(cell)
+        if outcome == MISSED:
+            shots.append((cell, outcome, '', 0, None))
+        elif outcome == DAMAGED:
+            shots.append((cell, outcome, CLASSES[index], pennant, None))
+        elif outcome == DESTROYED:
+            shots.append((cell, outcome, CLASSES[index], pennant,
+                          (COORDINATES[bow], DIRECTIONS[direction])))
+        else:
+            raise ValueError(f'Unknown outcome: {outcome}')
+    return number, turn, shots
+
+
+def _read_over(payload: bytes) -> Tuple[int]:
+    return _OVER.unpack(payload)
+
+
+def _read_error(payload: bytes) -> Tuple[str]:
+    return (payload.decode(errors='replace'),)
+
+
+def _read_watch(payload: bytes) -> Tuple[int, int]:
+    _check_version(payload)
+    _, view, number = _WATCH.unpack(payload)
+    return view, number
+
+
+def _read_fleet(payload: bytes) -> Tuple[int, str, list, str]:
+    number, nation, placed, count = _FLEET.unpack_from(payload)
+    if placed:
+        end = _FLEET.size + count * _VESSEL.size
+        fleet = _read_deploy(payload[_FLEET.size:end])[0]
+    else:
+        end = _FLEET.size + count * _ENLISTED.size
+        fleet = [(CLASSES[index], pennant) for index, pennant
+                 in _ENLISTED.iter_unpack(payload[_FLEET.size:end])]
+    return number, nation.decode('ascii'), fleet, payload[end:].decode()
+
+
+# Helper functions -------------------------------------------------------------
+def _nations(nations: List[str]) -> bytes:
+    """Returns nation codes packed two bytes each."""
+    return ''.join(nations).encode('ascii')
+
+
+def _read_nations(payload: bytes) -> List[str]:
+    """Returns the nation codes packed by _nations()."""
+    text = payload.decode('ascii')
+    return [text[i:i + 2] for i in range(0, len(text), 2)]
+
+
+def _check_version(payload: bytes) -> None:
+    """Raises ValueError if a handshake is of another protocol version."""
+    if payload[0] != VERSION:
+        raise ValueError(f'Protocol version {payload[0]} is not supported; '
+                         f'version {VERSION} is')
+
+
+def _check_cell(cell: int) -> int:
+    """Returns a cell id, or raises ValueError if it is off the grid."""
+    if cell >= len(COORDINATES):
+        raise ValueError(f'Invalid cell: {cell}')
+    return cell
+
+
+_ENCODERS: Dict[int, Callable[..., bytes]] = {
+    HELLO: _hello, JOIN: _join, DEPLOY: _deploy, START: _start,
+    ORDERS: _orders, FORFEIT: _forfeit, RESULTS: _results, OVER: _over,
+    ERROR: _error, WATCH: _watch, FLEET: _fleet}
+
+_DECODERS: Dict[int, Callable[[bytes], tuple]] = {
+    HELLO: _read_hello, JOIN: _read_join, DEPLOY: _read_deploy,
+    START: _read_start, ORDERS: _read_orders, FORFEIT: _read_forfeit,
+    RESULTS: _read_results, OVER: _read_over, ERROR: _read_error,
+    WATCH: _read_watch, FLEET: _read_fleet}
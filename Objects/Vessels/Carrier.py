@@ -31,7 +31,8 @@ class TraditionalCarrier(TraditionalVessel):
         self.abbrev = 'CV'
         self.symbol = 'V'
 
-        self.hp = 6
+        self.length = 6
+        self.hp = self.length
         self.hits_received = 0
         self.health_color = f'{GREEN}'
         self.enemy_hp_color = f'{RED}'
@@ -45,12 +46,13 @@ class TraditionalCarrier(TraditionalVessel):
         ret.sunk = self.sunk
 
         ret.bow = self.bow
+        ret.cells = self.cells
         ret.hit = self.hit
 
         return ret
 
     def update_health_color(self) -> None:
-        if self.hp == 6:
+        if self.hp == self.length:
             return
         elif self.hp > 1:
             self.health_color = f'{YELLOW}'
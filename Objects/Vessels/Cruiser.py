@@ -31,7 +31,8 @@ class TraditionalCruiser(TraditionalVessel):
         self.abbrev = 'CC'
         self.symbol = 'C'
 
-        self.hp = 5
+        self.length = 5
+        self.hp = self.length
         self.hits_received = 0
         self.health_color = f'{GREEN}'
         self.enemy_hp_color = f'{RED}'
@@ -45,12 +46,13 @@ class TraditionalCruiser(TraditionalVessel):
         ret.sunk = self.sunk
 
         ret.bow = self.bow
+        ret.cells = self.cells
         ret.hit = self.hit
 
         return ret
 
     def update_health_color(self) -> None:
-        if self.hp == 5:
+        if self.hp == self.length:
             return
         elif self.hp > 1:
             self.health_color = f'{YELLOW}'
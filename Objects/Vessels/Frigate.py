@@ -31,7 +31,8 @@ class TraditionalFrigate(TraditionalVessel):
         self.abbrev = 'FF'
         self.symbol = 'F'
 
-        self.hp = 3
+        self.length = 3
+        self.hp = self.length
         self.hits_received = 0
         self.health_color = f'{GREEN}'
         self.enemy_hp_color = f'{RED}'
@@ -45,12 +46,13 @@ class TraditionalFrigate(TraditionalVessel):
         ret.sunk = self.sunk
 
         ret.bow = self.bow
+        ret.cells = self.cells
         ret.hit = self.hit
 
         return ret
 
     def update_health_color(self) -> None:
-        if self.hp == 3:
+        if self.hp == self.length:
             return
         elif self.hp > 1:
             self.health_color = f'{YELLOW}'
@@ -16,12 +16,14 @@ class TraditionalVessel:
      - type: The full name of the vessel class
      - abbrev: The abbreviated form of the vessel class
      - symbol: The letter representing the vessel on the Grid
+     - length: The number of nodes the vessel takes up on the Grid
 
      - nation: The nation (team) the vessel belongs to
      - name: The specific name of the vessel
      - pennant: The specific id number of the vessel
 
      - bow: The location & direction that the bow of the vessel is located
+     - cells: The cell ids of the nodes the vessel takes up, bow to stern
      - hp: The number of undamaged sections of the vessel (hitpoints)
      - hits_received: The number of damaged sections of the vessel
      - health_color: The color of the vessel hp displayed
@@ -32,12 +34,14 @@ class TraditionalVessel:
     type: str
     abbrev: str
     symbol: str
+    length: int
 
     nation: str
     name: str
     pennant: int
 
     bow: Optional[Tuple[Tuple[str, str], str]]
+    cells: Optional[Tuple[int, ...]]
     hp: int
     hits_received: int
     health_color: str
@@ -57,12 +61,14 @@ class TraditionalVessel:
         self.type = ''
         self.abbrev = ''
         self.symbol = ''
+        self.length = 0
 
         self.nation = nation
         self.name = name
         self.pennant = pennant
 
         self.bow = None
+        self.cells = None
         self.hp = -1
         self.hits_received = -1
         self.health_color = ''
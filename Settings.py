@@ -26,6 +26,31 @@ MDW = 310  # 182 for a laptop 1080p screen, 310 for a 31 in. 2K monitor
 # Clearing screen
 EMPTY_FRAME = '\n' * 28
 
+# How the game screen is redrawn: 'full' reprints the entire screen every time,
+# 'diff' only rewrites what changed (requires an ANSI terminal at least as tall
+# as the game screen)
+RENDERER = 'full'
+
+# LAN games: the address the host listens on ('0.0.0.0' for every network the
+# computer is connected to, '127.0.0.1' for this computer only) and the port
+LAN_HOST = '0.0.0.0'
+LAN_PORT = 7707
+
+# The port spectators of LAN games connect to, on the same address
+LAN_WATCH_PORT = 7708
+
+# Whether spectators of LAN games are shown where the players' vessels lie
+# while the game is played; they always are once it is over
+LAN_REVEAL = False
+
+# Most characters in the name of a LAN player; names are shown on the other
+# player's screen, so only printable characters are allowed
+LAN_NAME_LIMIT = 24
+
+# Number of vessels of each class (BB, CC, DD, FF, SM, CV) in a LAN fleet; sent
+# to players when they join
+LAN_FLEET = (1, 1, 1, 1, 1, 1)
+
 # Color coding
 DEFAULT = '\033[m'       # 'Pycharm' normal
 GREEN = '\033[32m'       # Green
@@ -0,0 +1,100 @@
+"""
+test_lan.py
+
+PURPOSE:
+Tests a whole LAN game played on this computer (see Modes/Server.py and
+Objects/Network/Client.py): two scripted players connect to a host, place
+their fleets and fire until one of them wins, and both must be told the same
+winner as the one their own copy of the game shows.
+
+Run from the root of the project:
+    python -m pytest tests
+"""
+import asyncio
+from random import Random
+from typing import List, Optional, Tuple
+from Settings import NATIONS
+from Modes.Server import GameServer
+from Objects.Mechanics import Engine
+from Objects.Mechanics.Game import BattleshipGame
+from Objects.Mechanics.Player import Player
+from Objects.Network.Client import play
+
+# Longest a game may take, in seconds
+TIMEOUT = 60
+
+
+class ScriptedBot:
+    """
+    Places its fleet at random and fires at the nodes not fired at yet in a
+    fixed order, as many as it can every turn.
+
+    Attribute(s):
+     - rng: The random number generator used to place the fleet
+     - backwards: Whether nodes are fired at from the last one
+     - game: The bot's copy of the game, once it started
+     - winner: The player number of the winner the host announced, if any
+    """
+    rng: Random
+    backwards: bool
+    game: Optional[BattleshipGame]
+    winner: Optional[int]
+
+    def __init__(self, seed: int, backwards: bool) -> None:
+        self.rng = Random(seed)
+        self.backwards = backwards
+        self.game = None
+        self.winner = None
+
+    async def join(self, number: int, taken: List[str]) -> Tuple[str, str]:
+        nation = [nation for nation in NATIONS if nation not in taken][0]
+        return f'Bot {number}', nation
+
+    async def deploy(self, player: Player) -> None:
+        Engine.deploy_randomly(player, self.rng)
+
+    async def turn(self, game: BattleshipGame) -> bool:
+        self.game = game
+        targets = Engine.legal_targets(game)
+        if self.backwards:
+            targets.reverse()
+        for target in targets[:game.current_player.battle_total]:
+            Engine.add_order(game, target)
+        return True
+
+    async def wait(self, game: BattleshipGame) -> None:
+        self.game = game
+
+    async def over(self, winner: int, number: int) -> None:
+        self.winner = winner
+
+
+async def _game(seed: int) -> Tuple[List[int], List[ScriptedBot]]:
+    """
+    Plays a game between two scripted bots on a new host and returns the
+    winner every bot's play() returned, and the bots.
+
+    Parameter(s):
+     - seed: The seed the fleets are placed with
+    """
+    server = GameServer('127.0.0.1', 0, 0)
+    server.start()
+    bots = [ScriptedBot(seed * 2, False), ScriptedBot(seed * 2 + 1, True)]
+    try:
+        winners = await asyncio.wait_for(asyncio.gather(
+            *(play('127.0.0.1', server.port, bot) for bot in bots)), TIMEOUT)
+    finally:
+        server.stop()
+    return winners, bots
+
+
+def test_loopback_game() -> None:
+    for seed in range(3):
+        winners, bots = asyncio.run(_game(seed))
+        assert winners[0] == winners[1] in (1, 2)
+        assert [bot.winner for bot in bots] == winners
+
+        # Every copy of the game agrees with the host
+        for bot in bots:
+            over, winner = bot.game.check_winner()
+            assert over and winner.number == winners[0]
@@ -0,0 +1,153 @@
+"""
+test_protocol.py
+
+PURPOSE:
+Tests the messages of LAN games (see Objects/Network/Protocol.py): every kind
+of message decodes to the fields it was encoded from, and payloads that are
+not valid messages are rejected with ValueError, as are players joining a host
+with names that are not allowed (see Modes/Server.py).
+
+Run from the root of the project:
+    python -m pytest tests
+"""
+import struct
+import pytest
+from Settings import LAN_NAME_LIMIT
+from Modes.Server import GameSession
+from Objects.Network.Protocol import HELLO, JOIN, DEPLOY, START, ORDERS, \
+    FORFEIT, RESULTS, OVER, ERROR, WATCH, FLEET, VERSION, encode, decode
+from Objects.Mechanics.Node import MISSED, DAMAGED, DESTROYED
+
+# Header of every message; payload length, kind
+HEADER = struct.Struct('!HB')
+
+PLACED = [('BB', 3, ('A', 'Z'), 'N'), ('CC', 12, ('0', '0'), 'S'),
+          ('DD', 0, ('Z', '0'), 'E'), ('FF', 255, ('K', 'M'), 'W')]
+ENLISTED = [('SM', 7), ('CV', 1)]
+SHOTS = [(0, MISSED, '', 0, None),
+         (37, DAMAGED, 'CC', 12, None),
+         (1295, DESTROYED, 'DD', 4, (('Z', '0'), 'E'))]
+
+# Fields of every kind of message, as decode() returns them
+MESSAGES = [
+    (HELLO, (2, ['UK', 'FR'], [1, 1, 2, 1, 0, 3])),
+    (HELLO, (1, [], [1, 1, 1, 1, 1, 1])),
+    (JOIN, ('DE', 'Admiral Höpfner')),
+    (DEPLOY, (PLACED,)),
+    (DEPLOY, ([],)),
+    (START, ('US', ENLISTED, 'Nimitz')),
+    (ORDERS, ([0, 36, 1295],)),
+    (ORDERS, ([],)),
+    (FORFEIT, ()),
+    (RESULTS, (2, 300, SHOTS)),
+    (RESULTS, (1, 1, [])),
+    (OVER, (1,)),
+    (ERROR, ('The game is full',)),
+    (WATCH, (3, 65535)),
+    (FLEET, (1, 'JP', PLACED, 'Yamamoto')),
+    (FLEET, (2, 'IT', ENLISTED, '')),
+]
+
+
+def _payload(message: bytes) -> bytes:
+    """Returns the payload of an encoded message after checking its header."""
+    length, _ = HEADER.unpack_from(message)
+    assert length == len(message) - HEADER.size
+    return message[HEADER.size:]
+
+
+# Round trips ------------------------------------------------------------------
+@pytest.mark.parametrize('kind, fields', MESSAGES)
+def test_round_trip(kind: int, fields: tuple) -> None:
+    message = encode(kind, *fields)
+    assert message[2] == kind
+    assert decode(kind, _payload(message)) == fields
+
+
+def test_every_kind_covered() -> None:
+    assert {kind for kind, _ in MESSAGES} == set(range(HELLO, FLEET + 1))
+
+
+# Invalid messages -------------------------------------------------------------
+@pytest.mark.parametrize('kind, fields', [
+    (HELLO, (1, [], [1, 1, 1, 1, 1, 1])),
+    (JOIN, ('UK', 'Nelson')),
+    (WATCH, (0, 1)),
+])
+def test_other_version(kind: int, fields: tuple) -> None:
+    payload = bytearray(_payload(encode(kind, *fields)))
+    payload[0] = VERSION + 1
+    with pytest.raises(ValueError, match='version'):
+        decode(kind, bytes(payload))
+
+
+def test_unknown_outcome() -> None:
+    payload = bytearray(_payload(encode(RESULTS, 1, 1, SHOTS[:1])))
+    payload[5] = 9  # Outcome of the first shot
+    with pytest.raises(ValueError, match='outcome'):
+        decode(RESULTS, bytes(payload))
+
+
+@pytest.mark.parametrize('kind, payload', [
+    (ORDERS, struct.pack('!2H', 0, 1296)),
+    (RESULTS, struct.pack('!BHHBBBHB', 1, 1, 1296, MISSED, 0, 0, 0, 0)),
+])
+def test_cell_off_grid(kind: int, payload: bytes) -> None:
+    with pytest.raises(ValueError, match='cell'):
+        decode(kind, payload)
+
+
+@pytest.mark.parametrize('kind, fields', [
+    (kind, fields) for kind, fields in MESSAGES
+    if kind in (HELLO, JOIN, DEPLOY, START, ORDERS, RESULTS, OVER, WATCH,
+                FLEET) and _payload(encode(kind, *fields))
+])
+def test_truncated(kind: int, fields: tuple) -> None:
+    # Text at the end of a message can be any length, so it is dropped first
+    payload = _payload(encode(kind, *fields))
+    if kind == HELLO:
+        payload = payload[:len(payload) - len(''.join(fields[1]))]
+    elif kind in (JOIN, START, FLEET):
+        payload = payload[:len(payload) - len(fields[-1].encode())]
+    with pytest.raises(ValueError):
+        decode(kind, payload[:-1])
+
+
+def test_forfeit_with_payload() -> None:
+    with pytest.raises(ValueError):
+        decode(FORFEIT, b'\x00')
+
+
+def test_unknown_kind() -> None:
+    with pytest.raises(ValueError, match='Unknown'):
+        decode(FLEET + 1, b'')
+
+
+# Names ------------------------------------------------------------------------
+def _join(name: str) -> GameSession:
+    """
+    Returns a new game that a player joined with the name, sent over the
+    connection like any other JOIN.
+
+    Parameter(s):
+     - name: The name the player joins with
+    """
+    session = GameSession()
+    seat = session.sit(None)
+    session.handle(seat, JOIN, decode(JOIN, _payload(encode(JOIN, 'UK',
+                                                            name))))
+    return session
+
+
+@pytest.mark.parametrize('name', ['Nelson', 'Admiral Höpfner',
+                                  'x' * LAN_NAME_LIMIT])
+def test_name_allowed(name: str) -> None:
+    assert _join(name).seats[1].name == name
+
+
+@pytest.mark.parametrize('name', ['', 'x' * (LAN_NAME_LIMIT + 1),
+                                  '\x1b[2J\x1b[H', 'Line\nbreak', 'Tab\there',
+                                  'Bell\x07', 'Null\x00'])
+def test_name_rejected(name: str) -> None:
+    with pytest.raises(ValueError, match='name'):
+        _join(name)